@@ -0,0 +1,5 @@
+# Function to count the rows and total an amount column per group in a single pass.
+# Returns the group keys with the count and the total as columns, sorted by key.
+def count_and_sum(df, by, column, count_name='Count', sum_name=None):
+    grouped = df.groupby(by)[column].agg(['size', 'sum'])
+    return grouped.rename(columns={'size': count_name, 'sum': sum_name or column}).reset_index()
@@ -0,0 +1,132 @@
+import glob
+import hashlib
+import os
+import pickle
+import threading
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+from claims_data import CLAIMS_FILE
+from snapshots import SNAPSHOT_DIR, workbook_hash
+
+
+# Numeric claim features the anomaly model is trained on
+ANOMALY_NUMERIC = ['Claim Amount', 'Approved Claim Amount', 'Amount Discrepancy', 'Provider Claim Count', 'Member Claim Count']
+
+# Categorical claim features, encoded by their position in the training categories
+ANOMALY_CATEGORICAL = ['Claim Type', 'Source']
+
+# Number of trees in the isolation forest
+ANOMALY_TREES = 300
+
+# Bump when the model's features or settings change, so older models are retrained
+ANOMALY_VERSION = 1
+
+# Anomaly models loaded in this process: claims path -> model
+_models = {}
+_lock = threading.Lock()
+
+
+# Function to build the anomaly model's feature matrix. Missing numbers count as 0, and
+# categories unseen in training share the code -1.
+def anomaly_matrix(frame, categories):
+    columns = [frame[column].astype(float).fillna(0).to_numpy() for column in ANOMALY_NUMERIC]
+    for column in ANOMALY_CATEGORICAL:
+        columns.append(pd.Index(categories[column]).get_indexer(frame[column].astype(str)).astype(float))
+    return np.column_stack(columns)
+
+
+# Function to train the isolation forest on the claims features, on all cores
+def train_anomaly_model(frame):
+    categories = {column: sorted(frame[column].astype(str).unique()) for column in ANOMALY_CATEGORICAL}
+    forest = IsolationForest(n_estimators=ANOMALY_TREES, n_jobs=-1, random_state=0)
+    forest.fit(anomaly_matrix(frame, categories))
+    return {'version': ANOMALY_VERSION, 'features': ANOMALY_NUMERIC + ANOMALY_CATEGORICAL, 'forest': forest, 'categories': categories}
+
+
+# Function to tell whether a stored model was trained with this version and these features
+def is_current_model(model):
+    return model.get('version') == ANOMALY_VERSION and model.get('features') == ANOMALY_NUMERIC + ANOMALY_CATEGORICAL
+
+
+# Function to score claims with the anomaly model: higher scores are more anomalous (about 0.3 to 0.8)
+def score_anomalies(model, frame):
+    return -model['forest'].score_samples(anomaly_matrix(frame, model['categories']))
+
+
+# Function to locate the anomaly model and the scores it produced, next to the claims
+# workbook's snapshots
+def anomaly_paths(claims_path=CLAIMS_FILE, model_key=None):
+    folder = os.path.join(os.path.dirname(os.path.abspath(claims_path)), SNAPSHOT_DIR)
+    return {
+        'model': os.path.join(folder, "anomaly_model.pkl"),
+        'scores': os.path.join(folder, f"anomaly_scores.{model_key}.parquet"),
+    }
+
+
+# Function to write an artifact atomically
+def write_artifact(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+# Function to train the anomaly model on the claims features and persist it. The model is keyed
+# by its version and features and the version of the claims workbook it was trained on, which
+# also names its scores.
+def retrain_anomaly_model(frame, claims_path=CLAIMS_FILE):
+    model = train_anomaly_model(frame)
+    parts = [str(ANOMALY_VERSION), ",".join(model['features']), workbook_hash(claims_path)]
+    model['key'] = hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(model, file)
+    write_artifact(anomaly_paths(claims_path)['model'], write)
+
+    with _lock:
+        _models[claims_path] = model
+    return model
+
+
+# Function to load the persisted anomaly model. It is trained offline (see fraud_features.py) and
+# kept as claims are added; it is only trained here when there is none, or one of another version
+# or other features.
+def load_anomaly_model(frame, claims_path=CLAIMS_FILE):
+    with _lock:
+        if claims_path in _models:
+            return _models[claims_path]
+
+    path = anomaly_paths(claims_path)['model']
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            model = pickle.load(file)
+        if is_current_model(model):
+            with _lock:
+                _models[claims_path] = model
+            return model
+    return retrain_anomaly_model(frame, claims_path)
+
+
+# Function to get the anomaly score of every claim. Scores are stored by Claim ID with the model
+# that produced them, and only claims whose ID has no stored score are scored (claims keep the
+# score they were given when they were added). Every claim is scored again only when the model
+# is retrained or its key (version, features, claims workbook) changes; the scores of older
+# models are then removed. Returns the scores in the claims' order.
+def anomaly_scores(frame, claims_path=CLAIMS_FILE, retrain=False):
+    model = retrain_anomaly_model(frame, claims_path) if retrain else load_anomaly_model(frame, claims_path)
+    path = anomaly_paths(claims_path, model['key'])['scores']
+    stored = pd.read_parquet(path) if os.path.exists(path) else None
+
+    new_claims = frame.drop_duplicates('Claim ID')
+    if stored is not None:
+        new_claims = new_claims[~new_claims['Claim ID'].isin(stored['Claim ID'])]
+    if len(new_claims):
+        added = pd.DataFrame({'Claim ID': new_claims['Claim ID'].to_numpy(), 'Anomaly Score': score_anomalies(model, new_claims)})
+        stored = added if stored is None else pd.concat([stored, added], ignore_index=True)
+        write_artifact(path, lambda tmp_path: stored.to_parquet(tmp_path, index=False))
+        for stale in glob.glob(anomaly_paths(claims_path, '*')['scores']):
+            if stale != path:
+                os.remove(stale)
+    return stored.set_index('Claim ID')['Anomaly Score'].reindex(frame['Claim ID']).to_numpy()
@@ -0,0 +1,46 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from charts import cached_chart, category_chart, data_version
+
+
+# Function to generate synthetic claims: a year, a month and a log-normal amount each
+def synthetic_claims(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Year': rng.integers(2021, 2025, n),
+        'Month': rng.integers(1, 13, n),
+        'Claim Amount': rng.lognormal(9, 1, n),
+    })
+
+
+# Benchmark of a grouped chart of synthetic claims, aggregated and built afresh on every call and
+# served from the figure cache. Run from the repository root: python -m benchmarks.charts_benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Time building a chart against serving it from the figure cache.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Numbers of claims")
+    parser.add_argument('--repeats', type=int, default=100, help="Charts drawn per timing")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        claims = synthetic_claims(n)
+        selection = {'data': data_version(claims), 'filters': {'Product': []}, 'range': ("January 2021", "December 2024")}
+
+        # Function to aggregate the claims and chart them
+        def build():
+            monthly = claims.groupby(['Year', 'Month'])['Claim Amount'].sum().reset_index()
+            return category_chart(monthly, 'Month', 'Claim Amount', color='Year', text='%.1fM', text_scale=1e6, xaxis_title="Month", height=450)
+
+        print(f"{n:,} claims")
+        for label, chart in [('built', build), ('cached', lambda: cached_chart(selection, 'monthly claims', build))]:
+            chart()
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                chart()
+            elapsed = (time.perf_counter() - start) / args.repeats
+            print(f"  {label:>6}: {elapsed * 1e3:6.2f} ms per chart")
+
+
+if __name__ == "__main__":
+    main()
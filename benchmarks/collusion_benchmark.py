@@ -0,0 +1,59 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from collusion import MIN_EDGE_CLAIMS, provider_member_graph, provider_overlap, suspicious_clusters
+
+
+# Average number of claims per provider and per member in the synthetic claims
+CLAIMS_PER_PROVIDER = 1_000
+CLAIMS_PER_MEMBER = 5
+
+# Size of the provider-member rings planted in the synthetic claims: providers, members
+RING_SIZE = (3, 6)
+
+
+# Function to generate synthetic claims: providers and members drawn from skewed (Zipf-like)
+# distributions, plus rings of a few providers and members that claim repeatedly with each other
+def synthetic_claims(n, seed=0, rings=10):
+    rng = np.random.default_rng(seed)
+    n_providers = max(n // CLAIMS_PER_PROVIDER, 10)
+    n_members = max(n // CLAIMS_PER_MEMBER, 10)
+    provider_weights = 1 / np.arange(1, n_providers + 1)
+    member_weights = 1 / np.arange(1, n_members + 1) ** 0.5
+    claims = pd.DataFrame({
+        'Provider Name': "P" + pd.Series(rng.choice(n_providers, n, p=provider_weights / provider_weights.sum())).astype(str),
+        'Member Name': "M" + pd.Series(rng.choice(n_members, n, p=member_weights / member_weights.sum())).astype(str),
+    })
+
+    ring_providers, ring_members = RING_SIZE
+    ring_claims = [
+        (f"RING {ring} P{provider}", f"RING {ring} M{member}")
+        for ring in range(rings)
+        for provider in range(ring_providers)
+        for member in range(ring_members)
+        for _ in range(MIN_EDGE_CLAIMS)
+    ]
+    return pd.concat([claims, pd.DataFrame(ring_claims, columns=['Provider Name', 'Member Name'])], ignore_index=True)
+
+
+# Benchmark of the graph build and analytics on synthetic claims of growing size.
+# Run from the repository root: python -m benchmarks.collusion_benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Time the provider-member graph analytics on synthetic claims.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Numbers of claims")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        claims = synthetic_claims(n)
+        start = time.perf_counter()
+        graph, providers, members = provider_member_graph(claims)
+        overlap = provider_overlap(graph, providers)
+        clusters = suspicious_clusters(graph, providers, members)
+        elapsed = time.perf_counter() - start
+        print(f"{len(claims):>10,} claims: {elapsed:6.3f} s, {len(providers):,} providers, {len(members):,} members, "
+              f"{len(overlap):,} overlapping provider pairs, {len(clusters):,} clusters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from duplicates import duplicate_groups
+
+
+# Average number of claims per member, and numbers of providers and ICD-10 codes, in the synthetic claims
+CLAIMS_PER_MEMBER = 10
+PROVIDERS = 500
+ICD_CODES = 200
+
+# Share of the claims resubmitted a day later for 1% more, which should all be found
+RESUBMITTED = 0.01
+
+
+# Function to generate synthetic claims: members, providers and ICD-10 codes drawn from skewed
+# (Zipf-like) distributions, creation dates over two years and log-normal amounts, with a share of
+# the claims resubmitted a day later for 1% more. Returns the claims, resubmissions last, and the
+# number of resubmissions.
+def synthetic_claims(n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for column, cardinality in [('Member Name', max(n // CLAIMS_PER_MEMBER, 1)), ('Provider Name', PROVIDERS), ('ICD-10 Code', ICD_CODES)]:
+        weights = 1 / np.arange(1, cardinality + 1)
+        columns[column] = rng.choice(cardinality, n, p=weights / weights.sum())
+    claims = pd.DataFrame(columns)
+    claims['Claim Created Date'] = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n), unit='D')
+    claims['Claim Amount'] = np.round(rng.lognormal(9, 1.2, n), -1)
+
+    resubmitted = claims.sample(frac=RESUBMITTED, random_state=seed)
+    resubmitted = resubmitted.assign(**{
+        'Claim Created Date': resubmitted['Claim Created Date'] + pd.Timedelta(days=1),
+        'Claim Amount': resubmitted['Claim Amount'] * 1.01,
+    })
+    return pd.concat([claims, resubmitted], ignore_index=True), len(resubmitted)
+
+
+# Benchmark of the duplicate detection on synthetic claims of growing size, to show the
+# near-linear scaling. Run from the repository root: python -m benchmarks.duplicates_benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Time the duplicate claim groups on synthetic claims.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Numbers of claims")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        claims, n_resubmitted = synthetic_claims(n)
+        start = time.perf_counter()
+        groups = duplicate_groups(claims)
+        elapsed = time.perf_counter() - start
+        found = (groups[-n_resubmitted:] >= 0).mean()
+        print(f"{len(claims):>10,} claims: {elapsed:6.2f} s, {len(np.unique(groups[groups >= 0])):,} candidate groups "
+              f"covering {(groups >= 0).sum():,} claims, {found:.1%} of the resubmissions found")
+
+
+if __name__ == "__main__":
+    main()
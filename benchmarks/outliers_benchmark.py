@@ -0,0 +1,47 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from outliers import OUTLIER_LEVELS, OUTLIER_METHODS, OUTLIER_SEGMENTS, classify_outliers, segment_bounds
+
+
+# Number of distinct values of each segment column in the synthetic claims
+SEGMENT_CARDINALITY = {'Claim Type': 8, 'Product': 2, 'ICD-10 Code': 2_000, 'Provider Name': 5_000}
+
+
+# Function to generate synthetic claims: log-normal amounts, with segment values drawn from a
+# skewed (Zipf-like) distribution so there are large, small and single-claim segments, and a share
+# of fixed-price claims so some segments have no spread
+def synthetic_claims(n, seed=0):
+    rng = np.random.default_rng(seed)
+    amounts = np.round(rng.lognormal(9, 1.2, n), -1)
+    amounts[rng.random(n) < 0.05] = 1_500
+    claims = pd.DataFrame({'Claim Amount': amounts})
+    for segment, cardinality in SEGMENT_CARDINALITY.items():
+        weights = 1 / np.arange(1, cardinality + 1)
+        claims[segment] = rng.choice(cardinality, n, p=weights / weights.sum())
+    return claims
+
+
+# Benchmark of the segment bounds and outlier levels, for each segment and method, on synthetic
+# claims of growing size. Run from the repository root: python -m benchmarks.outliers_benchmark
+def main():
+    parser = argparse.ArgumentParser(description="Time the per-segment outlier bounds on synthetic claims.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000], help="Numbers of claims")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        claims = synthetic_claims(n)
+        amounts = claims['Claim Amount']
+        print(f"{n:,} claims")
+        for segment in OUTLIER_SEGMENTS:
+            for method in OUTLIER_METHODS:
+                start = time.perf_counter()
+                levels = classify_outliers(amounts, segment_bounds(amounts, claims[segment], method))
+                elapsed = time.perf_counter() - start
+                flagged = (levels != OUTLIER_LEVELS[0]).sum()
+                print(f"  {segment:<14} {method}: {elapsed * 1000:8.1f} ms, {claims[segment].nunique():>5} segments, {flagged:,} outliers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import datetime
+import hashlib
+import itertools
+import json
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+# Colors the charts give their series, in turn
+CHART_COLORS = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636", "#9ACBD0"]
+
+# Trace settings of each kind of series
+SERIES_KINDS = {
+    'bar': {'type': 'bar'},
+    'line': {'type': 'scatter', 'mode': 'lines+markers'},
+    'markers': {'type': 'scatter', 'mode': 'markers'},
+    'area': {'type': 'scatter', 'fill': 'tozeroy'},
+    'stacked area': {'type': 'scatter', 'mode': 'lines', 'stackgroup': 'one'},
+}
+
+# Largest total size, in bytes, of the figure specs kept in the figure cache
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Process-wide figure cache shared by every session: hash of (selection, chart) -> plotly JSON of
+# the figure, least recently used first, and the total size of the JSON it holds
+_figures = OrderedDict()
+_figure_bytes = 0
+_lock = threading.Lock()
+
+# Versions of the shared page data: id(frame) -> (weak reference, version)
+_versions = {}
+_version_counter = itertools.count()
+
+
+# Function to fingerprint an aggregated frame: a hash of its values, index, columns and dtypes
+def frame_fingerprint(frame):
+    digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    digest.update(repr((list(frame.columns), list(frame.index.names), [str(dtype) for dtype in frame.dtypes])).encode())
+    return digest.hexdigest()
+
+
+# Function to give a shared page frame a version number, the same while the frame is alive, so a
+# selection can name its data without hashing every row on each rerun
+def data_version(df):
+    with _lock:
+        entry = _versions.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+        key = id(df)
+        version = next(_version_counter)
+        _versions[key] = (weakref.ref(df, lambda _, key=key: _versions.pop(key, None)), version)
+        return version
+
+
+# Function to write a value that JSON has no type for into a cache key: frames by their
+# fingerprint, arrays by the hash of their values, dates in ISO format
+def spec_value(value):
+    if isinstance(value, pd.DataFrame):
+        return frame_fingerprint(value)
+    if isinstance(value, (pd.Series, pd.Index)):
+        return pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes().hex()
+    if isinstance(value, np.ndarray):
+        return pd.util.hash_array(value.ravel()).tobytes().hex()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot key a chart on a {type(value).__name__}")
+
+
+# Function to hash a page selection (its data version, sidebar filters and other widget values)
+# and a chart's name into a figure cache key
+def chart_key(selection, chart):
+    return hashlib.sha256(json.dumps([selection, chart], sort_keys=True, default=spec_value).encode()).hexdigest()
+
+
+# Function to draw a chart from the figure cache. The key is the page selection and the chart
+# name, known before anything is aggregated, so on a hit build() (the chart's aggregation and
+# figure) is skipped and the figure is read back from its stored JSON without validating it
+# again. The cache keeps at most FIGURE_CACHE_BYTES of JSON, dropping the least recently used.
+def cached_chart(selection, chart, build):
+    global _figure_bytes
+    key = chart_key(selection, chart)
+    with _lock:
+        spec = _figures.get(key)
+        if spec is not None:
+            _figures.move_to_end(key)
+    if spec is not None:
+        return go.Figure(json.loads(spec), _validate=False)
+
+    fig = build()
+    spec = fig.to_json()
+    with _lock:
+        if key not in _figures:
+            _figures[key] = spec
+            _figure_bytes += len(spec.encode())
+        while _figure_bytes > FIGURE_CACHE_BYTES and _figures:
+            _figure_bytes -= len(_figures.popitem(last=False)[1].encode())
+    return fig
+
+
+# Function to give n series their colors, cycling through the colors
+def series_colors(n, colors=CHART_COLORS):
+    return np.resize(np.asarray(colors, dtype=object), n)
+
+
+# Function to send axis values compactly: dates without a time of day go as 'YYYY-MM-DD'
+# (plotly reads them as dates) instead of full timestamps
+def axis_values(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        days = np.asarray(values, dtype='datetime64[D]')
+        if not np.isnat(days).any() and (days == np.asarray(values, dtype='datetime64[ns]')).all():
+            return np.datetime_as_string(days)
+    return np.asarray(values)
+
+
+# Function to format the labels of values at once, with a printf-style format applied to the
+# values divided by scale (e.g. '%.1fM' with scale 1e6)
+def format_labels(values, text, scale=1):
+    return np.char.mod(text, np.asarray(values, dtype=float) / scale)
+
+
+# Function to build one series of a chart as a trace. Its labels are either a plotly
+# texttemplate (e.g. '%{y:,}', formatted in the browser so they add nothing to the payload)
+# or a printf-style format of the values (see format_labels).
+def series(x, y, kind='bar', name=None, color=None, text=None, text_scale=1, **trace):
+    values = {'x': axis_values(x), 'y': axis_values(y)}
+    if trace.get('orientation') == 'h':
+        values = {'x': values['y'], 'y': values['x']}
+    trace = {**SERIES_KINDS[kind], **values, 'name': name, **trace}
+
+    if text is not None and '%{' in text:
+        trace['texttemplate'] = text
+    elif text is not None:
+        trace['text'] = format_labels(y, text, text_scale)
+
+    if color is not None:
+        if kind == 'bar':
+            trace['marker_color'] = color
+        elif kind == 'markers':
+            trace['marker'] = {**trace.get('marker', {}), 'color': color}
+        else:
+            trace['line'] = {**trace.get('line', {}), 'color': color}
+            if kind == 'stacked area':
+                trace['fillcolor'] = color
+    return trace
+
+
+# Function to build a bar (or line, or area) chart of an aggregated frame in one call: one series
+# per column of y, or, with a color column, one per category of a tidy frame (in the order they
+# first appear, with their rows in the frame's order). Trace settings shared by the series go in
+# trace, the layout in the keyword arguments (barmode='stack' for stacked bars).
+def category_chart(frame, x, y, color=None, kind='bar', colors=CHART_COLORS, text=None, text_scale=1, trace=None, **layout):
+    trace = trace or {}
+    if color is not None:
+        groups = list(frame.groupby(color, sort=False))
+        columns = [(name, rows[x] if x in rows else rows.index, rows[y]) for name, rows in groups]
+    else:
+        x_values = frame[x] if x in frame else frame.index
+        columns = [(column, x_values, frame[column]) for column in ([y] if isinstance(y, str) else y)]
+
+    texts = text if isinstance(text, list) else [text] * len(columns)
+    traces = [
+        series(x_values, y_values, kind, name=name, color=series_color, text=series_text, text_scale=text_scale, **trace)
+        for (name, x_values, y_values), series_color, series_text in zip(columns, series_colors(len(columns), colors), texts)
+    ]
+    fig = go.Figure(data=traces)
+    fig.update_layout(**layout)
+    return fig
+
+
+# Function to build a dual-axis chart of an aggregated frame: the left and right series (one or
+# a list each) are given as the series() arguments of a y column, and the right ones are drawn on
+# a second y-axis overlaying the first
+def dual_axis_chart(frame, x, left, right, **layout):
+    x_values = frame[x] if x in frame else frame.index
+    traces = []
+    for specs, axis in [(left, {}), (right, {'yaxis': 'y2'})]:
+        for spec in (specs if isinstance(specs, list) else [specs]):
+            arguments = {key: value for key, value in spec.items() if key != 'y'}
+            traces.append(series(x_values, frame[spec['y']], **axis, **arguments))
+    fig = go.Figure(data=traces, layout={'yaxis2': {'overlaying': 'y', 'side': 'right'}})
+    fig.update_layout(**layout)
+    return fig
+
+
+# Function to build a donut chart of an aggregated frame: the share of values of each name,
+# with the slices colored in turn
+def donut_chart(frame, names, values, colors=CHART_COLORS, hole=0.5, trace=None, **layout):
+    donut = {
+        'type': 'pie', 'labels': np.asarray(frame[names]), 'values': np.asarray(frame[values]), 'hole': hole,
+        'hovertemplate': f"{names}=%{{label}}<br>{values}=%{{value}}<extra></extra>",
+        **(trace or {}),
+    }
+    fig = go.Figure(data=[donut], layout={'piecolorway': list(colors)})
+    fig.update_layout(**layout)
+    return fig
+
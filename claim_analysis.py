@@ -9,10 +9,22 @@ from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
 from datetime import datetime
+from aggregations import count_and_sum
+from charts import cached_chart, category_chart, data_version, donut_chart, dual_axis_chart
+from cube import rollup, selection_cube
+from filters import CLAIM_FILTERS, apply_filters, filter_month_year_range, month_year_options
 
 
-# Centered and styled main title using inline styles
-st.markdown('''
+# Sidebar filters rendered by the dashboard for this page
+FILTERS = CLAIM_FILTERS
+
+# Filters shown in the section headers, in order
+DESCRIPTION_COLUMNS = ['Year', 'Claim Type', 'Product', 'Month', 'Quarter']
+
+# Function to render the page from the shared data and the sidebar selections
+def render(data, filters):
+    # Centered and styled main title using inline styles
+    st.markdown('''
     <style>
         .main-title {
             color: #e66c37; /* Title color */
@@ -28,31 +40,17 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-st.markdown('<h1 class="main-title">CLAIMS ANALYSIS</h1>', unsafe_allow_html=True)
-
-
-
-filepath_visits = "Claims.xlsx"
-sheet_name1 = "2023 claims"
-sheet_name2 = "2024 claims"
-
-# Read the Claims data
-dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
+    st.markdown('<h1 class="main-title">CLAIMS ANALYSIS</h1>', unsafe_allow_html=True)
 
-# Read the visit logs
-df = pd.concat([dfc_2023, dfc_2024])
 
 
-df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'], errors='coerce')
+    # Work on the shared claims data passed in by the dashboard
+    df = data
 
-df["Employer Name"] = df["Employer Name"].str.upper()
-df["Provider Name"] = df["Provider Name"].str.upper()
+    # Inspect the merged DataFrame
 
-# Inspect the merged DataFrame
-
-# Sidebar styling and logo
-st.markdown("""
+    # Sidebar styling and logo
+    st.markdown("""
     <style>
     .sidebar .sidebar-content {
         background-color: #f0f2f6;
@@ -101,83 +99,21 @@ st.markdown("""
 
 
 
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
-df = df[df['Month'].isin(month_order)]
-
-
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: pd.to_datetime(x, format='%B').month)
-
-df['Source'] =df['Source'].astype(str)
-
-df['Quarter'] = "Q" + df['Claim Created Date'].dt.quarter.astype(str)
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-quarter = st.sidebar.multiselect("Select Quarter", options=sorted(df['Quarter'].dropna().unique()))
-product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
-type = st.sidebar.multiselect("Select Claim Type", options=sorted(df['Claim Type'].unique()))
-status = st.sidebar.multiselect("Select Claim Status", options=df['Claim Status'].unique())
-source = st.sidebar.multiselect("Select Claim Provider Type", options=sorted(df['Source'].unique()))
-code = st.sidebar.multiselect("Select Diagnosis Code", options=df['ICD-10 Code'].unique())
-client_name = st.sidebar.multiselect("Select Employer Name", options=sorted(df['Employer Name'].dropna().unique()))
-prov_name = st.sidebar.multiselect("Select Provider Name", options=sorted(df['Provider Name'].dropna().unique()))
-
-# Apply filters to the DataFrame
-if 'Year' in df.columns and year:
-    df = df[df['Year'].isin(year)]
-if 'Month' in df.columns and month:
-    df = df[df['Month'].isin(month)]
-if 'Quarter' in df.columns and quarter:
-    df = df[df['Quarter'].isin(quarter)]
-if 'Product' in df.columns and product:
-    df = df[df['Product'].isin(product)]
-if 'Claim Type' in df.columns and type:
-    df = df[df['Claim Type'].isin(type)]
-if 'Claim Status' in df.columns and status:
-    df = df[df['Claim Status'].isin(status)]
-if 'Source' in df.columns and source:
-    df = df[df['Source'].isin(source)]
-if 'ICD-10 Code' in df.columns and code:
-    df = df[df['ICD-10 Code'].isin(code)]
-if 'Employer Name' in df.columns and client_name:
-    df = df[df['Employer Name'].isin(client_name)]
-if 'Provider Name' in df.columns and prov_name:
-    df = df[df['Provider Name'].isin(prov_name)]
-
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if type:
-     filter_description += f"{', '.join(map(str, type))} "
-if product:
-     filter_description += f"{', '.join(map(str, product))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if quarter:
-    filter_description += f"{', '.join(quarter)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Claim Created Date"].min()
-endDate = df["Claim Created Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
+
+
+    # Apply the sidebar filters and describe them for the section headers
+    df, filter_description = apply_filters(df, filters, DESCRIPTION_COLUMNS)
+
+
+
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Claim Created Date"].min()
+    endDate = df["Claim Created Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
     <style>
     .date-input-box {
         border-radius: 10px;
@@ -194,126 +130,108 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
+    # Function to display date input in styled boxes
+    def display_date_input(col, title, default_date, min_date, max_date):
+        col.markdown(f"""
         <div class="date-input-box">
             <div class="date-input-title">{title}</div>
         </div>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
-
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
-
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
-
+        return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
 
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
+    # Extract unique month-year combinations in period order
+    month_years = month_year_options(df)
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
+    # Select slider for month-year range
+    selected_month_year_range = st.select_slider(
+        "Select Month-Year Range",
+        options=month_years,
+        value=(month_years[0], month_years[-1])
+    )
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Filter DataFrame on the precomputed period key
+    df = filter_month_year_range(df, selected_month_year_range)
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    # Cube of the current selection, which the charts roll up instead of re-scanning the claims
+    cube = selection_cube(data, df, filters, selected_month_year_range)
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # The selection the charts are drawn from, which keys them in the figure cache
+    selection = {'page': __name__, 'data': data_version(data), 'filters': filters, 'range': selected_month_year_range}
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
 
 
 
 
+    df_out = df[df['Claim Type'] == 'Outpatient']
+    df_dental = df[df['Claim Type'] == 'Dental']
+    df_wellness = df[df['Claim Type'] == 'Wellness']
+    df_optical = df[df['Claim Type'] == 'Optical']
+    df_phar = df[df['Claim Type'] == 'Pharmacy']
+    df_mat = df[df['Claim Type'] == 'Maternity']
+    df_pro = df[df['Claim Type'] == 'ProActiv']
+    df_in = df[df['Claim Type'] == 'Inpatient']
 
-df_out = df[df['Claim Type'] == 'Outpatient']
-df_dental = df[df['Claim Type'] == 'Dental']
-df_wellness = df[df['Claim Type'] == 'Wellness']
-df_optical = df[df['Claim Type'] == 'Optical']
-df_phar = df[df['Claim Type'] == 'Pharmacy']
-df_mat = df[df['Claim Type'] == 'Maternity']
-df_pro = df[df['Claim Type'] == 'ProActiv']
-df_in = df[df['Claim Type'] == 'Inpatient']
+    df_health = df[df['Product'] == 'Health Insurance']
+    df_proactiv = df[df['Product'] == 'ProActiv']
 
-df_health = df[df['Product'] == 'Health Insurance']
-df_proactiv = df[df['Product'] == 'ProActiv']
+    df_app = df[df['Claim Status'] == 'Approved']
+    df_dec = df[df['Claim Status'] == 'Declined']
 
-df_app = df[df['Claim Status'] == 'Approved']
-df_dec = df[df['Claim Status'] == 'Declined']
+    if not df.empty:
 
-if not df.empty:
+        scale=1_000_000  # For millions
 
-    scale=1_000_000  # For millions
+        total_claim_amount = (df["Claim Amount"].sum())/scale
+        total_claim_amount
+        average_amount =(df["Claim Amount"].mean())/scale
+        average_app_amount =(df["Approved Claim Amount"].mean())/scale
 
-    total_claim_amount = (df["Claim Amount"].sum())/scale
-    total_claim_amount
-    average_amount =(df["Claim Amount"].mean())/scale
-    average_app_amount =(df["Approved Claim Amount"].mean())/scale
+        total_out = (df_out['Claim Amount'].sum())/scale
+        total_dental = (df_dental['Claim Amount'].sum())/scale
+        total_wellness = (df_wellness['Claim Amount'].sum())/scale
+        total_optical = (df_optical['Claim Amount'].sum())/scale
+        total_in = (df_in['Claim Amount'].sum())/scale
+        total_phar = (df_phar['Claim Amount'].sum())/scale
+        total_pro = (df_pro['Claim Amount'].sum())/scale
+        total_mat = (df_mat['Claim Amount'].sum())/scale
 
-    total_out = (df_out['Claim Amount'].sum())/scale
-    total_dental = (df_dental['Claim Amount'].sum())/scale
-    total_wellness = (df_wellness['Claim Amount'].sum())/scale
-    total_optical = (df_optical['Claim Amount'].sum())/scale
-    total_in = (df_in['Claim Amount'].sum())/scale
-    total_phar = (df_phar['Claim Amount'].sum())/scale
-    total_pro = (df_pro['Claim Amount'].sum())/scale
-    total_mat = (df_mat['Claim Amount'].sum())/scale
+        total_app_claim_amount = (df_app["Claim Amount"].sum())/scale
+        total_dec_claim_amount = (df_dec["Claim Amount"].sum())/scale
 
-    total_app_claim_amount = (df_app["Claim Amount"].sum())/scale
-    total_dec_claim_amount = (df_dec["Claim Amount"].sum())/scale
+        total_app = df_app["Claim ID"].nunique()
+        total_dec = df_dec["Claim ID"].nunique()
 
-    total_app = df_app["Claim ID"].nunique()
-    total_dec = df_dec["Claim ID"].nunique()
+        total_health_claim_amount = (df_app["Claim Amount"].sum())/scale
+        total_pro_claim_amount = (df_dec["Claim Amount"].sum())/scale
 
-    total_health_claim_amount = (df_app["Claim Amount"].sum())/scale
-    total_pro_claim_amount = (df_dec["Claim Amount"].sum())/scale
+        total_health = df_health["Claim ID"].nunique()
+        total_proactiv = df_proactiv["Claim ID"].nunique()
 
-    total_health = df_health["Claim ID"].nunique()
-    total_proactiv = df_proactiv["Claim ID"].nunique()
+        total_clients = df["Employer Name"].nunique()
+        total_claims = df["Claim ID"].nunique()
 
-    total_clients = df["Employer Name"].nunique()
-    total_claims = df["Claim ID"].nunique()
 
+        total_app_per = (total_app/total_claims)*100
+        total_dec_per = (total_dec/total_claims)*100
 
-    total_app_per = (total_app/total_claims)*100
-    total_dec_per = (total_dec/total_claims)*100
 
+        percent_app = (total_app_claim_amount/total_claim_amount) *100
 
-    percent_app = (total_app_claim_amount/total_claim_amount) *100
 
-
-    # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
-    st.markdown("""
+        # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
+        st.markdown("""
         <style>
         .custom-subheader {
             color: #e66c37;
@@ -348,9 +266,9 @@ if not df.empty:
 
 
 
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
+        # Function to display metrics in styled boxes with tooltips
+        def display_metric(col, title, value):
+            col.markdown(f"""
             <div class="metric-box">
                 <div class="metric-title">{title}</div>
                 <div class="metric-value">{value}</div>
@@ -358,230 +276,154 @@ if not df.empty:
             """, unsafe_allow_html=True)
 
 
-   # Calculate key metrics
-    st.markdown(f'<h2 class="custom-subheader">For all Claims in Numbers ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
+       # Calculate key metrics
+        st.markdown(f'<h2 class="custom-subheader">For all Claims in Numbers ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
 
-    cols1,cols2, cols3 = st.columns(3)
+        cols1,cols2, cols3 = st.columns(3)
 
-    display_metric(cols1, "Number of Clients", total_clients)
-    display_metric(cols2, "Number of Claims", total_claims)
-    display_metric(cols3, "Number of Approved Claims", total_app)
-    display_metric(cols1, "Number of Declined Claims",total_dec)
-    display_metric(cols2, "Percentage Approved", F"{total_app_per: .0F} %")
-    display_metric(cols3, "Percentage Declined", F"{total_dec_per: .0F} %")
-
-    # Calculate key metrics
-    st.markdown(f'<h2 class="custom-subheader">For all Claim Amounts ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
-
-    cols1,cols2, cols3 = st.columns(3)
-
-    display_metric(cols1, "Total Claims", total_claims)
-    display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
-    display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
-    display_metric(cols1, "Total Declined Claim Amount", f"{total_dec_claim_amount:,.0f} M")
-    display_metric(cols2, "Average Claim Amount Per Client", F"{average_amount:,.0F} M")
-    display_metric(cols3, "Average Claim Amount Per Client", F"{average_app_amount: ,.0F} M")
+        display_metric(cols1, "Number of Clients", total_clients)
+        display_metric(cols2, "Number of Claims", total_claims)
+        display_metric(cols3, "Number of Approved Claims", total_app)
+        display_metric(cols1, "Number of Declined Claims",total_dec)
+        display_metric(cols2, "Percentage Approved", F"{total_app_per: .0F} %")
+        display_metric(cols3, "Percentage Declined", F"{total_dec_per: .0F} %")
 
-    custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636","#9ACBD0"]
+        # Calculate key metrics
+        st.markdown(f'<h2 class="custom-subheader">For all Claim Amounts ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
 
-    cols1, cols2 = st.columns(2)
+        cols1,cols2, cols3 = st.columns(3)
 
-   
-    # Group by day and count the occurrences
-    area_chart_count = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d")).size().reset_index(name='Count')
-    area_chart_amount = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d"))['Claim Amount'].sum().reset_index(name='Claim Amount')
+        display_metric(cols1, "Total Claims", total_claims)
+        display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
+        display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
+        display_metric(cols1, "Total Declined Claim Amount", f"{total_dec_claim_amount:,.0f} M")
+        display_metric(cols2, "Average Claim Amount Per Client", F"{average_amount:,.0F} M")
+        display_metric(cols3, "Average Claim Amount Per Client", F"{average_app_amount: ,.0F} M")
 
-    # Merge the count and amount data
-    area_chart = pd.merge(area_chart_count, area_chart_amount, on='Claim Created Date')
-
-    # Sort by the PreAuth Created Date
-    area_chart = area_chart.sort_values("Claim Created Date")
-
-    with cols1:
-        # Create the dual-axis area chart
-        fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-
-        # Add traces
-        fig2.add_trace(
-            go.Scatter(x=area_chart['Claim Created Date'], y=area_chart['Count'], name="Number of Claims", fill='tozeroy', line=dict(color='#e66c37')),
-            secondary_y=False,
-        )
-
-        fig2.add_trace(
-            go.Scatter(x=area_chart['Claim Created Date'], y=area_chart['Claim Amount'], name="Claim Amount", fill='tozeroy', line=dict(color='#009DAE')),
-            secondary_y=True,
-        )
-
-
-
-        # Set x-axis title
-        fig2.update_xaxes(title_text="Claim Created Date", tickangle=45)  # Rotate x-axis labels to 45 degrees for better readability
-
-        # Set y-axes titles
-        fig2.update_yaxes(title_text="<b>Number Of Claims</b>", secondary_y=False)
-        fig2.update_yaxes(title_text="<b>Claim Amount</b>", secondary_y=True)
-
-        st.markdown('<h3 class="custom-subheader">Number of Claims and Claim Amount Over Time</h3>', unsafe_allow_html=True)
-
-        st.plotly_chart(fig2, use_container_width=True)
-
-    # Group data by "Year" and "Month" to calculate total claims and average claim amount
-    yearly_claim_data = df.groupby(['Year'])['Claim Amount'].agg(['mean', 'size']).reset_index()
-
-    # Format numbers with commas and rounding
-    yearly_claim_data['size_formatted'] = yearly_claim_data['size'].apply(lambda x: f'{x:,.0f}')  
-
-    # Yearly Chart: Total Claims and Average Claim Amount by Year
-    with cols2:
-        # Create the grouped bar chart for yearly data
-        fig_yearly_claims = go.Figure()
-
-        # Add trace for Total Claims (Count)
-        fig_yearly_claims.add_trace(go.Bar(
-            x=yearly_claim_data['Year'],
-            y=yearly_claim_data['size'],
-            name='Total Claims',
-            text=yearly_claim_data['size_formatted'],  # Use formatted text
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[0]
-        ))
-
-        # Add trace for Average Claim Amount
-        fig_yearly_claims.add_trace(go.Bar(
-            x=yearly_claim_data['Year'],
-            y=yearly_claim_data['mean'],  # Correct column name
-            name='Average Claim Amount',
-            text=[f'{value/1e3:.2f}K' for value in yearly_claim_data['mean']],  # Format as millions with 2 decimal places
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[1]
-        ))
-
-        # Set layout for the yearly chart
-        fig_yearly_claims.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Value",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450,
-            legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
-        )
-
-        # Display the yearly chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Yearly Total Claims and Average Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_claims, use_container_width=True)
-
-    cls1, cls2 = st.columns(2)
-
-    # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
-    yearly_avg_premium = df.groupby(['Year', 'Claim Status'])['Claim Amount'].mean().unstack().fillna(0)
-
-    # Define custom colors
-
-    with cls1:
-        # Create the grouped bar chart
-        fig_yearly_avg_premium = go.Figure()
-
-        for idx, Client_Segment in enumerate(yearly_avg_premium.columns):
-            fig_yearly_avg_premium.add_trace(go.Bar(
-                x=yearly_avg_premium.index,
-                y=yearly_avg_premium[Client_Segment],
-                name=Client_Segment,
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-            ))
+        custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636","#9ACBD0"]
 
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Average Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height= 450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Yearly Claim Amount by Claim Status </h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-   
-   
-    with cls2:
-
-        # Group the data by Claim Type and calculate the number of claims and total claim amount
-        df_claims_grouped = df.groupby('Claim Type').agg(
-            Total_Claims=pd.NamedAgg(column='Claim ID', aggfunc='count'),  # Count the number of claims per Claim Type
-            Total_Claim_Amount=pd.NamedAgg(column='Claim Amount', aggfunc='mean')  # Sum the claim amounts per Claim Type
-        ).reset_index()
-
-        # Create a scatter plot for Number of Claims vs Claim Amount by Claim Type
-        fig_claims_vs_amount = go.Figure()
-
-        # Loop over the grouped data to add scatter points for each claim type with custom colors
-        for idx, claim_type in enumerate(df_claims_grouped['Claim Type']):
-            fig_claims_vs_amount.add_trace(go.Scatter(
-                x=[df_claims_grouped.iloc[idx]['Total_Claims']],  # x-axis will be the Number of Claims for this claim type
-                y=[df_claims_grouped.iloc[idx]['Total_Claim_Amount']],  # y-axis will be the Claim Amount for this claim type
-                mode='markers',
-                name=claim_type,  # Label the point with the claim type
-                marker=dict(
-                    color=custom_colors[idx % len(custom_colors)],  # Cycle through custom colors based on the index
-                    size=10
-                ),
-                text=f"Claim Type: {claim_type}",  # Text shown on hover
-                hoverinfo='text+x+y'  # Show claim type and data when hovering
-            ))
+        cols1, cols2 = st.columns(2)
 
-        # Update layout
-        fig_claims_vs_amount.update_layout(
-            yaxis_title="Claim Amount (M)",  # Label for the y-axis
-            xaxis_title="Number of Claims",  # Label for the x-axis
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500,
-        )
 
-        st.markdown('<h3 class="custom-subheader">Number of Claims vs Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_claims_vs_amount, use_container_width=True)
+        # Function to chart the claims over time
+        def claims_over_time_chart():
+            # Count the claims and total the claim amount per day, sorted by date
+            area_chart = count_and_sum(df, 'Claim Day', 'Claim Amount').rename(columns={'Claim Day': 'Claim Created Date'})
 
+            # Create the dual-axis area chart, rotating the x-axis labels by 45 degrees for better readability
+            return dual_axis_chart(
+                area_chart, 'Claim Created Date',
+                left=dict(y='Count', kind='area', name="Number of Claims", color='#e66c37'),
+                right=dict(y='Claim Amount', kind='area', name="Claim Amount", color='#009DAE'),
+                xaxis_title="Claim Created Date",
+                xaxis_tickangle=45,
+                yaxis_title="<b>Number Of Claims</b>",
+                yaxis2_title="<b>Claim Amount</b>",
+            )
 
-    # Group data by "Start Month" and "Channel" and sum the Approved Claim Amount sum
-    monthly_premium = df.groupby(['Month', 'Claim Status'])['Claim Amount'].mean().unstack().fillna(0)
+        with cols1:
+            fig2 = cached_chart(selection, 'claims over time', claims_over_time_chart)
 
-    # Group data by "Start Month" to count the number of sales
-    monthly_sales_count = df.groupby(['Month']).size()
+            st.markdown('<h3 class="custom-subheader">Number of Claims and Claim Amount Over Time</h3>', unsafe_allow_html=True)
 
-    # Create the layout columns
+            st.plotly_chart(fig2, use_container_width=True)
 
-    with cls2:
+        # Function to chart the yearly claims
+        def yearly_claims_chart():
+            # Group data by "Year" and "Month" to calculate total claims and average claim amount
+            yearly_claim_data = rollup(cube, ['Year'], {'Total Claims': ('Claim Amount', 'size'), 'Average Claim Amount': ('Claim Amount', 'mean')}).reset_index()
 
-        fig_monthly_premium = go.Figure()
+            # Create the grouped bar chart for yearly data: claims with commas, average amounts in thousands
+            return category_chart(
+                yearly_claim_data, 'Year', ['Total Claims', 'Average Claim Amount'], colors=custom_colors,
+                text=['%{y:,}', '%.2fK'], text_scale=1e3,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Value",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450,
+                legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
+            )
 
-        for idx, Client_Segment in enumerate(monthly_premium.columns):
-                fig_monthly_premium.add_trace(go.Bar(
-                    x=monthly_premium.index,
-                    y=monthly_premium[Client_Segment],
-                    name=Client_Segment,
-                    textposition='inside',
-                    textfont=dict(color='white'),
-                    hoverinfo='x+y+name',
-                    marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-                ))
+        # Yearly Chart: Total Claims and Average Claim Amount by Year
+        with cols2:
+            fig_yearly_claims = cached_chart(selection, 'yearly claims', yearly_claims_chart)
+
+            # Display the yearly chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Yearly Total Claims and Average Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_claims, use_container_width=True)
+
+        cls1, cls2 = st.columns(2)
+
+        # Function to chart the average claim amount per year and claim status
+        def yearly_average_chart():
+            # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
+            yearly_avg_premium = rollup(cube, ['Year', 'Claim Status'], {'mean': ('Claim Amount', 'mean')})['mean'].unstack().fillna(0)
+
+            # Create the grouped bar chart, one bar per Claim Status
+            return category_chart(
+                yearly_avg_premium, 'Year', list(yearly_avg_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Average Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height= 450
+            )
+
+        with cls1:
+            fig_yearly_avg_premium = cached_chart(selection, 'yearly average by status', yearly_average_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Yearly Claim Amount by Claim Status </h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+
+        # Function to chart the number of claims against the average claim amount of each claim type
+        def claims_vs_amount_chart():
+            # Group the data by Claim Type and calculate the number of claims and total claim amount
+            df_claims_grouped = rollup(cube, 'Claim Type', {
+                'Total_Claims': ('Claim ID', 'count'),  # Count the number of claims per Claim Type
+                'Total_Claim_Amount': ('Claim Amount', 'mean')  # Sum the claim amounts per Claim Type
+            }).reset_index()
+
+            # Create a scatter plot for Number of Claims vs Claim Amount, one point per Claim Type with custom colors
+            # (the claim type and data are shown when hovering)
+            return category_chart(
+                df_claims_grouped, 'Total_Claims', 'Total_Claim_Amount', color='Claim Type', kind='markers', colors=custom_colors,
+                trace=dict(marker=dict(size=10), hoverinfo='name+x+y'),
+                yaxis_title="Claim Amount (M)",  # Label for the y-axis
+                xaxis_title="Number of Claims",  # Label for the x-axis
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500,
+            )
 
 
-            # Set layout for the Approved Claim Amount sum chart
-        fig_monthly_premium.update_layout(
+        with cls2:
+            fig_claims_vs_amount = cached_chart(selection, 'claims vs amount by claim type', claims_vs_amount_chart)
+
+            st.markdown('<h3 class="custom-subheader">Number of Claims vs Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_claims_vs_amount, use_container_width=True)
+
+
+        # Function to chart the average claim amount per month and claim status
+        def monthly_average_chart():
+            # Group data by "Start Month" and "Channel" and sum the Approved Claim Amount sum
+            monthly_premium = rollup(cube, ['Month', 'Claim Status'], {'mean': ('Claim Amount', 'mean')})['mean'].unstack().fillna(0)
+
+            # One bar per Claim Status
+            return category_chart(
+                monthly_premium, 'Month', list(monthly_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
                 barmode='group',  # Grouped bar chart
                 xaxis_title="Month",
                 yaxis_title="Average Claim Amount",
@@ -591,441 +433,388 @@ if not df.empty:
                 margin=dict(l=0, r=0, t=30, b=50),
             )
 
+        # Group data by "Start Month" to count the number of sales
+        monthly_sales_count = rollup(cube, ['Month'], {'size': ('Claim ID', 'size')})['size']
+
+        # Create the layout columns
+
+        with cls2:
+            fig_monthly_premium = cached_chart(selection, 'monthly average by status', monthly_average_chart)
+
             # Display the Approved Claim Amount sum chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Avearge Monthly Claim Amount by Claim Status</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_monthly_premium, use_container_width=True)
-
-
-    # Group by Source and calculate the total number of claims and total claim amount
-    df_source_grouped = df.groupby('Month').agg(
-        Total_Claims=pd.NamedAgg(column='Claim ID', aggfunc='count'),
-        Total_Claim_Amount=pd.NamedAgg(column='Claim Amount', aggfunc='sum')
-    ).reset_index()
-
-    # Sort the df_source_grouped by Total_Claims in descending order to find the most popular provider type
-    df_source_grouped = df_source_grouped.sort_values(by='Total_Claims', ascending=False)
-
-    # Get the most popular provider type
-    most_popular_provider = df_source_grouped.iloc[0]['Month'] if not df_source_grouped.empty else "No Data"
-
-    # Format Claim Amount with millions
-    df_source_grouped['Claim_Amount_Formatted'] = df_source_grouped['Total_Claim_Amount'].apply(lambda x: f'{x/1e6:.0f}M')
-
-    # Create the dual-axis chart (bar for claim amount, line for number of claims)
-    with cls1:
-        fig1 = go.Figure()
-
-        # Add line for Number of Claims (using the left y-axis)
-        fig1.add_trace(go.Scatter(
-            x=df_source_grouped['Month'],
-            y=df_source_grouped['Total_Claims'],
-            name='Number of Claims',
-            mode='lines+markers',  
-            text=df_source_grouped['Total_Claims'],  # Display number of claims as text
-            textposition='top center',
-            textfont=dict(color='black', size=12),
-            line=dict(color="#e66c37", width=2),
-            marker=dict(size=8, color="#e66c37"),
-            yaxis='y1'  # Assigning to the first y-axis
-        ))
-
-        # Add bars for Total Claim Amount (using the right y-axis)
-        fig1.add_trace(go.Bar(
-            x=df_source_grouped['Month'],
-            y=df_source_grouped['Total_Claim_Amount'],
-            name='Claim Amount',
-            text=df_source_grouped['Claim_Amount_Formatted'],  # Use formatted text
-            textposition='inside',
-            textfont=dict(color='white'),
-            marker_color="#009DAE",
-            yaxis='y2'  # Assigning to the second y-axis
-        ))
-
-        # Update layout for the dual-axis chart
-        fig1.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Month",
-            yaxis=dict(
-                title="Number of Claims",
-                title_font=dict(size=14),
-                tickfont=dict(size=12),
-                side='left'  # Position the first y-axis on the left
-            ),
-            yaxis2=dict(
-                title="Claim Amount",
-                title_font=dict(size=14),
-                tickfont=dict(size=12),
-                showline=False,  # Hides the axis line
-                overlaying='y',  # Overlay the second y-axis over the first
-                side='right',  # Position the second y-axis on the right
-                showgrid=False  # Disable gridlines on the right y-axis
-            ),
-            font=dict(color='Black'),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=500,
-            legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-
-        st.markdown('<h3 class="custom-subheader">Monthly Claims & Total Claim Amount Distribution</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig1, use_container_width=True)
-
-
- 
-
-
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
-    
-    # Calculate the Approved Claim Amount by Client Segment
-    int_owner = df.groupby("Claim Type")["Claim Amount"].sum().reset_index()
-    int_owner.columns = ["Claim Type", "Claim Amount"]    
-
-    with cls1:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
-
-
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Claim Type", values="Claim Amount", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
-
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
-
-# Calculate the Approved Claim Amount by Client Segment
-    int_owner = df.groupby("Product")["Claim Amount"].sum().reset_index()
-    int_owner.columns = ["Product", "Claim Amount"]    
-
-    with cls2:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Claim Amount by Product</h3>', unsafe_allow_html=True)
-
-
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Product", values="Claim Amount", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
-
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
-
-
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
-
-    # Group by Diagnosis: Sum Claim Amount & Count Claims
-    df_grouped_diag = df.groupby('Diagnosis').agg({'Claim Amount': 'sum', 'ICD-10 Code': 'count'}).nlargest(10, 'Claim Amount').reset_index()
-    df_grouped_diag.rename(columns={'ICD-10 Code': 'Number of Claims'}, inplace=True)
-
-    # Group by ICD-10 Code: Sum Claim Amount & Count Claims
-    df_grouped_icd = df.groupby('ICD-10 Code').agg({'Claim Amount': 'sum', 'Diagnosis': 'count'}).nlargest(10, 'Claim Amount').reset_index()
-    df_grouped_icd.rename(columns={'Diagnosis': 'Number of Claims'}, inplace=True)
-
-    # Function to create a dual-axis chart
-    def create_dual_axis_chart(df, x_col, y1_col, y2_col, x_title):
-        fig = go.Figure()
-
-        # Bar chart for Claim Amount
-        fig.add_trace(go.Bar(
-            x=df[x_col],
-            y=df[y1_col],
-            text=[f'{value/1e6:.0f}M' for value in df[y1_col]],
-            textposition='auto',
-            marker_color="#009DAE",
-            name="Claim Amount",
-            yaxis="y1"
-        ))
-
-        # Line chart for Number of Claims
-        fig.add_trace(go.Scatter(
-            x=df[x_col],
-            y=df[y2_col],
-            mode='lines+markers',
-            name="Number of Claims",
-            yaxis="y2",
-            line=dict(color="red", width=2),
-            marker=dict(size=8, symbol="circle-open")
-        ))
-
-        fig.update_layout(
-            xaxis_title=x_title,
-            yaxis=dict(title="Claim Amount", side="left", showgrid=False),
-            yaxis2=dict(title="Number of Claims", side="right", overlaying="y", showgrid=False),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        return fig
-
-    # Diagnosis Chart
-    with cls1:
-        st.markdown('<h3 class="custom-subheader">Top 10 Diagnoses by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(create_dual_axis_chart(df_grouped_diag, "Diagnosis", "Claim Amount", "Number of Claims", "Diagnosis"), use_container_width=True)
-
-    # ICD-10 Chart
-    with cls2:
-        st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Codes by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(create_dual_axis_chart(df_grouped_icd, "ICD-10 Code", "Claim Amount", "Number of Claims", "ICD-10 Code"), use_container_width=True)
-
-
-
-
-    # Group by Source and calculate the total number of claims and total claim amount
-    df_source_grouped = df.groupby('Source').agg(
-        Total_Claims=pd.NamedAgg(column='Claim ID', aggfunc='count'),
-        Total_Claim_Amount=pd.NamedAgg(column='Claim Amount', aggfunc='sum')
-    ).reset_index()
-
-    # Sort the df_source_grouped by Total_Claims in descending order to find the most popular provider type
-    df_source_grouped = df_source_grouped.sort_values(by='Total_Claims', ascending=False)
-
-    # Get the most popular provider type
-    most_popular_provider = df_source_grouped.iloc[0]['Source'] if not df_source_grouped.empty else "No Data"
-
-    # Format Claim Amount with millions
-    df_source_grouped['Claim_Amount_Formatted'] = df_source_grouped['Total_Claim_Amount'].apply(lambda x: f'{x/1e6:.0f}M')
-
-    # Create the dual-axis chart (bar for claim amount, line for number of claims)
-    with cls1:
-        fig1 = go.Figure()
-
-        # Add line for Number of Claims (using the left y-axis)
-        fig1.add_trace(go.Scatter(
-            x=df_source_grouped['Source'],
-            y=df_source_grouped['Total_Claims'],
-            name='Number of Claims',
-            mode='lines+markers',  # Show lines, markers, and text
-            text=df_source_grouped['Total_Claims'],  # Display number of claims as text
-            textposition='top center',
-            textfont=dict(color='black', size=12),
-            line=dict(color="#e66c37", width=2),
-            marker=dict(size=8, color="#e66c37"),
-            yaxis='y1'  # Assigning to the first y-axis
-        ))
-
-        # Add bars for Total Claim Amount (using the right y-axis)
-        fig1.add_trace(go.Bar(
-            x=df_source_grouped['Source'],
-            y=df_source_grouped['Total_Claim_Amount'],
-            name='Claim Amount',
-            text=df_source_grouped['Claim_Amount_Formatted'],  # Use formatted text
-            textposition='inside',
-            textfont=dict(color='white'),
-            marker_color="#009DAE",
-            yaxis='y2'  # Assigning to the second y-axis
-        ))
-
-        # Update layout for the dual-axis chart
-        fig1.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Provider Type",
-            yaxis=dict(
-                title="Number of Claims",
-                title_font=dict(size=14),
-                tickfont=dict(size=12),
-                side='left'  # Position the first y-axis on the left
-            ),
-            yaxis2=dict(
-                title="Claim Amount",
-                title_font=dict(size=14),
-                tickfont=dict(size=12),
-                overlaying='y',  # Overlay the second y-axis over the first
-                side='right',  # Position the second y-axis on the right
-                showgrid=False  # Disable gridlines on the right y-axis
-            ),
-            font=dict(color='Black'),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=500,
-            legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown(f'<h3 class="custom-subheader">Most Popular Provider Type: {most_popular_provider}</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig1, use_container_width=True)
-
-
-    # Group by Employer Name and Claim Status, then sum the Claim Amount
-    df_grouped = df.groupby(['Employer Name', 'Claim Status'])['Claim Amount'].sum().reset_index()
-
-    # Get the top 15 employers by total Claim Amount
-    top_15_clients = df_grouped.groupby('Employer Name')['Claim Amount'].sum().nlargest(15).reset_index()
-
-    # Filter the original DataFrame to include only the top 15 employers
-    client_df = df_grouped[df_grouped['Employer Name'].isin(top_15_clients['Employer Name'])]
-
-    # Sort the client_df by Claim Amount in descending order
-    client_df = client_df.sort_values(by='Claim Amount', ascending=False)
-
-    with cls2:
-        # Create the stacked bar chart
-        fig = go.Figure()
-
-        # Add bars for each Claim Status
-        for idx, claim_status in enumerate(client_df['Claim Status'].unique()):
-            claim_status_data = client_df[client_df['Claim Status'] == claim_status]
-            fig.add_trace(go.Bar(
-                x=claim_status_data['Employer Name'],
-                y=claim_status_data['Claim Amount'],
-                name=claim_status,
-                text=[f'{value/1e6:.0f}M' for value in claim_status_data['Claim Amount']],
-                textposition='auto',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through colors
-            ))
+            st.markdown('<h3 class="custom-subheader">Avearge Monthly Claim Amount by Claim Status</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_monthly_premium, use_container_width=True)
 
-        fig.update_layout(
-            barmode='stack',
-            yaxis_title="Claim Amount",
-            xaxis_title="Employer Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Clients by Claim Amount and Claim Status</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
+        # Group by Source and calculate the total number of claims and total claim amount
+        df_source_grouped = rollup(cube, 'Month', {
+            'Total_Claims': ('Claim ID', 'count'),
+            'Total_Claim_Amount': ('Claim Amount', 'sum')
+        }).reset_index()
 
-    # Group by ICD-10 Code and sum the Claim Amount
-    df_icd_grouped = df.groupby('ICD-10 Code')['Claim Amount'].sum().nlargest(10).reset_index()
+        # Sort the df_source_grouped by Total_Claims in descending order to find the most popular provider type
+        df_source_grouped = df_source_grouped.sort_values(by='Total_Claims', ascending=False)
 
-    # Sort the df_icd_grouped by Claim Amount in descending order
-    df_icd_grouped = df_icd_grouped.sort_values(by='Claim Amount', ascending=False)
+        # Get the most popular provider type
+        most_popular_provider = df_source_grouped.iloc[0]['Month'] if not df_source_grouped.empty else "No Data"
 
-    with cls1:
-        # Create the bar chart
-        fig1 = go.Figure()
+        # Function to chart the claims and claim amount per month
+        def monthly_claims_chart():
+            return dual_axis_chart(
+                df_source_grouped, 'Month',
+                left=dict(
+                    y='Total_Claims', kind='line', name='Number of Claims', color="#e66c37",
+                    line=dict(width=2), marker=dict(size=8),
+                ),
+                right=dict(
+                    y='Total_Claim_Amount', kind='bar', name='Claim Amount', color="#009DAE",
+                    text='%.0fM', text_scale=1e6, textposition='inside', textfont=dict(color='white'),  # Claim Amount in millions
+                ),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis=dict(
+                    title="Number of Claims",
+                    title_font=dict(size=14),
+                    tickfont=dict(size=12),
+                    side='left'  # Position the first y-axis on the left
+                ),
+                yaxis2=dict(
+                    title="Claim Amount",
+                    title_font=dict(size=14),
+                    tickfont=dict(size=12),
+                    showline=False,  # Hides the axis line
+                    overlaying='y',  # Overlay the second y-axis over the first
+                    side='right',  # Position the second y-axis on the right
+                    showgrid=False  # Disable gridlines on the right y-axis
+                ),
+                font=dict(color='Black'),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=500,
+                legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
 
-        # Add bars for each ICD-10 Code
-        fig1.add_trace(go.Bar(
-            x=df_icd_grouped['ICD-10 Code'],
-            y=df_icd_grouped['Claim Amount'],
-            text=[f'{value/1e6:.0f}M' for value in df_icd_grouped['Claim Amount']],
-            textposition='auto',
-            marker_color="#009DAE"
-        ))
+        # Create the dual-axis chart (bar for claim amount, line for number of claims)
+        with cls1:
+            fig1 = cached_chart(selection, 'monthly claims', monthly_claims_chart)
 
-        fig1.update_layout(
-            yaxis_title="Claim Amount",
-            xaxis_title="ICD-10 Code",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
+            st.markdown('<h3 class="custom-subheader">Monthly Claims & Total Claim Amount Distribution</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig1, use_container_width=True)
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Codes by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig1, use_container_width=True)
 
 
 
 
-    # Group by Provider Name and Source, then sum the Claim Amount
-    df_grouped = df.groupby(['Provider Name', 'Source'])['Claim Amount'].sum().reset_index()
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
 
-    # Get the top 15 providers by total Claim Amount
-    top_15_providers = df_grouped.groupby('Provider Name')['Claim Amount'].sum().nlargest(15).reset_index()
+        # Function to chart the share of the claim amount of each claim type
+        def claim_type_share_chart():
+            # Calculate the Approved Claim Amount by Client Segment
+            int_owner = rollup(cube, "Claim Type", {"Claim Amount": ("Claim Amount", "sum")}).reset_index()
+            int_owner.columns = ["Claim Type", "Claim Amount"]    
 
-    # Filter the original DataFrame to include only the top 15 providers
-    client_df = df_grouped[df_grouped['Provider Name'].isin(top_15_providers['Provider Name'])]
+            # Create a donut chart
+            return donut_chart(
+                int_owner, "Claim Type", "Claim Amount", colors=custom_colors, trace=dict(textposition='inside', textinfo='value+percent'),
+                template="plotly_dark", height=450, margin=dict(l=0, r=10, t=30, b=50),
+            )
 
-    # Sort the client_df by Claim Amount in descending order
-    client_df = client_df.sort_values(by='Claim Amount', ascending=False)
+        with cls1:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
 
-    with cls2:
-        # Create the stacked bar chart
-        fig = go.Figure()
 
-        # Add bars for each Source
-        for idx, source in enumerate(client_df['Source'].unique()):
-            source_data = client_df[client_df['Source'] == source]
-            fig.add_trace(go.Bar(
-                x=source_data['Provider Name'],
-                y=source_data['Claim Amount'],
-                name=source,
-                text=[f'{value/1e6:.0f}M' for value in source_data['Claim Amount']],
+            fig = cached_chart(selection, 'claim amount by claim type', claim_type_share_chart)
+
+            # Display the chart in Streamlit
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Function to chart the share of the claim amount of each product
+        def product_share_chart():
+            # Calculate the Approved Claim Amount by Client Segment
+            int_owner = rollup(cube, "Product", {"Claim Amount": ("Claim Amount", "sum")}).reset_index()
+            int_owner.columns = ["Product", "Claim Amount"]    
+
+            # Create a donut chart
+            return donut_chart(
+                int_owner, "Product", "Claim Amount", colors=custom_colors, trace=dict(textposition='inside', textinfo='value+percent'),
+                template="plotly_dark", height=450, margin=dict(l=0, r=10, t=30, b=50),
+            )
+
+        with cls2:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Claim Amount by Product</h3>', unsafe_allow_html=True)
+
+
+            fig = cached_chart(selection, 'claim amount by product', product_share_chart)
+
+            # Display the chart in Streamlit
+            st.plotly_chart(fig, use_container_width=True)
+
+
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
+
+        # Function to create a dual-axis chart: bars for Claim Amount, a line for Number of Claims
+        def create_dual_axis_chart(df, x_col, y1_col, y2_col, x_title):
+            return dual_axis_chart(
+                df, x_col,
+                left=dict(y=y1_col, kind='bar', name="Claim Amount", color="#009DAE", text='%.0fM', text_scale=1e6, textposition='auto'),
+                right=dict(y=y2_col, kind='line', name="Number of Claims", color="red", line=dict(width=2), marker=dict(size=8, symbol="circle-open")),
+                xaxis_title=x_title,
+                yaxis=dict(title="Claim Amount", side="left", showgrid=False),
+                yaxis2=dict(title="Number of Claims", showgrid=False),
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+        # Function to chart the top 10 diagnoses by claim amount
+        def top_diagnoses_chart():
+            # Group by Diagnosis: Sum Claim Amount & Count Claims
+            df_grouped_diag = df.groupby('Diagnosis').agg({'Claim Amount': 'sum', 'ICD-10 Code': 'count'}).nlargest(10, 'Claim Amount').reset_index()
+            df_grouped_diag.rename(columns={'ICD-10 Code': 'Number of Claims'}, inplace=True)
+            return create_dual_axis_chart(df_grouped_diag, "Diagnosis", "Claim Amount", "Number of Claims", "Diagnosis")
+
+        # Function to chart the top 10 ICD-10 codes by claim amount
+        def top_icd_codes_chart():
+            # Group by ICD-10 Code: Sum Claim Amount & Count Claims
+            df_grouped_icd = df.groupby('ICD-10 Code').agg({'Claim Amount': 'sum', 'Diagnosis': 'count'}).nlargest(10, 'Claim Amount').reset_index()
+            df_grouped_icd.rename(columns={'Diagnosis': 'Number of Claims'}, inplace=True)
+            return create_dual_axis_chart(df_grouped_icd, "ICD-10 Code", "Claim Amount", "Number of Claims", "ICD-10 Code")
+
+        # Diagnosis Chart
+        with cls1:
+            st.markdown('<h3 class="custom-subheader">Top 10 Diagnoses by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(cached_chart(selection, 'top diagnoses', top_diagnoses_chart), use_container_width=True)
+
+        # ICD-10 Chart
+        with cls2:
+            st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Codes by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(cached_chart(selection, 'top ICD-10 codes', top_icd_codes_chart), use_container_width=True)
+
+
+
+
+        # Group by Source and calculate the total number of claims and total claim amount
+        df_source_grouped = rollup(cube, 'Source', {
+            'Total_Claims': ('Claim ID', 'count'),
+            'Total_Claim_Amount': ('Claim Amount', 'sum')
+        }).reset_index()
+
+        # Sort the df_source_grouped by Total_Claims in descending order to find the most popular provider type
+        df_source_grouped = df_source_grouped.sort_values(by='Total_Claims', ascending=False)
+
+        # Get the most popular provider type
+        most_popular_provider = df_source_grouped.iloc[0]['Source'] if not df_source_grouped.empty else "No Data"
+
+        # Function to chart the claims and claim amount per provider type
+        def provider_type_chart():
+            return dual_axis_chart(
+                df_source_grouped, 'Source',
+                left=dict(
+                    y='Total_Claims', kind='line', name='Number of Claims', color="#e66c37",
+                    line=dict(width=2), marker=dict(size=8),
+                ),
+                right=dict(
+                    y='Total_Claim_Amount', kind='bar', name='Claim Amount', color="#009DAE",
+                    text='%.0fM', text_scale=1e6, textposition='inside', textfont=dict(color='white'),  # Claim Amount in millions
+                ),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Provider Type",
+                yaxis=dict(
+                    title="Number of Claims",
+                    title_font=dict(size=14),
+                    tickfont=dict(size=12),
+                    side='left'  # Position the first y-axis on the left
+                ),
+                yaxis2=dict(
+                    title="Claim Amount",
+                    title_font=dict(size=14),
+                    tickfont=dict(size=12),
+                    overlaying='y',  # Overlay the second y-axis over the first
+                    side='right',  # Position the second y-axis on the right
+                    showgrid=False  # Disable gridlines on the right y-axis
+                ),
+                font=dict(color='Black'),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=500,
+                legend=dict(title="Metrics", orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+            )
+
+        # Create the dual-axis chart (bar for claim amount, line for number of claims)
+        with cls1:
+            fig1 = cached_chart(selection, 'claims by provider type', provider_type_chart)
+
+            # Display the chart in Streamlit
+            st.markdown(f'<h3 class="custom-subheader">Most Popular Provider Type: {most_popular_provider}</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig1, use_container_width=True)
+
+
+        # Function to chart the top 15 clients by claim amount, per claim status
+        def top_clients_chart():
+            # Group by Employer Name and Claim Status, then sum the Claim Amount
+            df_grouped = df.groupby(['Employer Name', 'Claim Status'])['Claim Amount'].sum().reset_index()
+
+            # Get the top 15 employers by total Claim Amount
+            top_15_clients = df_grouped.groupby('Employer Name')['Claim Amount'].sum().nlargest(15).reset_index()
+
+            # Filter the original DataFrame to include only the top 15 employers
+            client_df = df_grouped[df_grouped['Employer Name'].isin(top_15_clients['Employer Name'])]
+
+            # Sort the client_df by Claim Amount in descending order
+            client_df = client_df.sort_values(by='Claim Amount', ascending=False)
+
+            # Create the stacked bar chart, one bar per Claim Status (Claim Amount in millions)
+            return category_chart(
+                client_df, 'Employer Name', 'Claim Amount', color='Claim Status', colors=custom_colors,
+                text='%.0fM', text_scale=1e6, trace=dict(textposition='auto'),
+                barmode='stack',
+                yaxis_title="Claim Amount",
+                xaxis_title="Employer Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+        with cls2:
+            fig = cached_chart(selection, 'top clients by status', top_clients_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 15 Clients by Claim Amount and Claim Status</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Group by ICD-10 Code and sum the Claim Amount
+        df_icd_grouped = df.groupby('ICD-10 Code')['Claim Amount'].sum().nlargest(10).reset_index()
+
+        # Sort the df_icd_grouped by Claim Amount in descending order
+        df_icd_grouped = df_icd_grouped.sort_values(by='Claim Amount', ascending=False)
+
+        with cls1:
+            # Create the bar chart
+            fig1 = go.Figure()
+
+            # Add bars for each ICD-10 Code
+            fig1.add_trace(go.Bar(
+                x=df_icd_grouped['ICD-10 Code'],
+                y=df_icd_grouped['Claim Amount'],
+                text=[f'{value/1e6:.0f}M' for value in df_icd_grouped['Claim Amount']],
                 textposition='auto',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through colors
+                marker_color="#009DAE"
             ))
 
-        fig.update_layout(
-            barmode='stack',
-            yaxis_title="Claim Amount",
-            xaxis_title="Provider Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Providers by Claim Amount and Source</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Group by Employer Name and sum the Claim Amount
-    df_grouped = df.groupby('Employer Name')['Claim Amount'].sum().nlargest(10).reset_index()
-
-    # Sort the df_grouped by Claim Amount in descending order
-    df_grouped = df_grouped.sort_values(by='Claim Amount', ascending=False)
-
-    with cls1:
-        # Create the bar chart
-        fig = go.Figure()
-
-        # Add bars for each Employer
-        fig.add_trace(go.Bar(
-            x=df_grouped['Employer Name'],
-            y=df_grouped['Claim Amount'],
-            text=[f'{value/1e6:.0f}M' for value in df_grouped['Claim Amount']],
-            textposition='auto',
-            marker_color="#009DAE"  # Use custom colors
-        ))
-
-        fig.update_layout(
-            yaxis_title="Claim Amount",
-            xaxis_title="Employer Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-
-    # Group by Client Name and sum the Total Amount
-    df_grouped = df.groupby('Provider Name')['Claim Amount'].sum().nlargest(10).reset_index()
-
-    # Sort the client_df by Total Amount in descending order
-    client_df = df_grouped.sort_values(by='Claim Amount', ascending=False)
-
-    with cls2:
+            fig1.update_layout(
+                yaxis_title="Claim Amount",
+                xaxis_title="ICD-10 Code",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Codes by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig1, use_container_width=True)
+
+
+
+
+        # Function to chart the top 15 providers by claim amount, per source
+        def top_providers_chart():
+            # Group by Provider Name and Source, then sum the Claim Amount
+            df_grouped = df.groupby(['Provider Name', 'Source'])['Claim Amount'].sum().reset_index()
+
+            # Get the top 15 providers by total Claim Amount
+            top_15_providers = df_grouped.groupby('Provider Name')['Claim Amount'].sum().nlargest(15).reset_index()
+
+            # Filter the original DataFrame to include only the top 15 providers
+            client_df = df_grouped[df_grouped['Provider Name'].isin(top_15_providers['Provider Name'])]
+
+            # Sort the client_df by Claim Amount in descending order
+            client_df = client_df.sort_values(by='Claim Amount', ascending=False)
+
+            # Create the stacked bar chart, one bar per Source (Claim Amount in millions)
+            return category_chart(
+                client_df, 'Provider Name', 'Claim Amount', color='Source', colors=custom_colors,
+                text='%.0fM', text_scale=1e6, trace=dict(textposition='auto'),
+                barmode='stack',
+                yaxis_title="Claim Amount",
+                xaxis_title="Provider Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+        with cls2:
+            fig = cached_chart(selection, 'top providers by source', top_providers_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 15 Providers by Claim Amount and Source</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Group by Employer Name and sum the Claim Amount
+        df_grouped = df.groupby('Employer Name')['Claim Amount'].sum().nlargest(10).reset_index()
+
+        # Sort the df_grouped by Claim Amount in descending order
+        df_grouped = df_grouped.sort_values(by='Claim Amount', ascending=False)
+
+        with cls1:
             # Create the bar chart
             fig = go.Figure()
 
-            # Add bars for each Client
+            # Add bars for each Employer
             fig.add_trace(go.Bar(
-                x=client_df['Provider Name'],
-                y=client_df['Claim Amount'],
-                text=[f'{value/1e6:.0f}M' for value in client_df['Claim Amount']],
+                x=df_grouped['Employer Name'],
+                y=df_grouped['Claim Amount'],
+                text=[f'{value/1e6:.0f}M' for value in df_grouped['Claim Amount']],
                 textposition='auto',
-                marker_color="#009DAE"
+                marker_color="#009DAE"  # Use custom colors
             ))
 
             fig.update_layout(
                 yaxis_title="Claim Amount",
-                xaxis_title="Provider Name",
+                xaxis_title="Employer Name",
                 font=dict(color='Black'),
                 xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 margin=dict(l=0, r=0, t=30, b=50)
             )
 
-
             # Display the chart in Streamlit
-            st.markdown('<h3 class="custom-subheader">Top 10 Popular Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
-            st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+            st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+
+        # Group by Client Name and sum the Total Amount
+        df_grouped = df.groupby('Provider Name')['Claim Amount'].sum().nlargest(10).reset_index()
+
+        # Sort the client_df by Total Amount in descending order
+        client_df = df_grouped.sort_values(by='Claim Amount', ascending=False)
+
+        with cls2:
+                # Create the bar chart
+                fig = go.Figure()
+
+                # Add bars for each Client
+                fig.add_trace(go.Bar(
+                    x=client_df['Provider Name'],
+                    y=client_df['Claim Amount'],
+                    text=[f'{value/1e6:.0f}M' for value in client_df['Claim Amount']],
+                    textposition='auto',
+                    marker_color="#009DAE"
+                ))
+
+                fig.update_layout(
+                    yaxis_title="Claim Amount",
+                    xaxis_title="Provider Name",
+                    font=dict(color='Black'),
+                    xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    margin=dict(l=0, r=0, t=30, b=50)
+                )
+
+
+                # Display the chart in Streamlit
+                st.markdown('<h3 class="custom-subheader">Top 10 Popular Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
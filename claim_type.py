@@ -9,10 +9,23 @@ from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
 from datetime import datetime
+from aggregations import count_and_sum
+from charts import cached_chart, category_chart, data_version, donut_chart, dual_axis_chart
+from claims_data import INTERNAL_COLUMNS
+from cube import rollup, selection_cube
+from filters import CLAIM_FILTERS, apply_filters, filter_month_year_range, month_year_options
 
 
-# Centered and styled main title using inline styles
-st.markdown('''
+# Sidebar filters rendered by the dashboard for this page
+FILTERS = CLAIM_FILTERS
+
+# Filters shown in the section headers, in order
+DESCRIPTION_COLUMNS = ['Year', 'Claim Type', 'Product', 'Month', 'Quarter']
+
+# Function to render the page from the shared data and the sidebar selections
+def render(data, filters):
+    # Centered and styled main title using inline styles
+    st.markdown('''
     <style>
         .main-title {
             color: #e66c37; /* Title color */
@@ -28,31 +41,17 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-st.markdown('<h1 class="main-title">CLAIMS TYPE VIEW</h1>', unsafe_allow_html=True)
-
-
+    st.markdown('<h1 class="main-title">CLAIMS TYPE VIEW</h1>', unsafe_allow_html=True)
 
-filepath_visits = "Claims.xlsx"
-sheet_name1 = "2023 claims"
-sheet_name2 = "2024 claims"
 
-# Read the Claims data
-dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
 
-# Read the visit logs
-df = pd.concat([dfc_2023, dfc_2024])
+    # Work on the shared claims data passed in by the dashboard
+    df = data
 
+    # Inspect the merged DataFrame
 
-df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'], errors='coerce')
-
-df["Employer Name"] = df["Employer Name"].str.upper()
-df["Provider Name"] = df["Provider Name"].str.upper()
-
-# Inspect the merged DataFrame
-
-# Sidebar styling and logo
-st.markdown("""
+    # Sidebar styling and logo
+    st.markdown("""
     <style>
     .sidebar .sidebar-content {
         background-color: #f0f2f6;
@@ -101,80 +100,19 @@ st.markdown("""
 
 
 
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
-df = df[df['Month'].isin(month_order)]
-
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: pd.to_datetime(x, format='%B').month)
-df['Source'] =df['Source'].astype(str)
-
-df['Quarter'] = "Q" + df['Claim Created Date'].dt.quarter.astype(str)
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-quarter = st.sidebar.multiselect("Select Quarter", options=sorted(df['Quarter'].dropna().unique()))
-product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
-type = st.sidebar.multiselect("Select Claim Type", options=sorted(df['Claim Type'].unique()))
-status = st.sidebar.multiselect("Select Claim Status", options=df['Claim Status'].unique())
-source = st.sidebar.multiselect("Select Claim Provider Type", options=sorted(df['Source'].unique()))
-code = st.sidebar.multiselect("Select Diagnosis Code", options=df['ICD-10 Code'].unique())
-client_name = st.sidebar.multiselect("Select Employer Name", options=sorted(df['Employer Name'].dropna().unique()))
-prov_name = st.sidebar.multiselect("Select Provider Name", options=sorted(df['Provider Name'].dropna().unique()))
-
-# Apply filters to the DataFrame
-if 'Year' in df.columns and year:
-    df = df[df['Year'].isin(year)]
-if 'Month' in df.columns and month:
-    df = df[df['Month'].isin(month)]
-if 'Quarter' in df.columns and quarter:
-    df = df[df['Quarter'].isin(quarter)]
-if 'Product' in df.columns and product:
-    df = df[df['Product'].isin(product)]
-if 'Claim Type' in df.columns and type:
-    df = df[df['Claim Type'].isin(type)]
-if 'Claim Status' in df.columns and status:
-    df = df[df['Claim Status'].isin(status)]
-if 'Source' in df.columns and source:
-    df = df[df['Source'].isin(source)]
-if 'ICD-10 Code' in df.columns and code:
-    df = df[df['ICD-10 Code'].isin(code)]
-if 'Employer Name' in df.columns and client_name:
-    df = df[df['Employer Name'].isin(client_name)]
-if 'Provider Name' in df.columns and prov_name:
-    df = df[df['Provider Name'].isin(prov_name)]
-
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if type:
-     filter_description += f"{', '.join(map(str, type))} "
-if product:
-     filter_description += f"{', '.join(map(str, product))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if quarter:
-    filter_description += f"{', '.join(quarter)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Claim Created Date"].min()
-endDate = df["Claim Created Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
+
+    # Apply the sidebar filters and describe them for the section headers
+    df, filter_description = apply_filters(df, filters, DESCRIPTION_COLUMNS)
+
+
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Claim Created Date"].min()
+    endDate = df["Claim Created Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
     <style>
     .date-input-box {
         border-radius: 10px;
@@ -191,123 +129,105 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
+    # Function to display date input in styled boxes
+    def display_date_input(col, title, default_date, min_date, max_date):
+        col.markdown(f"""
         <div class="date-input-box">
             <div class="date-input-title">{title}</div>
         </div>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
-
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
-
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
-
+        return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
 
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
+    # Extract unique month-year combinations in period order
+    month_years = month_year_options(df)
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
+    # Select slider for month-year range
+    selected_month_year_range = st.select_slider(
+        "Select Month-Year Range",
+        options=month_years,
+        value=(month_years[0], month_years[-1])
+    )
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Filter DataFrame on the precomputed period key
+    df = filter_month_year_range(df, selected_month_year_range)
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    # Cube of the current selection, which the charts roll up instead of re-scanning the claims
+    cube = selection_cube(data, df, filters, selected_month_year_range)
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # The selection the charts are drawn from, which keys them in the figure cache
+    selection = {'page': __name__, 'data': data_version(data), 'filters': filters, 'range': selected_month_year_range}
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
 
+    df_out = df[df['Claim Type'] == 'Outpatient']
+    df_dental = df[df['Claim Type'] == 'Dental']
+    df_wellness = df[df['Claim Type'] == 'Wellness']
+    df_optical = df[df['Claim Type'] == 'Optical']
+    df_phar = df[df['Claim Type'] == 'Pharmacy']
+    df_mat = df[df['Claim Type'] == 'Maternity']
+    df_pro = df[df['Claim Type'] == 'ProActiv']
+    df_in = df[df['Claim Type'] == 'Inpatient']
 
-df_out = df[df['Claim Type'] == 'Outpatient']
-df_dental = df[df['Claim Type'] == 'Dental']
-df_wellness = df[df['Claim Type'] == 'Wellness']
-df_optical = df[df['Claim Type'] == 'Optical']
-df_phar = df[df['Claim Type'] == 'Pharmacy']
-df_mat = df[df['Claim Type'] == 'Maternity']
-df_pro = df[df['Claim Type'] == 'ProActiv']
-df_in = df[df['Claim Type'] == 'Inpatient']
+    df_health = df[df['Product'] == 'Health Insurance']
+    df_proactiv = df[df['Product'] == 'ProActiv']
 
-df_health = df[df['Product'] == 'Health Insurance']
-df_proactiv = df[df['Product'] == 'ProActiv']
+    df_app = df[df['Claim Status'] == 'Approved']
+    df_dec = df[df['Claim Status'] == 'Declined']
 
-df_app = df[df['Claim Status'] == 'Approved']
-df_dec = df[df['Claim Status'] == 'Declined']
+    if not df.empty:
 
-if not df.empty:
+        scale=1_000_000  # For millions
 
-    scale=1_000_000  # For millions
+        total_claim_amount = (df["Claim Amount"].sum())/scale
+        total_claim_amount
+        average_amount =(df["Claim Amount"].mean())/scale
+        average_app_amount =(df["Approved Claim Amount"].mean())/scale
 
-    total_claim_amount = (df["Claim Amount"].sum())/scale
-    total_claim_amount
-    average_amount =(df["Claim Amount"].mean())/scale
-    average_app_amount =(df["Approved Claim Amount"].mean())/scale
+        total_out = (df_out['Claim Amount'].sum())/scale
+        total_dental = (df_dental['Claim Amount'].sum())/scale
+        total_wellness = (df_wellness['Claim Amount'].sum())/scale
+        total_optical = (df_optical['Claim Amount'].sum())/scale
+        total_in = (df_in['Claim Amount'].sum())/scale
+        total_phar = (df_phar['Claim Amount'].sum())/scale
+        total_pro = (df_pro['Claim Amount'].sum())/scale
+        total_mat = (df_mat['Claim Amount'].sum())/scale
 
-    total_out = (df_out['Claim Amount'].sum())/scale
-    total_dental = (df_dental['Claim Amount'].sum())/scale
-    total_wellness = (df_wellness['Claim Amount'].sum())/scale
-    total_optical = (df_optical['Claim Amount'].sum())/scale
-    total_in = (df_in['Claim Amount'].sum())/scale
-    total_phar = (df_phar['Claim Amount'].sum())/scale
-    total_pro = (df_pro['Claim Amount'].sum())/scale
-    total_mat = (df_mat['Claim Amount'].sum())/scale
+        total_app_claim_amount = (df_app["Claim Amount"].sum())/scale
+        total_dec_claim_amount = (df_dec["Claim Amount"].sum())/scale
 
-    total_app_claim_amount = (df_app["Claim Amount"].sum())/scale
-    total_dec_claim_amount = (df_dec["Claim Amount"].sum())/scale
+        total_app = df_app["Claim ID"].nunique()
+        total_dec = df_dec["Claim ID"].nunique()
 
-    total_app = df_app["Claim ID"].nunique()
-    total_dec = df_dec["Claim ID"].nunique()
+        total_health_claim_amount = (df_app["Claim Amount"].sum())/scale
+        total_pro_claim_amount = (df_dec["Claim Amount"].sum())/scale
 
-    total_health_claim_amount = (df_app["Claim Amount"].sum())/scale
-    total_pro_claim_amount = (df_dec["Claim Amount"].sum())/scale
+        total_health = df_health["Claim ID"].nunique()
+        total_proactiv = df_proactiv["Claim ID"].nunique()
 
-    total_health = df_health["Claim ID"].nunique()
-    total_proactiv = df_proactiv["Claim ID"].nunique()
+        total_clients = df["Employer Name"].nunique()
+        total_claims = df["Claim ID"].nunique()
 
-    total_clients = df["Employer Name"].nunique()
-    total_claims = df["Claim ID"].nunique()
 
+        total_app_per = (total_app/total_claims)*100
+        total_dec_per = (total_dec/total_claims)*100
 
-    total_app_per = (total_app/total_claims)*100
-    total_dec_per = (total_dec/total_claims)*100
 
+        percent_app = (total_app_claim_amount/total_claim_amount) *100
 
-    percent_app = (total_app_claim_amount/total_claim_amount) *100
 
-
-    # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
-    st.markdown("""
+        # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
+        st.markdown("""
         <style>
         .custom-subheader {
             color: #e66c37;
@@ -341,11 +261,11 @@ if not df.empty:
         """, unsafe_allow_html=True)
 
 
-    st.dataframe(df)
+        st.dataframe(df.drop(columns=INTERNAL_COLUMNS))
 
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
+        # Function to display metrics in styled boxes with tooltips
+        def display_metric(col, title, value):
+            col.markdown(f"""
             <div class="metric-box">
                 <div class="metric-title">{title}</div>
                 <div class="metric-value">{value}</div>
@@ -353,512 +273,371 @@ if not df.empty:
             """, unsafe_allow_html=True)
 
 
-   # Calculate key metrics
-    st.markdown(f'<h2 class="custom-subheader">For all Claims in Numbers ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
-
-    cols1,cols2, cols3 = st.columns(3)
+       # Calculate key metrics
+        st.markdown(f'<h2 class="custom-subheader">For all Claims in Numbers ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
 
-    display_metric(cols1, "Number of Clients", total_clients)
-    display_metric(cols2, "Number of Claims", total_claims)
-    display_metric(cols3, "Number of Approved Claims", total_app)
-    display_metric(cols1, "Number of Declined Claims",total_dec)
-    display_metric(cols2, "Percentage Approved", F"{total_app_per: .0F} %")
-    display_metric(cols3, "Percentage Declined", F"{total_dec_per: .0F} %")
+        cols1,cols2, cols3 = st.columns(3)
 
-    # Calculate key metrics
-    st.markdown(f'<h2 class="custom-subheader">For all Claim Amounts ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
+        display_metric(cols1, "Number of Clients", total_clients)
+        display_metric(cols2, "Number of Claims", total_claims)
+        display_metric(cols3, "Number of Approved Claims", total_app)
+        display_metric(cols1, "Number of Declined Claims",total_dec)
+        display_metric(cols2, "Percentage Approved", F"{total_app_per: .0F} %")
+        display_metric(cols3, "Percentage Declined", F"{total_dec_per: .0F} %")
 
-    cols1,cols2, cols3 = st.columns(3)
+        # Calculate key metrics
+        st.markdown(f'<h2 class="custom-subheader">For all Claim Amounts ({filter_description.strip()})</h2>', unsafe_allow_html=True)    
 
-    display_metric(cols1, "Total Claims", total_claims)
-    display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
-    display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
-    display_metric(cols1, "Total Declined Claim Amount", f"{total_dec_claim_amount:,.0f} M")
-    display_metric(cols2, "Average Claim Amount Per Client", F"{average_amount:,.0F} M")
-    display_metric(cols3, "Average Claim Amount Per Client", F"{average_app_amount: ,.0F} M")
+        cols1,cols2, cols3 = st.columns(3)
 
-    st.markdown('<h2 class="custom-subheader">For Approved Amounts by Claim Type</h2>', unsafe_allow_html=True)    
-  
-    cols1,cols2, cols3 = st.columns(3)
-    display_metric(cols1, "Total Approved Claim Amount", F"{total_app_claim_amount:,.0F} M")
-    display_metric(cols2, "Approved Claim Amount for Outpatient", f"{total_out:,.0f} M")
-    display_metric(cols3, "Approved Claim Amount for Dental", f"{total_dental:,.0f} M")
-    display_metric(cols1, "Approved Claim Amount for Optical", f"{total_optical:,.0f} days")
-    display_metric(cols2, "Approved Claim Amount for Inpatient", f"{total_in:,.0f} M")
-    display_metric(cols3, "Approved Claim Amount for Wellness", f"{total_wellness:,.0f} M")
-    display_metric(cols1, "Approved Claim Amount for Maternity", f"{total_mat:,.0f} M")
-    display_metric(cols2, "Approved Claim Amount for Pharmacy", f"{total_phar:,.0f} M")
-    display_metric(cols3, "Approved Claim Amount for ProActiv", f"{total_pro:,.0f} M")
+        display_metric(cols1, "Total Claims", total_claims)
+        display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
+        display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
+        display_metric(cols1, "Total Declined Claim Amount", f"{total_dec_claim_amount:,.0f} M")
+        display_metric(cols2, "Average Claim Amount Per Client", F"{average_amount:,.0F} M")
+        display_metric(cols3, "Average Claim Amount Per Client", F"{average_app_amount: ,.0F} M")
 
-    cols1, cols2 = st.columns(2)
+        st.markdown('<h2 class="custom-subheader">For Approved Amounts by Claim Type</h2>', unsafe_allow_html=True)    
 
-    custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
+        cols1,cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Total Approved Claim Amount", F"{total_app_claim_amount:,.0F} M")
+        display_metric(cols2, "Approved Claim Amount for Outpatient", f"{total_out:,.0f} M")
+        display_metric(cols3, "Approved Claim Amount for Dental", f"{total_dental:,.0f} M")
+        display_metric(cols1, "Approved Claim Amount for Optical", f"{total_optical:,.0f} days")
+        display_metric(cols2, "Approved Claim Amount for Inpatient", f"{total_in:,.0f} M")
+        display_metric(cols3, "Approved Claim Amount for Wellness", f"{total_wellness:,.0f} M")
+        display_metric(cols1, "Approved Claim Amount for Maternity", f"{total_mat:,.0f} M")
+        display_metric(cols2, "Approved Claim Amount for Pharmacy", f"{total_phar:,.0f} M")
+        display_metric(cols3, "Approved Claim Amount for ProActiv", f"{total_pro:,.0f} M")
 
-   
-        # Group by day and count the occurrences
-    area_chart_count = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d")).size().reset_index(name='Count')
-    area_chart_amount = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d"))['Approved Claim Amount'].sum().reset_index(name='Approved Claim Amount')
+        cols1, cols2 = st.columns(2)
 
-    # Merge the count and amount data
-    area_chart = pd.merge(area_chart_count, area_chart_amount, on='Claim Created Date')
+        custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
 
-    # Sort by the PreAuth Created Date
-    area_chart = area_chart.sort_values("Claim Created Date")
 
-    with cols1:
-        # Create the dual-axis area chart
-        fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-
-        # Add traces
-        fig2.add_trace(
-            go.Scatter(x=area_chart['Claim Created Date'], y=area_chart['Count'], name="Number of Claims", fill='tozeroy', line=dict(color='#e66c37')),
-            secondary_y=False,
-        )
-
-        fig2.add_trace(
-            go.Scatter(x=area_chart['Claim Created Date'], y=area_chart['Approved Claim Amount'], name="Approved Claim Amount", fill='tozeroy', line=dict(color='#009DAE')),
-            secondary_y=True,
-        )
+        # Function to chart the visits over time
+        def visits_over_time_chart():
+            # Count the claims and total the approved amount per day, sorted by date
+            area_chart = count_and_sum(df, 'Claim Day', 'Approved Claim Amount').rename(columns={'Claim Day': 'Claim Created Date'})
 
+            # Create the dual-axis area chart, rotating the x-axis labels by 45 degrees for better readability
+            return dual_axis_chart(
+                area_chart, 'Claim Created Date',
+                left=dict(y='Count', kind='area', name="Number of Claims", color='#e66c37'),
+                right=dict(y='Approved Claim Amount', kind='area', name="Approved Claim Amount", color='#009DAE'),
+                xaxis_title="Claim Created Date",
+                xaxis_tickangle=45,
+                yaxis_title="<b>Number Of Visits</b>",
+                yaxis2_title="<b>Approved Claim Amount</b>",
+            )
 
+        with cols1:
+            fig2 = cached_chart(selection, 'visits over time', visits_over_time_chart)
 
-        # Set x-axis title
-        fig2.update_xaxes(title_text="Claim Created Date", tickangle=45)  # Rotate x-axis labels to 45 degrees for better readability
-
-        # Set y-axes titles
-        fig2.update_yaxes(title_text="<b>Number Of Visits</b>", secondary_y=False)
-        fig2.update_yaxes(title_text="<b>Approved Claim Amount</b>", secondary_y=True)
-
-        st.markdown('<h3 class="custom-subheader">Number of Visits and Approved Claim Amount Over Time</h3>', unsafe_allow_html=True)
-
-        st.plotly_chart(fig2, use_container_width=True)
-
-
-
-    # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
-    yearly_avg_premium = df.groupby(['Year', 'Claim Type'])['Approved Claim Amount'].mean().unstack().fillna(0)
-
-    # Define custom colors
-
-    with cols2:
-        # Create the grouped bar chart
-        fig_yearly_avg_premium = go.Figure()
-
-        for idx, Client_Segment in enumerate(yearly_avg_premium.columns):
-            fig_yearly_avg_premium.add_trace(go.Bar(
-                x=yearly_avg_premium.index,
-                y=yearly_avg_premium[Client_Segment],
-                name=Client_Segment,
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-            ))
+            st.markdown('<h3 class="custom-subheader">Number of Visits and Approved Claim Amount Over Time</h3>', unsafe_allow_html=True)
 
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Average Approved Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height= 450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Product per Employer Group</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-
-
-    # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
-    yearly_avg_premium = df.groupby(['Year', 'Claim Status'])['Approved Claim Amount'].mean().unstack().fillna(0)
-
-    cols1, cols2 = st.columns(2)
-
-    with cols1:
-        # Create the grouped bar chart
-        fig_yearly_avg_premium = go.Figure()
-
-        for idx, Client_Segment in enumerate(yearly_avg_premium.columns):
-            fig_yearly_avg_premium.add_trace(go.Bar(
-                x=yearly_avg_premium.index,
-                y=yearly_avg_premium[Client_Segment],
-                name=Client_Segment,
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-            ))
+            st.plotly_chart(fig2, use_container_width=True)
 
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Average Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height= 450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Status per Employer Group</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-    # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
-    yearly_avg_premium = df.groupby(['Year', 'Source'])['Approved Claim Amount'].mean().unstack().fillna(0)
-
-
-    with cols2:
-        # Create the grouped bar chart
-        fig_yearly_avg_premium = go.Figure()
 
-        for idx, Client_Segment in enumerate(yearly_avg_premium.columns):
-            fig_yearly_avg_premium.add_trace(go.Bar(
-                x=yearly_avg_premium.index,
-                y=yearly_avg_premium[Client_Segment],
-                name=Client_Segment,
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-            ))
-
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Average Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height= 450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Source per Employer Group</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-
-    # Group data by "Start Month" and "Channel" and sum the Approved Claim Amount sum
-    monthly_premium = df.groupby(['Month', 'Claim Type'])['Approved Claim Amount'].mean().unstack().fillna(0)
-
-    # Group data by "Start Month" to count the number of sales
-    monthly_sales_count = df.groupby(['Month']).size()
-
-
-
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
-
-    with cls1:
-
-        fig_monthly_premium = go.Figure()
-
-        for idx, Client_Segment in enumerate(monthly_premium.columns):
-                fig_monthly_premium.add_trace(go.Bar(
-                    x=monthly_premium.index,
-                    y=monthly_premium[Client_Segment],
-                    name=Client_Segment,
-                    textposition='inside',
-                    textfont=dict(color='white'),
-                    hoverinfo='x+y+name',
-                    marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-                ))
 
+        # Function to chart the average approved claim amount per year and claim type
+        def yearly_claim_type_chart():
+            # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
+            yearly_avg_premium = rollup(cube, ['Year', 'Claim Type'], {'mean': ('Approved Claim Amount', 'mean')})['mean'].unstack().fillna(0)
 
-            # Set layout for the Approved Claim Amount sum chart
-        fig_monthly_premium.update_layout(
+            # Create the grouped bar chart, one bar per Claim Type
+            return category_chart(
+                yearly_avg_premium, 'Year', list(yearly_avg_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
                 barmode='group',  # Grouped bar chart
-                xaxis_title="Month",
-                yaxis_title="Total Approved Claim Amount",
+                xaxis_title="Year",
+                yaxis_title="Average Approved Claim Amount",
                 font=dict(color='Black'),
                 xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 margin=dict(l=0, r=0, t=30, b=50),
+                height= 450
             )
 
-            # Display the Approved Claim Amount sum chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Avearge Monthly Visits and Approved Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_monthly_premium, use_container_width=True)
-
-    # Group by Employer Name and Client Segment, then sum the Claim Amount
-    df_grouped = df.groupby(['Employer Name', 'Claim Status'])['Claim Amount'].sum().nlargest(10).reset_index()
-
-    # Get the top 10 clients by Claim Amount
-    top_10_clients = df_grouped.groupby('Employer Name')['Claim Amount'].sum().reset_index()
-
-    # Filter the original DataFrame to include only the top 10 clients
-    client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
-    # Sort the client_df by Claim Amount in descending order
-    client_df = client_df.sort_values(by='Claim Amount', ascending=False)
-
-    with cls2:
-        # Create the bar chart
-        fig = go.Figure()
-
-        # Add bars for each Client Segment
-        for idx, Client_Segment in enumerate(client_df['Claim Status'].unique()):
-            Client_Segment_data = client_df[client_df['Claim Status'] == Client_Segment]
-            fig.add_trace(go.Bar(
-                x=Client_Segment_data['Employer Name'],
-                y=Client_Segment_data['Claim Amount'],
-                name=Client_Segment,
-                text=[f'{value/1e6:.0f}M' for value in Client_Segment_data['Claim Amount']],
-                textposition='auto',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-            ))
-
-        # Update layout
-        fig.update_layout(
-            barmode='stack',
-            yaxis_title="Claim Amount",
-            xaxis_title="Employer Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            legend=dict(
-                title="Claim Status",
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
+        with cols2:
+            fig_yearly_avg_premium = cached_chart(selection, 'yearly average by claim type', yearly_claim_type_chart)
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Client Claims Amount by Status</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Product per Employer Group</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
 
 
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
-    
-    # Calculate the Approved Claim Amount by Client Segment
-    int_owner = df.groupby("Claim Type")["Approved Claim Amount"].sum().reset_index()
-    int_owner.columns = ["Claim Type", "Approved Claim Amount"]    
 
-    with cls1:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Approved Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
+        # Function to chart the average approved claim amount per year and claim status
+        def yearly_status_chart():
+            # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
+            yearly_avg_premium = rollup(cube, ['Year', 'Claim Status'], {'mean': ('Approved Claim Amount', 'mean')})['mean'].unstack().fillna(0)
 
+            # Create the grouped bar chart, one bar per Claim Status
+            return category_chart(
+                yearly_avg_premium, 'Year', list(yearly_avg_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Average Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height= 450
+            )
 
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Claim Type", values="Approved Claim Amount", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
+        cols1, cols2 = st.columns(2)
 
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
+        with cols1:
+            fig_yearly_avg_premium = cached_chart(selection, 'yearly average by status', yearly_status_chart)
 
-# Calculate the Approved Claim Amount by Client Segment
-    int_owner = df.groupby("Claim Status")["Approved Claim Amount"].sum().reset_index()
-    int_owner.columns = ["Claim Status", "Approved Claim Amount"]    
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Status per Employer Group</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+
+        # Function to chart the average approved claim amount per year and source
+        def yearly_source_chart():
+            # Group data by "Start Month Year" and "Claim Type" and calculate the average Approved Claim Amount
+            yearly_avg_premium = rollup(cube, ['Year', 'Source'], {'mean': ('Approved Claim Amount', 'mean')})['mean'].unstack().fillna(0)
+
+            # Create the grouped bar chart, one bar per Source
+            return category_chart(
+                yearly_avg_premium, 'Year', list(yearly_avg_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Average Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height= 450
+            )
 
-    with cls2:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Approved Claim Amount by Claim Status</h3>', unsafe_allow_html=True)
+        with cols2:
+            fig_yearly_avg_premium = cached_chart(selection, 'yearly average by source', yearly_source_chart)
 
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Yearly Approved Claim Amount by Source per Employer Group</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
 
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Claim Status", values="Approved Claim Amount", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
 
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
+        # Function to chart the average approved claim amount per month and claim type
+        def monthly_average_chart():
+            # Group data by "Start Month" and "Channel" and sum the Approved Claim Amount sum
+            monthly_premium = rollup(cube, ['Month', 'Claim Type'], {'mean': ('Approved Claim Amount', 'mean')})['mean'].unstack().fillna(0)
 
+            # One bar per Claim Type
+            return category_chart(
+                monthly_premium, 'Month', list(monthly_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis_title="Total Approved Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+            )
 
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
+        # Group data by "Start Month" to count the number of sales
+        monthly_sales_count = rollup(cube, ['Month'], {'size': ('Claim ID', 'size')})['size']
 
-    # Group by Employer Name and sum the Approved Claim Amount
-    df_grouped = df.groupby('Diagnosis')['Approved Claim Amount'].sum().nlargest(10).reset_index()
 
-    # Sort the client_df by Approved Claim Amount in descending order
-    client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
 
-    with cls1:
-            # Create the bar chart
-            fig = go.Figure()
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
 
-            # Add bars for each Client
-            fig.add_trace(go.Bar(
-                x=client_df['Diagnosis'],
-                y=client_df['Approved Claim Amount'],
-                text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
-                textposition='auto',
-                marker_color="#009DAE"  # Use custom colors
-            ))
+        with cls1:
+            fig_monthly_premium = cached_chart(selection, 'monthly average by claim type', monthly_average_chart)
 
-            fig.update_layout(
-                yaxis_title="Approved Claim Amount",
-                xaxis_title="Diagnosis",
+            # Display the Approved Claim Amount sum chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Avearge Monthly Visits and Approved Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_monthly_premium, use_container_width=True)
+
+        # Function to chart the top 10 clients by claim amount, per claim status
+        def top_clients_by_status_chart():
+            # Group by Employer Name and Client Segment, then sum the Claim Amount
+            df_grouped = df.groupby(['Employer Name', 'Claim Status'])['Claim Amount'].sum().nlargest(10).reset_index()
+
+            # Get the top 10 clients by Claim Amount
+            top_10_clients = df_grouped.groupby('Employer Name')['Claim Amount'].sum().reset_index()
+
+            # Filter the original DataFrame to include only the top 10 clients
+            client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
+            # Sort the client_df by Claim Amount in descending order
+            client_df = client_df.sort_values(by='Claim Amount', ascending=False)
+
+            # Create the bar chart, one bar per Claim Status
+            return category_chart(
+                client_df, 'Employer Name', 'Claim Amount', color='Claim Status', colors=custom_colors, text='%.0fM', text_scale=1e6,
+                trace=dict(textposition='auto'),
+                barmode='stack',
+                yaxis_title="Claim Amount",
+                xaxis_title="Employer Name",
                 font=dict(color='Black'),
                 xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-                margin=dict(l=0, r=0, t=30, b=50)
+                margin=dict(l=0, r=0, t=30, b=50),
+                legend=dict(
+                    title="Claim Status",
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                )
             )
 
+        with cls2:
+            fig = cached_chart(selection, 'top clients by status', top_clients_by_status_chart)
 
             # Display the chart in Streamlit
-            st.markdown('<h3 class="custom-subheader">Top 10 Diagnosis by Approved Claim Amount</h3>', unsafe_allow_html=True)
+            st.markdown('<h3 class="custom-subheader">Top 10 Client Claims Amount by Status</h3>', unsafe_allow_html=True)
             st.plotly_chart(fig, use_container_width=True)
 
 
-    # Group by Employer Name and sum the Approved Claim Amount
-    df_grouped = df.groupby('ICD-10 Code')['Approved Claim Amount'].sum().nlargest(10).reset_index()
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
 
-    # Sort the client_df by Approved Claim Amount in descending order
-    client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
+        # Function to chart the share of the approved claim amount of each claim type
+        def claim_type_share_chart():
+            # Calculate the Approved Claim Amount by Client Segment
+            int_owner = rollup(cube, "Claim Type", {"Approved Claim Amount": ("Approved Claim Amount", "sum")}).reset_index()
+            int_owner.columns = ["Claim Type", "Approved Claim Amount"]    
 
-    with cls2:
-            # Create the bar chart
-            fig = go.Figure()
+            # Create a donut chart
+            return donut_chart(
+                int_owner, "Claim Type", "Approved Claim Amount", colors=custom_colors, trace=dict(textposition='inside', textinfo='value+percent'),
+                template="plotly_dark", height=450, margin=dict(l=0, r=10, t=30, b=50),
+            )
 
-            # Add bars for each Client
-            fig.add_trace(go.Bar(
-                x=client_df['ICD-10 Code'],
-                y=client_df['Approved Claim Amount'],
-                text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
-                textposition='auto',
-                marker_color="#009DAE" # Use custom colors
-            ))
+        with cls1:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Approved Claim Amount by Claim Type</h3>', unsafe_allow_html=True)
 
-            fig.update_layout(
-                yaxis_title="Approved Claim Amount",
-                xaxis_title="ICD-10 Code",
-                font=dict(color='Black'),
-                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-                margin=dict(l=0, r=0, t=30, b=50)
-            )
 
+            fig = cached_chart(selection, 'approved amount by claim type', claim_type_share_chart)
 
             # Display the chart in Streamlit
-            st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Code by Approved Claim Amount</h3>', unsafe_allow_html=True)
             st.plotly_chart(fig, use_container_width=True)
 
+        # Function to chart the share of the approved claim amount of each claim status
+        def claim_status_share_chart():
+            # Calculate the Approved Claim Amount by Client Segment
+            int_owner = rollup(cube, "Claim Status", {"Approved Claim Amount": ("Approved Claim Amount", "sum")}).reset_index()
+            int_owner.columns = ["Claim Status", "Approved Claim Amount"]    
 
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
-    # Group by Employer Name and Client Segment, then sum the Approved Claim Amount
-    df_grouped = df.groupby(['Employer Name', 'Claim Type'])['Approved Claim Amount'].sum().nlargest(15).reset_index()
+            # Create a donut chart
+            return donut_chart(
+                int_owner, "Claim Status", "Approved Claim Amount", colors=custom_colors, trace=dict(textposition='inside', textinfo='value+percent'),
+                template="plotly_dark", height=450, margin=dict(l=0, r=10, t=30, b=50),
+            )
 
-    # Get the top 10 clients by Approved Claim Amount
-    top_10_clients = df_grouped.groupby('Employer Name')['Approved Claim Amount'].sum().reset_index()
+        with cls2:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Approved Claim Amount by Claim Status</h3>', unsafe_allow_html=True)
 
-    # Filter the original DataFrame to include only the top 10 clients
-    client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
 
-    # Sort the client_df by Approved Claim Amount in descending order
-    client_df = client_df.sort_values(by='Approved Claim Amount', ascending=False)
+            fig = cached_chart(selection, 'approved amount by claim status', claim_status_share_chart)
 
-    with cls1:
-        # Create the bar chart
-        fig = go.Figure()
+            # Display the chart in Streamlit
+            st.plotly_chart(fig, use_container_width=True)
+
+
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
 
+        # Group by Employer Name and sum the Approved Claim Amount
+        df_grouped = df.groupby('Diagnosis')['Approved Claim Amount'].sum().nlargest(10).reset_index()
 
-                # Add bars for each Client Segment
-        for idx, Client_Segment in enumerate(client_df['Claim Type'].unique()):
-                    Client_Segment_data = client_df[client_df['Claim Type'] == Client_Segment]
-                    fig.add_trace(go.Bar(
-                        x=Client_Segment_data['Employer Name'],
-                        y=Client_Segment_data['Approved Claim Amount'],
-                        name=Client_Segment,
-                        text=[f'{value/1e6:.0f}M' for value in Client_Segment_data['Approved Claim Amount']],
-                        textposition='auto',
-                        marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-                    ))
+        # Sort the client_df by Approved Claim Amount in descending order
+        client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
+
+        with cls1:
+                # Create the bar chart
+                fig = go.Figure()
+
+                # Add bars for each Client
+                fig.add_trace(go.Bar(
+                    x=client_df['Diagnosis'],
+                    y=client_df['Approved Claim Amount'],
+                    text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
+                    textposition='auto',
+                    marker_color="#009DAE"  # Use custom colors
+                ))
 
-        fig.update_layout(
-                    barmode='stack',
+                fig.update_layout(
                     yaxis_title="Approved Claim Amount",
-                    xaxis_title="Employer Name",
+                    xaxis_title="Diagnosis",
                     font=dict(color='Black'),
                     xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                     yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                     margin=dict(l=0, r=0, t=30, b=50)
                 )
 
-                # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Clients by Approved Claim Amount and Claim Type</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-
 
-    # Group by Employer Name and Client Segment, then sum the Approved Claim Amount
-    df_grouped = df.groupby(['Employer Name', 'Source'])['Approved Claim Amount'].sum().nlargest(15).reset_index()
-
-    # Get the top 10 clients by Approved Claim Amount
-    top_10_clients = df_grouped.groupby('Employer Name')['Approved Claim Amount'].sum().reset_index()
+                # Display the chart in Streamlit
+                st.markdown('<h3 class="custom-subheader">Top 10 Diagnosis by Approved Claim Amount</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
 
-    # Filter the original DataFrame to include only the top 10 clients
-    client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
 
-    # Sort the client_df by Approved Claim Amount in descending order
-    client_df = client_df.sort_values(by='Approved Claim Amount', ascending=False)
+        # Group by Employer Name and sum the Approved Claim Amount
+        df_grouped = df.groupby('ICD-10 Code')['Approved Claim Amount'].sum().nlargest(10).reset_index()
 
-    with cls2:
-        # Create the bar chart
-        fig = go.Figure()
+        # Sort the client_df by Approved Claim Amount in descending order
+        client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
 
+        with cls2:
+                # Create the bar chart
+                fig = go.Figure()
 
-                # Add bars for each Client Segment
-        for idx, Client_Segment in enumerate(client_df['Source'].unique()):
-                    Client_Segment_data = client_df[client_df['Source'] == Client_Segment]
-                    fig.add_trace(go.Bar(
-                        x=Client_Segment_data['Employer Name'],
-                        y=Client_Segment_data['Approved Claim Amount'],
-                        name=Client_Segment,
-                        text=[f'{value/1e6:.0f}M' for value in Client_Segment_data['Approved Claim Amount']],
-                        textposition='auto',
-                        marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
-                    ))
+                # Add bars for each Client
+                fig.add_trace(go.Bar(
+                    x=client_df['ICD-10 Code'],
+                    y=client_df['Approved Claim Amount'],
+                    text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
+                    textposition='auto',
+                    marker_color="#009DAE" # Use custom colors
+                ))
 
-        fig.update_layout(
-                    barmode='stack',
+                fig.update_layout(
                     yaxis_title="Approved Claim Amount",
-                    xaxis_title="Employer Name",
+                    xaxis_title="ICD-10 Code",
                     font=dict(color='Black'),
                     xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                     yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                     margin=dict(l=0, r=0, t=30, b=50)
                 )
 
-                # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Clients by Approved Claim Amount and Claim Source</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
 
+                # Display the chart in Streamlit
+                st.markdown('<h3 class="custom-subheader">Top 10 ICD-10 Code by Approved Claim Amount</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
 
-    # Create the layout columns
-    cls1, cls2 = st.columns(2)
 
-    # Group by Client Name and sum the Total Amount
-    df_grouped = df.groupby('Employer Name')['Approved Claim Amount'].sum().nlargest(10).reset_index()
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
+        # Function to chart the top clients by approved claim amount, per claim type
+        def top_clients_by_claim_type_chart():
+            # Group by Employer Name and Client Segment, then sum the Approved Claim Amount
+            df_grouped = df.groupby(['Employer Name', 'Claim Type'])['Approved Claim Amount'].sum().nlargest(15).reset_index()
 
-    # Sort the client_df by Total Amount in descending order
-    client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
+            # Get the top 10 clients by Approved Claim Amount
+            top_10_clients = df_grouped.groupby('Employer Name')['Approved Claim Amount'].sum().reset_index()
 
-    with cls1:
-            # Create the bar chart
-            fig = go.Figure()
+            # Filter the original DataFrame to include only the top 10 clients
+            client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
 
-            # Add bars for each Client
-            fig.add_trace(go.Bar(
-                x=client_df['Employer Name'],
-                y=client_df['Approved Claim Amount'],
-                text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
-                textposition='auto',
-                marker_color="#009DAE" # Use custom colors
-            ))
+            # Sort the client_df by Approved Claim Amount in descending order
+            client_df = client_df.sort_values(by='Approved Claim Amount', ascending=False)
 
-            fig.update_layout(
+            # Create the bar chart, one bar per Claim Type
+            return category_chart(
+                client_df, 'Employer Name', 'Approved Claim Amount', color='Claim Type', colors=custom_colors, text='%.0fM', text_scale=1e6,
+                trace=dict(textposition='auto'),
+                barmode='stack',
                 yaxis_title="Approved Claim Amount",
                 xaxis_title="Employer Name",
                 font=dict(color='Black'),
@@ -867,40 +646,116 @@ if not df.empty:
                 margin=dict(l=0, r=0, t=30, b=50)
             )
 
+        with cls1:
+            fig = cached_chart(selection, 'top clients by claim type', top_clients_by_claim_type_chart)
 
             # Display the chart in Streamlit
-            st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Approved Claim Amount</h3>', unsafe_allow_html=True)
+            st.markdown('<h3 class="custom-subheader">Top 15 Clients by Approved Claim Amount and Claim Type</h3>', unsafe_allow_html=True)
             st.plotly_chart(fig, use_container_width=True)
 
-    # Group by Client Name and sum the Total Amount
-    df_grouped = df.groupby('Provider Name')['Approved Claim Amount'].sum().nlargest(10).reset_index()
 
-    # Sort the client_df by Total Amount in descending order
-    client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
 
-    with cls2:
-            # Create the bar chart
-            fig = go.Figure()
+        # Function to chart the top clients by approved claim amount, per source
+        def top_clients_by_source_chart():
+            # Group by Employer Name and Client Segment, then sum the Approved Claim Amount
+            df_grouped = df.groupby(['Employer Name', 'Source'])['Approved Claim Amount'].sum().nlargest(15).reset_index()
+
+            # Get the top 10 clients by Approved Claim Amount
+            top_10_clients = df_grouped.groupby('Employer Name')['Approved Claim Amount'].sum().reset_index()
 
-            # Add bars for each Client
-            fig.add_trace(go.Bar(
-                x=client_df['Provider Name'],
-                y=client_df['Approved Claim Amount'],
-                text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
-                textposition='auto',
-                marker_color="#009DAE"
-            ))
+            # Filter the original DataFrame to include only the top 10 clients
+            client_df = df_grouped[df_grouped['Employer Name'].isin(top_10_clients['Employer Name'])]
 
-            fig.update_layout(
+            # Sort the client_df by Approved Claim Amount in descending order
+            client_df = client_df.sort_values(by='Approved Claim Amount', ascending=False)
+
+            # Create the bar chart, one bar per Source
+            return category_chart(
+                client_df, 'Employer Name', 'Approved Claim Amount', color='Source', colors=custom_colors, text='%.0fM', text_scale=1e6,
+                trace=dict(textposition='auto'),
+                barmode='stack',
                 yaxis_title="Approved Claim Amount",
-                xaxis_title="Provider Name",
+                xaxis_title="Employer Name",
                 font=dict(color='Black'),
                 xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
                 margin=dict(l=0, r=0, t=30, b=50)
             )
 
+        with cls2:
+            fig = cached_chart(selection, 'top clients by source', top_clients_by_source_chart)
 
             # Display the chart in Streamlit
-            st.markdown('<h3 class="custom-subheader">Top 10 Popular Service Providers by Approved Claim Amount</h3>', unsafe_allow_html=True)
-            st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+            st.markdown('<h3 class="custom-subheader">Top 15 Clients by Approved Claim Amount and Claim Source</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+
+
+        # Create the layout columns
+        cls1, cls2 = st.columns(2)
+
+        # Group by Client Name and sum the Total Amount
+        df_grouped = df.groupby('Employer Name')['Approved Claim Amount'].sum().nlargest(10).reset_index()
+
+        # Sort the client_df by Total Amount in descending order
+        client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
+
+        with cls1:
+                # Create the bar chart
+                fig = go.Figure()
+
+                # Add bars for each Client
+                fig.add_trace(go.Bar(
+                    x=client_df['Employer Name'],
+                    y=client_df['Approved Claim Amount'],
+                    text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
+                    textposition='auto',
+                    marker_color="#009DAE" # Use custom colors
+                ))
+
+                fig.update_layout(
+                    yaxis_title="Approved Claim Amount",
+                    xaxis_title="Employer Name",
+                    font=dict(color='Black'),
+                    xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    margin=dict(l=0, r=0, t=30, b=50)
+                )
+
+
+                # Display the chart in Streamlit
+                st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Approved Claim Amount</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+        # Group by Client Name and sum the Total Amount
+        df_grouped = df.groupby('Provider Name')['Approved Claim Amount'].sum().nlargest(10).reset_index()
+
+        # Sort the client_df by Total Amount in descending order
+        client_df = df_grouped.sort_values(by='Approved Claim Amount', ascending=False)
+
+        with cls2:
+                # Create the bar chart
+                fig = go.Figure()
+
+                # Add bars for each Client
+                fig.add_trace(go.Bar(
+                    x=client_df['Provider Name'],
+                    y=client_df['Approved Claim Amount'],
+                    text=[f'{value/1e6:.0f}M' for value in client_df['Approved Claim Amount']],
+                    textposition='auto',
+                    marker_color="#009DAE"
+                ))
+
+                fig.update_layout(
+                    yaxis_title="Approved Claim Amount",
+                    xaxis_title="Provider Name",
+                    font=dict(color='Black'),
+                    xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    margin=dict(l=0, r=0, t=30, b=50)
+                )
+
+
+                # Display the chart in Streamlit
+                st.markdown('<h3 class="custom-subheader">Top 10 Popular Service Providers by Approved Claim Amount</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
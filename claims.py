@@ -8,6 +8,14 @@ from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from claims_data import load_claims
+from filters import sidebar_filters
+import overview
+import claim_analysis
+import fraud
+import loss_ratio
+import product
+import claim_type
 
 
 
@@ -37,46 +45,21 @@ def authenticate(username, password):
 
 
 # Main script: claims.py
-if 'df' not in st.session_state:
-    # Load your dataset here
-    filepath_visits = "Claims.xlsx"
-    sheet_name1 = "2023 claims"
-    sheet_name2 = "2024 claims"
-
-    # Read the Claims data
-    dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-    dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
-
-    # Read the visit logs
-    df = pd.concat([dfc_2023, dfc_2024])
-    st.session_state['df'] = df
-
-# Calculate IQR-based bounds for outliers
-column = 'Claim Amount'  # Replace with the appropriate column name
-Q1 = st.session_state['df'][column].quantile(0.25)
-Q3 = st.session_state['df'][column].quantile(0.75)
-IQR = Q3 - Q1
-
-# Define mild and extreme outlier bounds
-mild_lower = Q1 - 1.5 * IQR
-mild_upper = Q3 + 1.5 * IQR
-extreme_lower = Q1 - 3 * IQR
-extreme_upper = Q3 + 3 * IQR
-
-# Store the bounds in session state
-st.session_state['mild_lower'] = mild_lower
-st.session_state['mild_upper'] = mild_upper
-st.session_state['extreme_lower'] = extreme_lower
-st.session_state['extreme_upper'] = extreme_upper
-
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
+# Load the shared claims data (read from disk only when the workbook changes)
+df = load_claims()
+
 current_date = datetime.now()
 
+# Dashboard pages in the order they appear in the sidebar: name -> page module
+PAGES = {
+    "Overview": overview,
+    "Claims Analysis": claim_analysis,
+    "Claims Analysis - Fraud": fraud,
+    "Claims Analysis - Loss Ratio": loss_ratio,
+    "Product View": product,
+    "Claim Type View": claim_type,
+}
+
 
 
 # Function to display the dashboard
@@ -85,7 +68,7 @@ def display_dashboard(username):
     logo_url = 'EC_logo.png'  
     st.sidebar.image(logo_url, use_column_width=True)
 
-    page = st.sidebar.selectbox("Choose a dashboard", ["Home", "Overview", "Claims Analysis", "Claims Analysis - Fraud", "Claims Analysis - Loss Ratio", "Product View", "Claim Type View"])
+    page = st.sidebar.selectbox("Choose a dashboard", ["Home"] + list(PAGES))
 
     st.markdown(
         """
@@ -178,18 +161,11 @@ def display_dashboard(username):
 
         
 
-    elif page == "Overview":
-        exec(open("overview.py").read())
-    elif page == "Claims Analysis":
-        exec(open("claim_analysis.py").read())
-    elif page == "Claims Analysis - Loss Ratio":
-        exec(open("loss_ratio.py").read())
-    elif page == "Product View":
-        exec(open("product.py").read())
-    elif page == "Claim Type View":
-        exec(open("claim_type.py").read())
-    elif page == "Claims Analysis - Fraud":
-        exec(open("fraud.py", encoding="utf-8").read())   
+    else:
+        # Render the selected page from the shared data and its sidebar filters
+        module = PAGES[page]
+        data = module.prepare(df) if hasattr(module, 'prepare') else df
+        module.render(data, sidebar_filters(data, module.FILTERS))
 
 
 # Streamlit app
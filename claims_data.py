@@ -0,0 +1,88 @@
+import threading
+import pandas as pd
+from snapshots import file_signature, read_sheet
+
+
+# Claims workbook and the sheets that make up the claims history
+CLAIMS_FILE = "Claims.xlsx"
+CLAIMS_SHEETS = ["2023 claims", "2024 claims"]
+
+# Dictionary to map month names to their order
+month_order = {
+    "January": 1, "February": 2, "March": 3, "April": 4,
+    "May": 5, "June": 6, "July": 7, "August": 8,
+    "September": 9, "October": 10, "November": 11, "December": 12
+}
+
+# Date bucket columns added at load: name -> pandas period frequency
+TIME_BUCKETS = {
+    'Claim Day': 'D',
+    'Claim Week': 'W',
+    'Claim Month': 'M',
+    'Claim Quarter': 'Q',
+}
+
+# Helper columns added at load that the data tables do not show
+INTERNAL_COLUMNS = ['Period'] + list(TIME_BUCKETS)
+
+
+# Function to compute the integer period key (year * 12 + month) used to order and range-filter months.
+# Unknown month names count as month 0.
+def period_key(month, year):
+    return year.astype(int) * 12 + month.map(month_order).fillna(0).astype(int)
+
+
+# Function to add the start of each claim's day, ISO week, month and quarter as datetime columns
+def add_time_buckets(df, column, buckets=TIME_BUCKETS):
+    for name, freq in buckets.items():
+        df[name] = df[column].dt.to_period(freq).dt.start_time
+    return df
+
+
+# Process-wide cache shared by every session: path -> (file signature, DataFrame)
+_cache = {}
+_lock = threading.Lock()
+
+
+# Function to read both claims sheets (from their Parquet snapshots) into a single DataFrame
+def read_claims(path=CLAIMS_FILE):
+    frames = [read_sheet(path, sheet_name) for sheet_name in CLAIMS_SHEETS]
+    return pd.concat(frames)
+
+
+# Function to apply the clean-up every claims page used to repeat on each rerun
+def normalise_claims(df):
+    df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'], errors='coerce')
+
+    df["Employer Name"] = df["Employer Name"].str.upper()
+    df["Provider Name"] = df["Provider Name"].str.upper()
+
+    # Keep only rows with a valid month name
+    df = df[df['Month'].isin(month_order)].copy()
+
+    df['Source'] = df['Source'].astype(str)
+    df['Quarter'] = "Q" + df['Claim Created Date'].dt.quarter.astype(str)
+
+    # Handle non-finite values in 'Year' column
+    df['Year'] = df['Year'].fillna(0).astype(int)
+
+    # Create a 'Month-Year' column and its period key
+    df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    df['Period'] = period_key(df['Month'], df['Year'])
+
+    # Bucket the claim dates once for the time series charts
+    add_time_buckets(df, 'Claim Created Date')
+
+    return df
+
+
+# Function to load the normalised claims, re-reading the workbook only when it changes.
+# The returned DataFrame is shared between sessions and must not be modified in place.
+def load_claims(path=CLAIMS_FILE):
+    signature = file_signature(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, normalise_claims(read_claims(path)))
+            _cache[path] = cached
+    return cached[1]
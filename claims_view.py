@@ -7,10 +7,23 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
+from aggregations import count_and_sum
+from charts import cached_chart, category_chart, donut_chart, dual_axis_chart, frame_fingerprint
+from claims_data import add_time_buckets, period_key
+from filters import filter_month_year_range, month_year_options
+from snapshots import read_sheet
 
 
-# Centered and styled main title using inline styles
-st.markdown('''
+# Workbook this view reads when run on its own
+filepath = "ALL 2024 CLAIMS.xlsx"
+
+# This view builds its own sidebar
+FILTERS = []
+
+# Function to render the claims view from a claims DataFrame
+def render(data, filters):
+    # Centered and styled main title using inline styles
+    st.markdown('''
     <style>
         .main-title {
             color: #e66c37; /* Title color */
@@ -26,23 +39,28 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-st.markdown('<h1 class="main-title">Eden Care Claims View</h1>', unsafe_allow_html=True)
+    st.markdown('<h1 class="main-title">Eden Care Claims View</h1>', unsafe_allow_html=True)
 
-filepath="ALL 2024 CLAIMS.xlsx"
+    # Work on the claims data passed in by the caller
+    df = data
 
-# Read all sheets into a dictionary of DataFrames
-df = pd.read_excel(filepath)
+    # Fingerprint of the claims, which keys the charts in the figure cache (the view is given a
+    # freshly read frame on each run, so it cannot be told apart by identity)
+    data_fingerprint = frame_fingerprint(data)
 
 
 
-# Ensure the 'Start Date' column is in datetime format if needed
-df["Start Date"] = pd.to_datetime(df["Claim Created Date"], errors='coerce')
-# Get minimum and maximum dates for the date input
-startDate = df["Start Date"].min()
-endDate = df["Start Date"].max()
+    # Ensure the 'Start Date' column is in datetime format if needed
+    df["Start Date"] = pd.to_datetime(df["Claim Created Date"], errors='coerce')
 
-# Define CSS for the styled date input boxes
-st.markdown("""
+    # Bucket the claim dates once for the time series charts
+    add_time_buckets(df, "Start Date")
+    # Get minimum and maximum dates for the date input
+    startDate = df["Start Date"].min()
+    endDate = df["Start Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
     <style>
     .date-input-box {
         border-radius: 10px;
@@ -59,31 +77,31 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
+    # Function to display date input in styled boxes
+    def display_date_input(col, title, default_date, min_date, max_date):
+        col.markdown(f"""
         <div class="date-input-box">
             <div class="date-input-title">{title}</div>
         </div>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
+        return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
 
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
 
-# Filter DataFrame based on the selected dates
-df = df[(df["Start Date"] >= date1) & (df["Start Date"] <= date2)].copy()
+    # Filter DataFrame based on the selected dates
+    df = df[(df["Start Date"] >= date1) & (df["Start Date"] <= date2)].copy()
 
 
-# Sidebar styling and logo
-st.markdown("""
+    # Sidebar styling and logo
+    st.markdown("""
     <style>
     .sidebar .sidebar-content {
         background-color: #f0f2f6;
@@ -131,92 +149,84 @@ st.markdown("""
 
 
 
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
-# Sidebar for filters
-st.sidebar.header("Filters")
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-claim_type = st.sidebar.multiselect("Select Claim Type", options=df['Claim Type'].unique())
-status = st.sidebar.multiselect("Select Status", options=df['Claim Status'].unique())
-em_group = st.sidebar.multiselect("Select Employer Group", options=df['Employer Name'].unique())
-prov_name = st.sidebar.multiselect("Select Service Provider", options=df['Provider Name'].unique())
-
-
+    month_order = {
+        "January": 1, "February": 2, "March": 3, "April": 4, 
+        "May": 5, "June": 6, "July": 7, "August": 8, 
+        "September": 9, "October": 10, "November": 11, "December": 12
+    }
+    # Sort months based on their order
+    sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
+    # Sidebar for filters
+    st.sidebar.header("Filters")
+    month = st.sidebar.multiselect("Select Month", options=sorted_months)
+    claim_type = st.sidebar.multiselect("Select Claim Type", options=df['Claim Type'].unique())
+    status = st.sidebar.multiselect("Select Status", options=df['Claim Status'].unique())
+    em_group = st.sidebar.multiselect("Select Employer Group", options=df['Employer Name'].unique())
+    prov_name = st.sidebar.multiselect("Select Service Provider", options=df['Provider Name'].unique())
 
-# Apply filters to the DataFrame
-if month:
-    df = df[df['Month'].isin(month)]
-if claim_type:
-    df = df[df['Claim Type'].isin(claim_type)]
-if status:
-    df = df[df['Product_name'].isin(status)]
-if em_group:
-    df = df[df['Employer Name'].isin(em_group)]
-if prov_name:
-    df = df[df['Provider Name'].isin(prov_name)]
 
 
+    # Apply filters to the DataFrame
+    if month:
+        df = df[df['Month'].isin(month)]
+    if claim_type:
+        df = df[df['Claim Type'].isin(claim_type)]
+    if status:
+        df = df[df['Product_name'].isin(status)]
+    if em_group:
+        df = df[df['Employer Name'].isin(em_group)]
+    if prov_name:
+        df = df[df['Provider Name'].isin(prov_name)]
 
-# Determine the filter description
 
-df['Year'] = df['Year'].astype(int)
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    # Determine the filter description
 
+    df['Year'] = df['Year'].astype(int)
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order[month])
+    # Create a 'Month-Year' column and its period key
+    df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    df['Period'] = period_key(df['Month'], df['Year'])
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Extract unique month-year combinations in period order
+    month_years = month_year_options(df)
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    # Select slider for month-year range
+    selected_month_year_range = st.select_slider(
+        "Select Month-Year Range",
+        options=month_years,
+        value=(month_years[0], month_years[-1])
+    )
 
-start_index = (int(start_year), month_order[start_month])
-end_index = (int(end_year), month_order[end_month])
+    # Filter DataFrame on the precomputed period key
+    df = filter_month_year_range(df, selected_month_year_range)
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order[x.split()[0]])).between(start_index, end_index)
-]
+    # The selection the charts are drawn from, which keys them in the figure cache
+    selection = {
+        'page': __name__, 'data': data_fingerprint, 'dates': (date1, date2), 'range': selected_month_year_range,
+        'filters': {'Month': month, 'Claim Type': claim_type, 'Claim Status': status, 'Employer Name': em_group, 'Provider Name': prov_name},
+    }
 
-# Assuming the column name for the premium is 'Total Premium'
+    # Assuming the column name for the premium is 'Total Premium'
 
-if not df.empty:
-     # Calculate metrics
-    scale=1_000_000  # For millions
+    if not df.empty:
+         # Calculate metrics
+        scale=1_000_000  # For millions
 
-    total_claims = (df["Claim Amount"].sum())/scale
-    total_sp = df["Provider Name"].nunique()
-    total_em = df["Employer Name"].nunique()
-    app_claims = (df["Approved Claim Amount"].sum())/scale
+        total_claims = (df["Claim Amount"].sum())/scale
+        total_sp = df["Provider Name"].nunique()
+        total_em = df["Employer Name"].nunique()
+        app_claims = (df["Approved Claim Amount"].sum())/scale
 
 
 
 
-    # Create 4-column layout for metric cards
-    col1, col2, col3 = st.columns(3)
+        # Create 4-column layout for metric cards
+        col1, col2, col3 = st.columns(3)
 
-    # Define CSS for the styled boxes
-    st.markdown("""
+        # Define CSS for the styled boxes
+        st.markdown("""
         <style>
         .custom-subheader {
             color: #e66c37;
@@ -247,28 +257,28 @@ if not df.empty:
         </style>
         """, unsafe_allow_html=True)
 
-    # Function to display metrics in styled boxes
-    def display_metric(col, title, value):
-        col.markdown(f"""
+        # Function to display metrics in styled boxes
+        def display_metric(col, title, value):
+            col.markdown(f"""
             <div class="metric-box">
                 <div class="metric-title">{title}</div>
                 <div class="metric-value">{value}</div>
             </div>
             """, unsafe_allow_html=True)
 
-    col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4 = st.columns(4)
 
-    # Display metrics
-    display_metric(col1, "Total Claims", value=f"RWF {total_claims:.0f} M")
-    display_metric(col2, "Total Approved Claims", value=f"RWF {app_claims:.0f} M")
-    display_metric(col3, "Total Employer Group", total_em)
-    display_metric(col4, "Total Service Provider", total_sp)
+        # Display metrics
+        display_metric(col1, "Total Claims", value=f"RWF {total_claims:.0f} M")
+        display_metric(col2, "Total Approved Claims", value=f"RWF {app_claims:.0f} M")
+        display_metric(col3, "Total Employer Group", total_em)
+        display_metric(col4, "Total Service Provider", total_sp)
 
 
 
-   
-    # Sidebar styling and logo
-    st.markdown("""
+
+        # Sidebar styling and logo
+        st.markdown("""
         <style>
         .sidebar .sidebar-content {
             background-color: #f0f2f6;
@@ -313,356 +323,336 @@ if not df.empty:
                 
         </style>
         """, unsafe_allow_html=True)
-    
-    custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
-
-    st.markdown('<h2 class="custom-subheader">Number of Claims and Claim Amount Over Time</h2>', unsafe_allow_html=True)
-
-  
-    # Group by day and count the occurrences
-    area_chart_count = df.groupby(df["Start Date"].dt.strftime("%Y-%m-%d")).size().reset_index(name='Count')
-    area_chart_amount = df.groupby(df["Start Date"].dt.strftime("%Y-%m-%d"))['Claim Amount'].sum().reset_index(name='Total Amount')
-
-    # Merge the count and amount data
-    area_chart = pd.merge(area_chart_count, area_chart_amount, on='Start Date')
-
-    # Sort by the PreAuth Created Date
-    area_chart = area_chart.sort_values("Start Date")
-
-    # Create the dual-axis area chart
-    fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-
-    # Add traces
-    fig2.add_trace(
-        go.Scatter(
-            x=area_chart['Start Date'], 
-            y=area_chart['Count'], 
-            name="Number of Claims", 
-            fill='tozeroy', 
-            line=dict(color='#e66c37')),
-            secondary_y=False,
-    )
-
-    fig2.add_trace(
-        go.Scatter(
-            x=area_chart['Start Date'], 
-            y=area_chart['Total Amount'], 
-            name="Total Claim Amount", 
-            fill='tozeroy', 
-            line=dict(color='#009DAE')),
-            secondary_y=True,
-    )
 
+        custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
+
+        st.markdown('<h2 class="custom-subheader">Number of Claims and Claim Amount Over Time</h2>', unsafe_allow_html=True)
+
+
+        # Count the claims and total the claim amount per day, sorted by date
+        area_chart = count_and_sum(df, 'Claim Day', 'Claim Amount', sum_name='Total Amount').rename(columns={'Claim Day': 'Start Date'})
+
+        # Function to create the dual-axis area chart, rotating the x-axis labels by 45 degrees for better readability
+        def claims_over_time_chart():
+            return dual_axis_chart(
+                area_chart, 'Start Date',
+                left=dict(y='Count', kind='area', name="Number of Claims", color='#e66c37'),
+                right=dict(y='Total Amount', kind='area', name="Total Claim Amount", color='#009DAE'),
+                xaxis_title="Day of the Month",
+                xaxis_tickangle=45,
+                yaxis_title="<b>Number Of Claims</b>",
+                yaxis2_title="<b>Total Claim Amount</b>",
+            )
+
+        fig2 = cached_chart(selection, 'claims over time', claims_over_time_chart)
+
+        st.plotly_chart(fig2, use_container_width=True)
+
+        # Expander for Combined Data Table
+        with st.expander("Claims Data Table", expanded=False):
+            st.dataframe(area_chart.style.background_gradient(cmap='YlOrBr'))
+
+        # Function to chart the average claim amount per month and claim type
+        def monthly_average_chart():
+            # Group data by "Start Month Year" and "Client Segment" and calculate the average Total Premium
+            yearly_avg_premium = df.groupby(['Month', 'Claim Type'])['Claim Amount'].mean().unstack().fillna(0)
+
+            # Create the grouped bar chart, one bar per Claim Type
+            return category_chart(
+                yearly_avg_premium, 'Month', list(yearly_avg_premium.columns), colors=custom_colors,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis_title="Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height= 450
+            )
 
+        # Define custom colors
+        cols1, cols2 = st.columns(2)
 
-    # Set x-axis title
-    fig2.update_xaxes(
-        title_text="Day of the Month", 
-        tickangle=45)  # Rotate x-axis labels to 45 degrees for better readability
+        custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
 
-    # Set y-axes titles
-    fig2.update_yaxes(
-        title_text="<b>Number Of Claims</b>", 
-        secondary_y=False)
-    fig2.update_yaxes(
-        title_text="<b>Total Claim Amount</b>", 
-        secondary_y=True)
 
-    st.plotly_chart(fig2, use_container_width=True)
+        with cols2:
+            fig_yearly_avg_premium = cached_chart(selection, 'monthly average by claim type', monthly_average_chart)
 
-    # Expander for Combined Data Table
-    with st.expander("Claims Data Table", expanded=False):
-        st.dataframe(area_chart.style.background_gradient(cmap='YlOrBr'))
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Monthly Claim Amount by Claim Type per Member</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
 
-    # Group data by "Start Month Year" and "Client Segment" and calculate the average Total Premium
-    yearly_avg_premium = df.groupby(['Month', 'Claim Type'])['Claim Amount'].mean().unstack().fillna(0)
+       # Group data by "Intermediary name" and sum the Total Premium
+        premium_by_intermediary = df.groupby('Month')['Claim Amount'].mean().reset_index()
 
-    # Define custom colors
-    cols1, cols2 = st.columns(2)
+        # Calculate the number of sales by "Intermediary name"
+        sales_by_intermediary = df.groupby('Month').size().reset_index(name='Number of Claims')
 
-    custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
+        # Merge the premium and sales data
+        merged_data = premium_by_intermediary.merge(sales_by_intermediary, on='Month')
 
 
-    with cols2:
-        # Create the grouped bar chart
-        fig_yearly_avg_premium = go.Figure()
+        with cols1:
+            fig_premium_by_intermediary = go.Figure()
 
-        for idx, Client_Segment in enumerate(yearly_avg_premium.columns):
-            fig_yearly_avg_premium.add_trace(go.Bar(
-                x=yearly_avg_premium.index,
-                y=yearly_avg_premium[Client_Segment],
-                name=Client_Segment,
+            # Add bar trace for Total Premium
+            fig_premium_by_intermediary.add_trace(go.Bar(
+                x=merged_data['Month'],
+                y=merged_data['Claim Amount'],
+                text=merged_data['Claim Amount'],
                 textposition='inside',
                 textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
+                hoverinfo='x+y',
+                marker_color='#009DAE',
+                name='Average Claim Amount'
             ))
 
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Month",
-            yaxis_title="Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height= 450
-        )
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Monthly Claim Amount by Claim Type per Member</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+            # Set layout for the chart
+            fig_premium_by_intermediary.update_layout(
+                yaxis=dict(
+                    title="Average Claim Amount",
+                    titlefont=dict(color="grey"),
+                    tickfont=dict(color="grey")
+                ),
 
-   # Group data by "Intermediary name" and sum the Total Premium
-    premium_by_intermediary = df.groupby('Month')['Claim Amount'].mean().reset_index()
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+            )
 
-    # Calculate the number of sales by "Intermediary name"
-    sales_by_intermediary = df.groupby('Month').size().reset_index(name='Number of Claims')
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Monthly Claim Amount per Member</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
 
-    # Merge the premium and sales data
-    merged_data = premium_by_intermediary.merge(sales_by_intermediary, on='Month')
 
+       # Create the layout columns
+        cls1, cls2 = st.columns(2)
 
-    with cols1:
-        fig_premium_by_intermediary = go.Figure()
+        # Function to chart the share of the claim amount of each claim type
+        def claim_type_share_chart():
+            int_owner = df.groupby("Claim Type")["Claim Amount"].sum().reset_index()
+            int_owner.columns = ["Claim Type", "Claim Amount"]    
 
-        # Add bar trace for Total Premium
-        fig_premium_by_intermediary.add_trace(go.Bar(
-            x=merged_data['Month'],
-            y=merged_data['Claim Amount'],
-            text=merged_data['Claim Amount'],
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y',
-            marker_color='#009DAE',
-            name='Average Claim Amount'
-        ))
+            # Create a donut chart
+            return donut_chart(
+                int_owner, "Claim Type", "Claim Amount", colors=custom_colors, trace=dict(textposition='inside', textinfo='value+percent'),
+                template="plotly_dark", height=450, margin=dict(l=0, r=10, t=30, b=50),
+            )
 
+        with cls1:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Claim Amount by Channel</h3>', unsafe_allow_html=True)
 
-        # Set layout for the chart
-        fig_premium_by_intermediary.update_layout(
-            yaxis=dict(
-                title="Average Claim Amount",
-                titlefont=dict(color="grey"),
-                tickfont=dict(color="grey")
-            ),
 
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-        )
+            fig = cached_chart(selection, 'claim amount by claim type', claim_type_share_chart)
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Monthly Claim Amount per Member</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
+            # Display the chart in Streamlit
+            st.plotly_chart(fig, use_container_width=True)
 
+        # Function to chart the share of the claims of each status
+        def status_share_chart():
+            # Donut chart for PreAuth by Status
+            status_counts = df["Claim Status"].value_counts().reset_index()
+            status_counts.columns = ["Status", "Count"]
 
-   # Create the layout columns
-    cls1, cls2 = st.columns(2)
+            return donut_chart(
+                status_counts, "Status", "Count", colors=custom_colors, trace=dict(textposition='inside', textinfo='percent+value'),
+                template="plotly_dark", height=350, margin=dict(l=10, r=10, t=30, b=80),
+            )
 
-    int_owner = df.groupby("Claim Type")["Claim Amount"].sum().reset_index()
-    int_owner.columns = ["Claim Type", "Claim Amount"]    
+        with cls2:
+            st.markdown('<h2 class="custom-subheader">Number of Claims By Status</h2>', unsafe_allow_html=True)    
+        # Define custom colors
+            custom_colors = ["#006E7F", "#e66c37","#461b09","#f8a785", "#CC3636" ] 
 
-    with cls1:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Claim Amount by Channel</h3>', unsafe_allow_html=True)
+            fig = cached_chart(selection, 'claims by status', status_share_chart)
+            st.plotly_chart(fig, use_container_width=True, height = 200)
 
+        cols1, cols2 = st.columns((2))
+        # bar chart for PreAuth by Specialisation
+        diagnosis_count = df.groupby("Diagnosis").size().reset_index(name='Number of Claims')
+        diagnosis_count = diagnosis_count.sort_values(by='Number of Claims', ascending=False)
 
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Claim Type", values="Claim Amount", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
+        top_10_specialisations = diagnosis_count.sort_values(by='Number of Claims', ascending=False).head(15)
 
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
+        with cols1:
+            st.markdown('<h2 class="custom-subheader">Numbers of Claims By Diagnosis</h2>', unsafe_allow_html=True)    
+            # Define custom colors
+            custom_colors = ["#009DAE"] 
 
-    # Donut chart for PreAuth by Status
-    status_counts = df["Claim Status"].value_counts().reset_index()
-    status_counts.columns = ["Status", "Count"]
+            # Create the bar chart with custom colors
+            fig = px.bar(top_10_specialisations, x="Diagnosis", y="Number of Claims", template="seaborn",
+                        color_discrete_sequence=custom_colors)
 
-    with cls2:
-        st.markdown('<h2 class="custom-subheader">Number of Claims By Status</h2>', unsafe_allow_html=True)    
-    # Define custom colors
-        custom_colors = ["#006E7F", "#e66c37","#461b09","#f8a785", "#CC3636" ] 
+            fig.update_traces(textposition='outside')
+            fig.update_layout(height=400) 
 
-        fig = px.pie(status_counts, names="Status", values="Count", hole=0.5, template = "plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='percent+value')
-        fig.update_layout(height=350, margin=dict(l=10, r=10, t=30, b=80))
-        st.plotly_chart(fig, use_container_width=True, height = 200)
+            st.plotly_chart(fig, use_container_width=True)
 
-    cols1, cols2 = st.columns((2))
-    # bar chart for PreAuth by Specialisation
-    diagnosis_count = df.groupby("Diagnosis").size().reset_index(name='Number of Claims')
-    diagnosis_count = diagnosis_count.sort_values(by='Number of Claims', ascending=False)
+        # bar chart for PreAuth by Specialisation
+        diagnosis_count = df.groupby("ICD-10 Code").size().reset_index(name='Number of Claims')
+        diagnosis_count = diagnosis_count.sort_values(by='Number of Claims', ascending=False)
 
-    top_10_specialisations = diagnosis_count.sort_values(by='Number of Claims', ascending=False).head(15)
+        top_10_specialisations = diagnosis_count.sort_values(by='Number of Claims', ascending=False).head(15)
 
-    with cols1:
-        st.markdown('<h2 class="custom-subheader">Numbers of Claims By Diagnosis</h2>', unsafe_allow_html=True)    
-        # Define custom colors
-        custom_colors = ["#009DAE"] 
-        
-        # Create the bar chart with custom colors
-        fig = px.bar(top_10_specialisations, x="Diagnosis", y="Number of Claims", template="seaborn",
-                    color_discrete_sequence=custom_colors)
-        
-        fig.update_traces(textposition='outside')
-        fig.update_layout(height=400) 
-        
-        st.plotly_chart(fig, use_container_width=True)
-
-    # bar chart for PreAuth by Specialisation
-    diagnosis_count = df.groupby("ICD-10 Code").size().reset_index(name='Number of Claims')
-    diagnosis_count = diagnosis_count.sort_values(by='Number of Claims', ascending=False)
-
-    top_10_specialisations = diagnosis_count.sort_values(by='Number of Claims', ascending=False).head(15)
-
-    with cols2:
-        st.markdown('<h2 class="custom-subheader">Numbers of Claims By ICD-10 Code</h2>', unsafe_allow_html=True)    
-        # Define custom colors
-        custom_colors = ["#009DAE"] 
-        
-        # Create the bar chart with custom colors
-        fig = px.bar(top_10_specialisations, x="ICD-10 Code", y="Number of Claims", template="seaborn",
-                    color_discrete_sequence=custom_colors)
-        
-        fig.update_traces(textposition='outside')
-        fig.update_layout(height=400) 
-        
-        st.plotly_chart(fig, use_container_width=True)
-
-
-    # Get the top 15 employers by Claim Amount
-    top_15_employers = df.nlargest(15, 'Claim Amount')
-
-    # Sort the top 15 employers by Claim Amount in descending order
-    sorted_df = top_15_employers.sort_values(by='Claim Amount', ascending=False)
-
-
-    with cols1:
-
-        # Create the bar chart
-        fig = go.Figure()
-
-        # Add bars for each employer
-        fig.add_trace(go.Bar(
-            x=sorted_df['Provider Name'],
-            y=sorted_df['Claim Amount'],
-            text=[f'{value/1e3:.0f}K' for value in sorted_df['Claim Amount']],
-            textposition='auto',
-            marker_color="#009DAE"  # Custom color
-        ))
-
-        fig.update_layout(
-            yaxis_title="Claim Amount",
-            xaxis_title="Provider Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Group data by "Intermediary name" and sum the Total Premium
-    premium_by_intermediary_name = df.groupby('Employer Name')['Claim Amount'].sum().nlargest(15).reset_index()
-    # Calculate the number of sales by "Intermediary name"
-    sales_by_intermediary = df.groupby('Employer Name').size().reset_index(name='Number of Claims')
-
-    # Merge the premium and sales data
-    merged = premium_by_intermediary_name.merge(sales_by_intermediary, on='Employer Name')
-
-   # Create the layout columns
-    cls1, cls2 = st.columns(2)
-
-    with cls1:
-        fig_premium_by_intermediary = go.Figure()
-
-        # Add bar trace for Total Premium
-        fig_premium_by_intermediary.add_trace(go.Bar(
-            x=merged['Employer Name'],
-            y=merged['Claim Amount'],
-            text=merged['Claim Amount'],
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y',
-            marker_color='#009DAE',
-            name='Claim Amount'
-        ))
-
-
-        # Set layout for the chart
-        fig_premium_by_intermediary.update_layout(
-            xaxis_title="Employer Group",
-            yaxis=dict(
-                title="Total Claim Amount",
-                titlefont=dict(color="#009DAE"),
-                tickfont=dict(color="#009DAE")
-            ),
-
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-        )
-
-        # Display the chart in Streamlit
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Employer Groups by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
-
-    # Group data by "Intermediary name" and sum the Total Premium
-    premium_by_intermediary_name = df.groupby('Provider Name')['Claim Amount'].sum().nlargest(15).reset_index()
-    # Calculate the number of sales by "Intermediary name"
-    sales_by_intermediary = df.groupby('Provider Name').size().reset_index(name='Number of Claims')
-
-    # Merge the premium and sales data
-    merged_df = premium_by_intermediary_name.merge(sales_by_intermediary, on='Provider Name')
-
-
-    with cls2:
-        fig_premium_by_intermediary = go.Figure()
-
-        # Add bar trace for Total Premium
-        fig_premium_by_intermediary.add_trace(go.Bar(
-            x=merged_df['Provider Name'],
-            y=merged_df['Claim Amount'],
-            text=merged_df['Claim Amount'],
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y',
-            marker_color='#009DAE',
-            name='Claim Amount'
-        ))
-
-
-        # Set layout for the chart
-        fig_premium_by_intermediary.update_layout(
-            xaxis_title="Service Provider",
-            yaxis=dict(
-                title="Total Claim Amount",
-                titlefont=dict(color="#009DAE"),
-                tickfont=dict(color="#009DAE")
-            ),
-
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-        )
-
-        # Display the chart in Streamlit
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 15 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
-
-
-    cl1, cl2 =st.columns(2)
-
-    with cl1:
-        with st.expander("Total Claims by Employer Group"):
-            st.dataframe(merged.style.format(precision=2))
-
-    with cl2:
-        with st.expander("Total Claims by Service Provider"):
-            st.dataframe(merged_df.style.format(precision=2))
\ No newline at end of file
+        with cols2:
+            st.markdown('<h2 class="custom-subheader">Numbers of Claims By ICD-10 Code</h2>', unsafe_allow_html=True)    
+            # Define custom colors
+            custom_colors = ["#009DAE"] 
+
+            # Create the bar chart with custom colors
+            fig = px.bar(top_10_specialisations, x="ICD-10 Code", y="Number of Claims", template="seaborn",
+                        color_discrete_sequence=custom_colors)
+
+            fig.update_traces(textposition='outside')
+            fig.update_layout(height=400) 
+
+            st.plotly_chart(fig, use_container_width=True)
+
+
+        # Get the top 15 employers by Claim Amount
+        top_15_employers = df.nlargest(15, 'Claim Amount')
+
+        # Sort the top 15 employers by Claim Amount in descending order
+        sorted_df = top_15_employers.sort_values(by='Claim Amount', ascending=False)
+
+
+        with cols1:
+
+            # Create the bar chart
+            fig = go.Figure()
+
+            # Add bars for each employer
+            fig.add_trace(go.Bar(
+                x=sorted_df['Provider Name'],
+                y=sorted_df['Claim Amount'],
+                text=[f'{value/1e3:.0f}K' for value in sorted_df['Claim Amount']],
+                textposition='auto',
+                marker_color="#009DAE"  # Custom color
+            ))
+
+            fig.update_layout(
+                yaxis_title="Claim Amount",
+                xaxis_title="Provider Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 15 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Group data by "Intermediary name" and sum the Total Premium
+        premium_by_intermediary_name = df.groupby('Employer Name')['Claim Amount'].sum().nlargest(15).reset_index()
+        # Calculate the number of sales by "Intermediary name"
+        sales_by_intermediary = df.groupby('Employer Name').size().reset_index(name='Number of Claims')
+
+        # Merge the premium and sales data
+        merged = premium_by_intermediary_name.merge(sales_by_intermediary, on='Employer Name')
+
+       # Create the layout columns
+        cls1, cls2 = st.columns(2)
+
+        with cls1:
+            fig_premium_by_intermediary = go.Figure()
+
+            # Add bar trace for Total Premium
+            fig_premium_by_intermediary.add_trace(go.Bar(
+                x=merged['Employer Name'],
+                y=merged['Claim Amount'],
+                text=merged['Claim Amount'],
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y',
+                marker_color='#009DAE',
+                name='Claim Amount'
+            ))
+
+
+            # Set layout for the chart
+            fig_premium_by_intermediary.update_layout(
+                xaxis_title="Employer Group",
+                yaxis=dict(
+                    title="Total Claim Amount",
+                    titlefont=dict(color="#009DAE"),
+                    tickfont=dict(color="#009DAE")
+                ),
+
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+            )
+
+            # Display the chart in Streamlit
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 15 Employer Groups by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
+
+        # Group data by "Intermediary name" and sum the Total Premium
+        premium_by_intermediary_name = df.groupby('Provider Name')['Claim Amount'].sum().nlargest(15).reset_index()
+        # Calculate the number of sales by "Intermediary name"
+        sales_by_intermediary = df.groupby('Provider Name').size().reset_index(name='Number of Claims')
+
+        # Merge the premium and sales data
+        merged_df = premium_by_intermediary_name.merge(sales_by_intermediary, on='Provider Name')
+
+
+        with cls2:
+            fig_premium_by_intermediary = go.Figure()
+
+            # Add bar trace for Total Premium
+            fig_premium_by_intermediary.add_trace(go.Bar(
+                x=merged_df['Provider Name'],
+                y=merged_df['Claim Amount'],
+                text=merged_df['Claim Amount'],
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y',
+                marker_color='#009DAE',
+                name='Claim Amount'
+            ))
+
+
+            # Set layout for the chart
+            fig_premium_by_intermediary.update_layout(
+                xaxis_title="Service Provider",
+                yaxis=dict(
+                    title="Total Claim Amount",
+                    titlefont=dict(color="#009DAE"),
+                    tickfont=dict(color="#009DAE")
+                ),
+
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+            )
+
+            # Display the chart in Streamlit
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 15 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_premium_by_intermediary, use_container_width=True)
+
+
+        cl1, cl2 =st.columns(2)
+
+        with cl1:
+            with st.expander("Total Claims by Employer Group"):
+                st.dataframe(merged.style.format(precision=2))
+
+        with cl2:
+            with st.expander("Total Claims by Service Provider"):
+                st.dataframe(merged_df.style.format(precision=2))
+
+
+# Function to run the view on its own, reading the first sheet from the workbook's snapshot
+def main():
+    render(read_sheet(filepath), {})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+# A member's tie to a provider counts in the clusters once they share this many claims
+MIN_EDGE_CLAIMS = 3
+
+# Clusters need at least this many providers and members to be reported
+MIN_CLUSTER_PROVIDERS = 2
+MIN_CLUSTER_MEMBERS = 2
+
+
+# Function to build the bipartite provider-member graph of the claims as a sparse CSR matrix:
+# one row per provider, one column per member, holding the number of claims between them.
+# Returns the matrix with the provider and member names of its rows and columns.
+def provider_member_graph(df):
+    claims = df[['Provider Name', 'Member Name']].dropna()
+    provider_codes, providers = pd.factorize(claims['Provider Name'])
+    member_codes, members = pd.factorize(claims['Member Name'])
+    graph = sparse.csr_matrix(
+        (np.ones(len(claims)), (provider_codes, member_codes)),
+        shape=(len(providers), len(members)),
+    )
+    graph.sum_duplicates()
+    return graph, providers, members
+
+
+# Function to measure the shared members of every pair of providers: a single sparse product of
+# the provider-member incidence matrix with its transpose. Returns the pairs sharing any member,
+# with the count of shared members and their Jaccard overlap, most overlapping first.
+def provider_overlap(graph, providers):
+    incidence = (graph > 0).astype(np.int64)
+    shared = sparse.triu(incidence @ incidence.T, k=1).tocoo()
+    degree = np.asarray(incidence.sum(axis=1)).ravel()
+
+    overlap = pd.DataFrame({
+        'Provider': providers[shared.row],
+        'Other Provider': providers[shared.col],
+        'Shared Members': shared.data,
+        'Overlap': shared.data / (degree[shared.row] + degree[shared.col] - shared.data),
+    })
+    return overlap.sort_values(['Overlap', 'Shared Members'], ascending=False, kind='stable').reset_index(drop=True)
+
+
+# Function to find clusters of providers and members tied by repeated claims: the connected
+# components of the graph keeping only edges of MIN_EDGE_CLAIMS or more claims. Each cluster is
+# scored by its density (share of its provider-member pairs that are tied) times its claims per
+# member, so small, fully connected groups with many claims rank first.
+def suspicious_clusters(graph, providers, members):
+    strong = graph.multiply(graph >= MIN_EDGE_CLAIMS).tocsr()
+    strong.eliminate_zeros()
+
+    # Components of the bipartite graph: providers first, then members
+    n_providers = len(providers)
+    adjacency = sparse.bmat([[None, strong], [strong.T, None]], format='csr')
+    _, labels = connected_components(adjacency, directed=False)
+    provider_labels, member_labels = labels[:n_providers], labels[n_providers:]
+
+    # Size, ties and claims of each component
+    edges = strong.tocoo()
+    edge_labels = provider_labels[edges.row]
+    n_components = labels.max() + 1 if len(labels) else 0
+    cluster = pd.DataFrame({
+        'Providers': np.bincount(provider_labels, minlength=n_components),
+        'Members': np.bincount(member_labels, minlength=n_components),
+        'Ties': np.bincount(edge_labels, minlength=n_components),
+        'Claims': np.bincount(edge_labels, weights=edges.data, minlength=n_components).astype(int),
+    })
+    cluster = cluster[(cluster['Providers'] >= MIN_CLUSTER_PROVIDERS) & (cluster['Members'] >= MIN_CLUSTER_MEMBERS)]
+
+    cluster['Density'] = cluster['Ties'] / (cluster['Providers'] * cluster['Members'])
+    cluster['Score'] = cluster['Density'] * cluster['Claims'] / cluster['Members']
+
+    # Name the providers of each cluster
+    names = pd.Series(providers, index=provider_labels)
+    cluster['Provider Names'] = names[names.index.isin(cluster.index)].groupby(level=0).agg(', '.join)
+    cluster = cluster.sort_values('Score', ascending=False, kind='stable').reset_index(drop=True)
+    return cluster[['Provider Names', 'Providers', 'Members', 'Claims', 'Density', 'Score']]
+
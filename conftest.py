@@ -0,0 +1,2 @@
+# The dashboard's modules live at the top of the repository; this file makes pytest put it on
+# the import path for the tests in tests/
@@ -0,0 +1,91 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from filters import apply_filters, filter_month_year_range
+
+
+# Low-cardinality dimensions the cube is grouped on. Employer, provider and diagnosis
+# columns are left out: filtering on them falls back to building the cube from the rows.
+CUBE_DIMENSIONS = ['Year', 'Month', 'Quarter', 'Period', 'Product', 'Claim Type', 'Claim Status', 'Source']
+
+# Amount columns aggregated in the cube
+CUBE_MEASURES = ['Claim Amount', 'Approved Claim Amount']
+
+# Columns whose non-missing values are counted in the cube
+CUBE_COUNTS = ['Claim ID'] + CUBE_MEASURES
+
+# Cubes of the shared claims data: id(frame) -> (weak reference, cube)
+_cubes = {}
+_lock = threading.Lock()
+
+
+# Function to pre-aggregate claims per dimension tuple: row count, and the count,
+# sum and sum of squares of each measure, which roll up by addition
+def build_cube(df):
+    parts = {'size': np.ones(len(df), dtype=np.int64)}
+    for column in CUBE_COUNTS:
+        parts[f'{column} count'] = df[column].notna().to_numpy(dtype=np.int64)
+    for column in CUBE_MEASURES:
+        values = df[column].to_numpy(dtype=float)
+        parts[f'{column} sum'] = values
+        parts[f'{column} sum_sq'] = values * values
+
+    keys = [df[dimension].to_numpy() for dimension in CUBE_DIMENSIONS]
+    measures = pd.DataFrame(parts)
+    cube = measures.groupby(keys, dropna=False).sum()
+    cube.index.names = CUBE_DIMENSIONS
+    return cube.reset_index()
+
+
+# Function to build the cube of a claims DataFrame once and reuse it while the frame is alive
+def claims_cube(df):
+    with _lock:
+        entry = _cubes.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    cube = build_cube(df)
+    with _lock:
+        key = id(df)
+        _cubes[key] = (weakref.ref(df, lambda _, key=key: _cubes.pop(key, None)), cube)
+    return cube
+
+
+# Function to get the cube for a page's current selection. Sidebar filters and the Month-Year
+# range are applied to the precomputed cube of the page data; if a filter is active on a column
+# the cube does not have, the cube is built from the already filtered rows instead.
+def selection_cube(data, df, filters, month_year_range):
+    for column, values in filters.items():
+        if values and column in data.columns and column not in CUBE_DIMENSIONS:
+            return build_cube(df)
+
+    cube, _ = apply_filters(claims_cube(data), filters)
+    return filter_month_year_range(cube, month_year_range)
+
+
+# Function to roll the cube up to the given dimensions, like a pandas named aggregation:
+# aggregations maps each output column to (column, statistic), where the statistic is one of
+# 'size', 'count', 'sum', 'mean' or 'std'. Returns a DataFrame indexed by the dimensions.
+def rollup(cube, by, aggregations):
+    measures = [column for column in cube.columns if column not in CUBE_DIMENSIONS]
+    grouped = cube.groupby(by)[measures].sum()
+
+    result = pd.DataFrame(index=grouped.index)
+    for name, (column, statistic) in aggregations.items():
+        if statistic == 'size':
+            result[name] = grouped['size']
+        elif statistic == 'count':
+            result[name] = grouped[f'{column} count']
+        elif statistic == 'sum':
+            result[name] = grouped[f'{column} sum']
+        elif statistic == 'mean':
+            result[name] = grouped[f'{column} sum'] / grouped[f'{column} count']
+        elif statistic == 'std':
+            count = grouped[f'{column} count']
+            total = grouped[f'{column} sum']
+            variance = (grouped[f'{column} sum_sq'] - total * total / count) / (count - 1)
+            result[name] = np.sqrt(variance.clip(lower=0)).where(count > 1)
+        else:
+            raise ValueError(f"Unsupported cube statistic: {statistic}")
+    return result
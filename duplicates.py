@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+# Claims are only compared within the same block of these columns
+DUPLICATE_BLOCK = ['Member Name', 'Provider Name', 'ICD-10 Code']
+
+# Claims of a block created this many days apart or less can be duplicates
+DUPLICATE_WINDOW_DAYS = 3
+
+# Claim amounts within this fraction of the larger amount count as similar
+DUPLICATE_AMOUNT_TOLERANCE = 0.05
+
+# Number of preceding claims of the block each claim is compared with, once sorted by date
+DUPLICATE_NEIGHBOURS = 5
+
+# Claim columns shown for the candidate duplicates
+DUPLICATE_COLUMNS = ['Claim ID', 'Member Name', 'Provider Name', 'ICD-10 Code', 'Claim Created Date', 'Claim Amount', 'Claim Status']
+
+
+# Function to group claims that look like duplicates: same member, provider and ICD-10 code,
+# created within DUPLICATE_WINDOW_DAYS and with similar amounts. Claims are sorted by block and
+# date, and each is compared with its DUPLICATE_NEIGHBOURS predecessors only (a sorted-neighbourhood
+# window, not every pair), so the work grows linearly with the claims. Returns each claim's
+# duplicate group in the claims' order: the group number, or -1 for claims without a duplicate.
+def duplicate_groups(df):
+    block = df.groupby(DUPLICATE_BLOCK, sort=False).ngroup().to_numpy()
+    day = df['Claim Created Date'].to_numpy('datetime64[D]')
+    amount = df['Claim Amount'].to_numpy(dtype=float)
+
+    # Sort by block, then date; claims missing a block column, date or amount are never linked
+    valid = (block >= 0) & ~np.isnat(day) & ~np.isnan(amount)
+    order = np.lexsort((day, block))
+    order = order[valid[order]]
+    block, day, amount = block[order], day[order].astype(np.int64), amount[order]
+
+    # Link each claim with the similar predecessors of its block inside the window
+    n = len(order)
+    links = []
+    for lag in range(1, DUPLICATE_NEIGHBOURS + 1):
+        current, previous = np.arange(lag, n), np.arange(0, n - lag)
+        similar = (
+            (block[current] == block[previous])
+            & (day[current] - day[previous] <= DUPLICATE_WINDOW_DAYS)
+            & (np.abs(amount[current] - amount[previous]) <= DUPLICATE_AMOUNT_TOLERANCE * np.maximum(amount[current], amount[previous]))
+        )
+        links.append((previous[similar], current[similar]))
+
+    # Label the linked claims with their connected component, in one pass over the sparse links
+    previous, current = (np.concatenate(ends) for ends in zip(*links))
+    graph = sparse.csr_matrix((np.ones(len(previous)), (previous, current)), shape=(n, n))
+    _, label = connected_components(graph, directed=False)
+
+    # Number the groups of two or more claims, in sorted order
+    sizes = np.bincount(label, minlength=n)
+    grouped = sizes[label] > 1
+    numbers = np.full(n, -1)
+    numbers[grouped] = pd.factorize(label[grouped])[0]
+
+    groups = np.full(len(df), -1)
+    groups[order] = numbers
+    return groups
+
+
+# Function to list the claims of a selection whose duplicate group ('Duplicate Group' column)
+# still has two or more claims in the selection, by group and date
+def candidate_duplicates(df):
+    candidates = df.loc[df['Duplicate Group'] >= 0, ['Duplicate Group'] + DUPLICATE_COLUMNS]
+    sizes = candidates['Duplicate Group'].map(candidates['Duplicate Group'].value_counts())
+    candidates = candidates[sizes > 1]
+    return candidates.sort_values(['Duplicate Group', 'Claim Created Date'], kind='stable')
+
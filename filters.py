@@ -0,0 +1,114 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+import streamlit as st
+from claims_data import month_order
+
+
+# Sidebar multiselects shared by the claims pages: (label, column, option order)
+CLAIM_FILTERS = [
+    ("Select Year", 'Year', 'sorted'),
+    ("Select Month", 'Month', 'month'),
+    ("Select Quarter", 'Quarter', 'sorted'),
+    ("Select Product", 'Product', None),
+    ("Select Claim Type", 'Claim Type', 'sorted'),
+    ("Select Claim Status", 'Claim Status', None),
+    ("Select Claim Provider Type", 'Source', 'sorted'),
+    ("Select Diagnosis Code", 'ICD-10 Code', None),
+    ("Select Employer Name", 'Employer Name', 'sorted'),
+    ("Select Provider Name", 'Provider Name', 'sorted'),
+]
+
+# Integer codes of the filtered columns, per DataFrame: id(frame) -> (weak reference, {column: (codes, labels)})
+_codes = {}
+_lock = threading.Lock()
+
+
+# Function to list a filter's options in the order the sidebar shows them
+def filter_options(df, column, order=None):
+    if order == 'month':
+        return sorted(df[column].dropna().unique(), key=lambda x: month_order[x])
+    if order == 'sorted':
+        return sorted(df[column].dropna().unique())
+    return df[column].unique()
+
+
+# Function to render the sidebar multiselects of a page and collect the selections by column
+def sidebar_filters(df, spec):
+    if not spec:
+        return {}
+
+    st.sidebar.header("Filters")
+    return {
+        column: st.sidebar.multiselect(label, options=filter_options(df, column, order))
+        for label, column, order in spec
+    }
+
+
+# Function to list the Month-Year labels in period order, for the range slider
+def month_year_options(df):
+    periods = df[['Period', 'Month-Year']].drop_duplicates('Period').sort_values('Period')
+    return periods['Month-Year'].tolist()
+
+
+# Function to turn a 'Month Year' label into its period key
+def label_period(month_year):
+    month, year = month_year.split()
+    return int(year) * 12 + month_order.get(month, 0)
+
+
+# Function to keep the rows whose period falls within the selected Month-Year range
+def filter_month_year_range(df, selected_range):
+    start_month_year, end_month_year = selected_range
+    return df[df['Period'].between(label_period(start_month_year), label_period(end_month_year))]
+
+
+# Function to encode a column as integer codes, once per DataFrame.
+# Missing values get code -1.
+def column_codes(df, column):
+    with _lock:
+        entry = _codes.get(id(df))
+        if entry is None or entry[0]() is not df:
+            key = id(df)
+            entry = (weakref.ref(df, lambda _, key=key: _codes.pop(key, None)), {})
+            _codes[key] = entry
+        encoded = entry[1]
+        if column not in encoded:
+            encoded[column] = pd.factorize(df[column])
+        return encoded[column]
+
+
+# Function to build the mask of rows whose column value is one of the selected values
+def selection_mask(df, column, values):
+    codes, labels = column_codes(df, column)
+    positions = pd.Index(labels).get_indexer(pd.Index(values).dropna())
+
+    # One slot per label, plus a trailing slot that code -1 (missing) looks up
+    selected = np.zeros(len(labels) + 1, dtype=bool)
+    selected[positions[positions >= 0]] = True
+    selected[-1] = pd.isna(pd.Index(values)).any()
+    return selected[codes]
+
+
+# Function to describe the active filters for the section headers
+def describe_filters(filters, columns):
+    filter_description = ""
+    for column in columns:
+        if filters.get(column):
+            filter_description += f"{', '.join(map(str, filters[column]))} "
+    return filter_description or "All data"
+
+
+# Function to apply all sidebar selections with a single mask, so the frame is copied at most once.
+# Returns the filtered DataFrame and the description of the filters shown in the headers.
+def apply_filters(df, filters, description_columns=()):
+    mask = None
+    for column, values in filters.items():
+        if column in df.columns and values:
+            column_mask = selection_mask(df, column, values)
+            mask = column_mask if mask is None else mask & column_mask
+
+    if mask is not None:
+        df = df[mask]
+    return df, describe_filters(filters, description_columns)
@@ -9,10 +9,38 @@ from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
 from datetime import datetime
-
-
-# Centered and styled main title using inline styles
-st.markdown('''
+from charts import cached_chart, category_chart, data_version
+from collusion import MIN_EDGE_CLAIMS, provider_member_graph, provider_overlap, suspicious_clusters
+from duplicates import DUPLICATE_WINDOW_DAYS, candidate_duplicates
+from frequency import VELOCITY_DAYS, selection_top_k
+from filters import CLAIM_FILTERS, apply_filters, filter_month_year_range, month_year_options
+from fraud_features import OUTLIER_SCOPES, load_fraud_claims, outlier_column
+from outliers import OUTLIER_METHODS
+from sketches import SKETCH_ALPHA, selection_sketch, sketch_iqr_bounds, sketch_quantiles
+
+
+# Sidebar filters rendered by the dashboard for this page, with the outlier level after the product
+FILTERS = CLAIM_FILTERS[:4] + [("Select Outlier Level", 'Outlier Level', None)] + CLAIM_FILTERS[4:]
+
+# Filters shown in the section headers, in order
+DESCRIPTION_COLUMNS = ['Year', 'Claim Type', 'Product', 'Outlier Level', 'Month', 'Quarter']
+
+
+# Function to get the shared claims data with the precomputed fraud signals of each claim (outlier
+# level, z-score, amount discrepancy and provider/member frequency ranks), with the outlier level
+# measured over all claims or within the segment chosen in the sidebar. The joined frame is cached,
+# so every rerun gets the same one back.
+def prepare(data):
+    # Measure outliers over all claims or within each segment, as chosen in the sidebar
+    scope = st.sidebar.selectbox("Measure Outliers Within", OUTLIER_SCOPES)
+    method = st.sidebar.radio("Outlier Method", OUTLIER_METHODS, horizontal=True)
+    return load_fraud_claims(outlier=outlier_column(scope, method))
+
+
+# Function to render the page from the shared data and the sidebar selections
+def render(data, filters):
+    # Centered and styled main title using inline styles
+    st.markdown('''
     <style>
         .main-title {
             color: #e66c37; /* Title color */
@@ -28,51 +56,16 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-st.markdown('<h2 class="main-title">CLAIMS ANALYSIS - ABNORMALITIES</h2>', unsafe_allow_html=True)
-
-
-
-filepath_visits = "Claims.xlsx"
-sheet_name1 = "2023 claims"
-sheet_name2 = "2024 claims"
-
-# Read the Claims data
-dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
-
-# Read the visit logs
-df = pd.concat([dfc_2023, dfc_2024])
-
+    st.markdown('<h2 class="main-title">CLAIMS ANALYSIS - ABNORMALITIES</h2>', unsafe_allow_html=True)
 
-df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'], errors='coerce')
 
-df["Employer Name"] = df["Employer Name"].str.upper()
-df["Provider Name"] = df["Provider Name"].str.upper()
 
-column = 'Claim Amount'
-# Compute Q1, Q3, and IQR
-Q1 = df[column].quantile(0.25)
-Q3 = df[column].quantile(0.75)
-IQR = Q3 - Q1
+    # Work on the shared claims data passed in by the dashboard
+    df = data
+    # Inspect the merged DataFrame
 
-# Define thresholds
-mild_upper = Q3 + 1.5 * IQR
-extreme_upper = Q3 + 3 * IQR
-
-# Categorize claims
-def classify_outlier(value):
-    if value > extreme_upper:
-        return "Extreme Outlier"
-    elif value > mild_upper:
-        return "Mild Outlier"
-    else:
-        return "Normal"
-
-df['Outlier Level'] = df[column].apply(classify_outlier)
-# Inspect the merged DataFrame
-
-# Sidebar styling and logo
-st.markdown("""
+    # Sidebar styling and logo
+    st.markdown("""
     <style>
     .sidebar .sidebar-content {
         background-color: #f0f2f6;
@@ -121,88 +114,21 @@ st.markdown("""
 
 
 
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
-df = df[df['Month'].isin(month_order)]
-
-
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: pd.to_datetime(x, format='%B').month)
-
-df['Source'] =df['Source'].astype(str)
-
-df['Quarter'] = "Q" + df['Claim Created Date'].dt.quarter.astype(str)
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-quarter = st.sidebar.multiselect("Select Quarter", options=sorted(df['Quarter'].dropna().unique()))
-product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
-outlier = st.sidebar.multiselect("Select Outlier Level", options=df['Outlier Level'].unique())
-type = st.sidebar.multiselect("Select Claim Type", options=sorted(df['Claim Type'].unique()))
-status = st.sidebar.multiselect("Select Claim Status", options=df['Claim Status'].unique())
-source = st.sidebar.multiselect("Select Claim Provider Type", options=sorted(df['Source'].unique()))
-code = st.sidebar.multiselect("Select Diagnosis Code", options=df['ICD-10 Code'].unique())
-client_name = st.sidebar.multiselect("Select Employer Name", options=sorted(df['Employer Name'].dropna().unique()))
-prov_name = st.sidebar.multiselect("Select Provider Name", options=sorted(df['Provider Name'].dropna().unique()))
-
-# Apply filters to the DataFrame
-if 'Year' in df.columns and year:
-    df = df[df['Year'].isin(year)]
-if 'Month' in df.columns and month:
-    df = df[df['Month'].isin(month)]
-if 'Quarter' in df.columns and quarter:
-    df = df[df['Quarter'].isin(quarter)]
-if 'Product' in df.columns and product:
-    df = df[df['Product'].isin(product)]
-if 'Outlier Level' in df.columns and outlier:
-    df = df[df['Outlier Level'].isin(outlier)]
-if 'Claim Type' in df.columns and type:
-    df = df[df['Claim Type'].isin(type)]
-if 'Claim Status' in df.columns and status:
-    df = df[df['Claim Status'].isin(status)]
-if 'Source' in df.columns and source:
-    df = df[df['Source'].isin(source)]
-if 'ICD-10 Code' in df.columns and code:
-    df = df[df['ICD-10 Code'].isin(code)]
-if 'Employer Name' in df.columns and client_name:
-    df = df[df['Employer Name'].isin(client_name)]
-if 'Provider Name' in df.columns and prov_name:
-    df = df[df['Provider Name'].isin(prov_name)]
-
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if type:
-     filter_description += f"{', '.join(map(str, type))} "
-if product:
-     filter_description += f"{', '.join(map(str, product))} "
-if outlier:
-     filter_description += f"{', '.join(map(str, outlier))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if quarter:
-    filter_description += f"{', '.join(quarter)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Claim Created Date"].min()
-endDate = df["Claim Created Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
+
+
+    # Apply the sidebar filters and describe them for the section headers
+    df, filter_description = apply_filters(df, filters, DESCRIPTION_COLUMNS)
+
+
+
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Claim Created Date"].min()
+    endDate = df["Claim Created Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
     <style>
     .date-input-box {
         border-radius: 10px;
@@ -219,126 +145,96 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
+    # Function to display date input in styled boxes
+    def display_date_input(col, title, default_date, min_date, max_date):
+        col.markdown(f"""
         <div class="date-input-box">
             <div class="date-input-title">{title}</div>
         </div>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
-
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
+        return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
-
-
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
-
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
-
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
-
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
-
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # Extract unique month-year combinations in period order
+    month_years = month_year_options(df)
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
+    # Select slider for month-year range
+    selected_month_year_range = st.select_slider(
+        "Select Month-Year Range",
+        options=month_years,
+        value=(month_years[0], month_years[-1])
+    )
 
+    # Filter DataFrame on the precomputed period key
+    df = filter_month_year_range(df, selected_month_year_range)
 
-# Filter data by product type
-df_health = df[df['Product'] == 'Health Insurance']
-df_proactiv = df[df['Product'] == 'ProActiv']
+    # The selection the charts are drawn from, which keys them in the figure cache
+    selection = {'page': __name__, 'data': data_version(data), 'filters': filters, 'range': selected_month_year_range}
 
-# Filter data by claim status
-df_app = df[df['Claim Status'] == 'Approved']
-df_dec = df[df['Claim Status'] == 'Declined']
 
-if not df.empty:
-    scale = 1_000_000  # For millions
-    scaling = 1000  # For thousands
+    # Filter data by product type
+    df_health = df[df['Product'] == 'Health Insurance']
+    df_proactiv = df[df['Product'] == 'ProActiv']
 
-    # General Metrics
-    total_claim_amount = (df["Claim Amount"].sum()) / scale
-    average_amount = (df["Claim Amount"].mean()) / scaling
-    average_app_amount = (df["Approved Claim Amount"].mean()) / scaling
+    # Filter data by claim status
+    df_app = df[df['Claim Status'] == 'Approved']
+    df_dec = df[df['Claim Status'] == 'Declined']
 
-    total_app_claim_amount = (df_app["Approved Claim Amount"].sum()) / scale
-    total_dec_claim_amount = (df_dec["Claim Amount"].sum()) / scaling
+    if not df.empty:
+        scale = 1_000_000  # For millions
+        scaling = 1000  # For thousands
 
-    total_app = df_app["Claim ID"].nunique()
-    total_dec = df_dec["Claim ID"].nunique()
+        # General Metrics
+        total_claim_amount = (df["Claim Amount"].sum()) / scale
+        average_amount = (df["Claim Amount"].mean()) / scaling
+        average_app_amount = (df["Approved Claim Amount"].mean()) / scaling
 
-    total_clients = df["Employer Name"].nunique()
-    total_claims = df["Claim ID"].nunique()
+        total_app_claim_amount = (df_app["Approved Claim Amount"].sum()) / scale
+        total_dec_claim_amount = (df_dec["Claim Amount"].sum()) / scaling
 
-    approval_rate = (total_app / total_claims) * 100 if total_claims > 0 else 0
-    denial_rate = (total_dec / total_claims) * 100 if total_claims > 0 else 0
+        total_app = df_app["Claim ID"].nunique()
+        total_dec = df_dec["Claim ID"].nunique()
 
-    # Fraud-Specific Metrics (IQR-Based)
-    Q1 = df['Claim Amount'].quantile(0.25)
-    Q3 = df['Claim Amount'].quantile(0.75)
-    IQR = Q3 - Q1
-    mild_upper = Q3 + 1.5 * IQR
-    extreme_upper = Q3 + 3 * IQR
+        total_clients = df["Employer Name"].nunique()
+        total_claims = df["Claim ID"].nunique()
 
-    def classify_outlier(value):
-        if value > extreme_upper:
-            return "Extreme Outlier"
-        elif value > mild_upper:
-            return "Mild Outlier"
-        else:
-            return "Normal"
+        approval_rate = (total_app / total_claims) * 100 if total_claims > 0 else 0
+        denial_rate = (total_dec / total_claims) * 100 if total_claims > 0 else 0
 
-    df['Outlier Level'] = df['Claim Amount'].apply(classify_outlier)
+        # Fraud-Specific Metrics (IQR-Based), from the precomputed outlier levels
+        total_mild_outliers = (df['Outlier Level'] == 'Mild Outlier').sum()
+        total_extreme_outliers = (df['Outlier Level'] == 'Extreme Outlier').sum()
+        total_normal_outliers = (df['Outlier Level'] == 'Normal').sum()
 
-    total_mild_outliers = (df['Outlier Level'] == 'Mild Outlier').sum()
-    total_extreme_outliers = (df['Outlier Level'] == 'Extreme Outlier').sum()
-    total_normal_outliers = (df['Outlier Level'] == 'Normal').sum()
+        # Claim amount quartiles and IQR bound of the selection, merged from the per-segment sketches kept for the page data
+        amount_sketch = selection_sketch(data, df, filters, selected_month_year_range)
+        amount_quartiles = sketch_quantiles(amount_sketch, [0.25, 0.5, 0.75])['Estimate'] / scaling
+        mild_upper_bound = sketch_iqr_bounds(amount_sketch)['mild_upper'] / scaling
 
-    # High-Frequency Providers/Members
-    top_providers = df.groupby('Provider Name')['Claim ID'].count().nlargest(5).reset_index()
-    top_members = df.groupby('Member Name')['Claim ID'].count().nlargest(5).reset_index()
+        # High-Frequency Providers/Members, from the pre-aggregated claim counts, with each member's
+        # most claims within VELOCITY_DAYS
+        top_providers = selection_top_k(data, df, filters, selected_month_year_range, 'Provider Name')
+        top_members = selection_top_k(data, df, filters, selected_month_year_range, 'Member Name')
+        member_velocity = df[df['Member Name'].isin(top_members['Member Name'])].groupby('Member Name')['Member Velocity'].max()
+        top_members[f'Most Claims in {VELOCITY_DAYS} Days'] = top_members['Member Name'].map(member_velocity).to_numpy()
 
-    # Discrepancies Between Requested and Approved Amounts
-    df['Amount Discrepancy'] = abs(df['Claim Amount'] - df['Approved Claim Amount'])
-    avg_discrepancy = df['Amount Discrepancy'].mean()
-    high_discrepancy_claims = df[df['Amount Discrepancy'] > avg_discrepancy * 2]['Claim ID'].nunique()  # Claims with discrepancies > 2x average
+        # Discrepancies Between Requested and Approved Amounts (precomputed per claim)
+        avg_discrepancy = df['Amount Discrepancy'].mean()
+        high_discrepancy_claims = df[df['Amount Discrepancy'] > avg_discrepancy * 2]['Claim ID'].nunique()  # Claims with discrepancies > 2x average
 
-    # Define CSS for the styled boxes and tooltips
-    st.markdown("""
+        # Define CSS for the styled boxes and tooltips
+        st.markdown("""
         <style>
         .custom-subheader {
             color: #e66c37;
@@ -370,541 +266,499 @@ if not df.empty:
         </style>
         """, unsafe_allow_html=True)
 
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
+        # Function to display metrics in styled boxes with tooltips
+        def display_metric(col, title, value):
+            col.markdown(f"""
             <div class="metric-box">
                 <div class="metric-title">{title}</div>
                 <div class="metric-value">{value}</div>
             </div>
             """, unsafe_allow_html=True)
 
-    # Display general metrics
-    st.markdown('<h2 class="custom-subheader">General Metrics</h2>', unsafe_allow_html=True)
-    cols1, cols2, cols3 = st.columns(3)
-    display_metric(cols1, "Number of Clients", total_clients)
-    display_metric(cols2, "Number of Claims", f"{total_claims:,}")
-    display_metric(cols3, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
-    display_metric(cols1, "Approval Rate", f"{approval_rate:.2f} %")
-    display_metric(cols2, "Denial Rate", f"{denial_rate:.2f} %")
-    display_metric(cols3, "Average Claim Amount", f"{average_amount:,.1f} K")
-
-    # Display fraud-specific metrics
-    st.markdown('<h2 class="custom-subheader">Fraud Detection Metrics</h2>', unsafe_allow_html=True)
-    cols1, cols2, cols3, cols4 = st.columns(4)
-
-    display_metric(cols1, "Normal Claims", total_normal_outliers)
-    display_metric(cols2, "Mild Outliers", total_mild_outliers)
-    display_metric(cols3, "Extreme Outliers", total_extreme_outliers)
-    display_metric(cols4, "High Discrepancy Claims", high_discrepancy_claims)
-
-
-    custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#9ACBD0","#CC3636"]
-
-    col1, col2 = st.columns(2)
-
-    # Group data by Claim Created Date and Outlier Level, and count occurrences
-    outlier_count = (
-        df.groupby([df["Claim Created Date"].dt.strftime("%Y-%m-%d"), "Outlier Level"])
-        .size()
-        .reset_index(name="Count")
-    )
-
-    # Pivot the data for plotting (Outlier Level as columns)
-    pivot_outlier = outlier_count.pivot(
-        index="Claim Created Date", columns="Outlier Level", values="Count"
-    ).fillna(0)
-
-    # Sort the data by date
-    pivot_outlier = pivot_outlier.sort_index()
-
-    with col1:
-        # Create the stacked area chart
-        fig_outlier_time = go.Figure()
-
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(pivot_outlier.columns):
-            fig_outlier_time.add_trace(
-                go.Scatter(
-                    x=pivot_outlier.index,
-                    y=pivot_outlier[outlier_level],
-                    mode="lines",
-                    stackgroup="one",  # This creates a stacked area chart
-                    name=outlier_level,
-                    line=dict(width=0.5, color=custom_colors[i % len(custom_colors)]),
-                    hoverinfo="x+y+name",
-                    fillcolor=custom_colors[i % len(custom_colors)],
-                )
+        # Display general metrics
+        st.markdown('<h2 class="custom-subheader">General Metrics</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Number of Clients", total_clients)
+        display_metric(cols2, "Number of Claims", f"{total_claims:,}")
+        display_metric(cols3, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
+        display_metric(cols1, "Approval Rate", f"{approval_rate:.2f} %")
+        display_metric(cols2, "Denial Rate", f"{denial_rate:.2f} %")
+        display_metric(cols3, "Average Claim Amount", f"{average_amount:,.1f} K")
+
+        # Display fraud-specific metrics
+        st.markdown('<h2 class="custom-subheader">Fraud Detection Metrics</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3, cols4 = st.columns(4)
+
+        display_metric(cols1, "Normal Claims", total_normal_outliers)
+        display_metric(cols2, "Mild Outliers", total_mild_outliers)
+        display_metric(cols3, "Extreme Outliers", total_extreme_outliers)
+        display_metric(cols4, "High Discrepancy Claims", high_discrepancy_claims)
+
+        # Display the claim amount quartiles, estimated within the sketches' relative error
+        st.markdown(f'<h2 class="custom-subheader">Claim Amount Quartiles (± {SKETCH_ALPHA:.0%})</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3, cols4 = st.columns(4)
+
+        display_metric(cols1, "First Quartile", f"{amount_quartiles[0.25]:,.1f} K")
+        display_metric(cols2, "Median Claim Amount", f"{amount_quartiles[0.5]:,.1f} K")
+        display_metric(cols3, "Third Quartile", f"{amount_quartiles[0.75]:,.1f} K")
+        display_metric(cols4, "Mild Outlier Bound", f"{mild_upper_bound:,.1f} K")
+
+        # Display the providers and members with the most claims
+        cols1, cols2 = st.columns(2)
+        with cols1:
+            st.markdown('<h3 class="custom-subheader">High-Frequency Providers</h3>', unsafe_allow_html=True)
+            st.dataframe(top_providers, hide_index=True, use_container_width=True)
+        with cols2:
+            st.markdown('<h3 class="custom-subheader">High-Frequency Members</h3>', unsafe_allow_html=True)
+            st.dataframe(top_members, hide_index=True, use_container_width=True)
+
+        # Display the candidate duplicate claims: same member, provider and ICD-10 code, similar
+        # amounts, created within DUPLICATE_WINDOW_DAYS of each other
+        duplicate_claims = candidate_duplicates(df)
+        st.markdown('<h2 class="custom-subheader">Candidate Duplicate Claims</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Duplicate Groups", f"{duplicate_claims['Duplicate Group'].nunique():,}")
+        display_metric(cols2, "Claims in Duplicate Groups", f"{len(duplicate_claims):,}")
+        display_metric(cols3, "Amount in Duplicate Groups", f"{duplicate_claims['Claim Amount'].sum() / scaling:,.1f} K")
+        with st.expander(f"Claims grouped as likely duplicates (within {DUPLICATE_WINDOW_DAYS} days)"):
+            st.dataframe(duplicate_claims, hide_index=True, use_container_width=True)
+
+        # Display the rule-based fraud scores (rules are defined in fraud_rules.json)
+        flagged_claims = df[df['Fraud Score'] > 0].sort_values('Fraud Score', ascending=False, kind='stable')
+        st.markdown('<h2 class="custom-subheader">Rule-Based Fraud Scores</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Claims Hitting a Rule", f"{len(flagged_claims):,}")
+        display_metric(cols2, "Average Score of Flagged Claims", f"{flagged_claims['Fraud Score'].mean() if len(flagged_claims) else 0:.1f}")
+        display_metric(cols3, "Highest Score", f"{df['Fraud Score'].max():.0f}")
+        with st.expander("Highest-scoring claims"):
+            st.dataframe(
+                flagged_claims[['Claim ID', 'Member Name', 'Provider Name', 'Claim Type', 'Claim Created Date', 'Claim Amount', 'Fraud Score', 'Fraud Rules']].head(100),
+                hide_index=True, use_container_width=True
             )
 
-        # Update layout
-        fig_outlier_time.update_layout(
-            xaxis_title="Claim Created Date",
-            yaxis_title="Number of Claims",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            legend=dict(x=0, y=1.1, orientation="h"),  # Place legend above the chart
-            height=450,
+        # Display the provider-member clusters tied by repeated claims, and the providers sharing the most members
+        graph, graph_providers, graph_members = provider_member_graph(df)
+        clusters = suspicious_clusters(graph, graph_providers, graph_members)
+        overlap = provider_overlap(graph, graph_providers)
+        st.markdown('<h2 class="custom-subheader">Provider-Member Clusters</h2>', unsafe_allow_html=True)
+        cols1, cols2 = st.columns(2)
+        with cols1:
+            st.markdown(f'<h3 class="custom-subheader">Top Clusters (ties of {MIN_EDGE_CLAIMS}+ claims)</h3>', unsafe_allow_html=True)
+            st.dataframe(clusters.head(10), hide_index=True, use_container_width=True)
+        with cols2:
+            st.markdown('<h3 class="custom-subheader">Providers Sharing the Most Members</h3>', unsafe_allow_html=True)
+            st.dataframe(overlap.head(10), hide_index=True, use_container_width=True)
+
+        # Display the claims the isolation forest ranks most anomalous, next to their IQR outlier level
+        anomalous_claims = df.nlargest(20, 'Anomaly Score')
+        st.markdown('<h2 class="custom-subheader">Most Anomalous Claims</h2>', unsafe_allow_html=True)
+        st.dataframe(
+            anomalous_claims[['Claim ID', 'Provider Name', 'Claim Type', 'Source', 'Claim Amount', 'Approved Claim Amount', 'Outlier Level', 'Anomaly Score']],
+            hide_index=True, use_container_width=True
         )
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Outlier Distribution Over Time</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_outlier_time, use_container_width=True)
-
-    # Filter claims with high discrepancies
-    high_discrepancy_data = df[df["Amount Discrepancy"] > avg_discrepancy * 2]
 
-    # Group data by Provider Name to calculate total discrepancy
-    provider_discrepancy = (
-        high_discrepancy_data.groupby("Provider Name")["Amount Discrepancy"]
-        .sum()
-        .reset_index()
-    )
+        custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#9ACBD0","#CC3636"]
 
-    # Sort providers by total discrepancy
-    provider_discrepancy = provider_discrepancy.sort_values(by="Amount Discrepancy", ascending=False).head(10)
+        col1, col2 = st.columns(2)
 
-    with col2:
+        # Function to chart the outlier levels of the claims over time
+        def outliers_over_time_chart():
+            # Group data by Claim Created Date and Outlier Level, and count occurrences
+            outlier_count = (
+                df.groupby(["Claim Day", "Outlier Level"])
+                .size()
+                .reset_index(name="Count")
+                .rename(columns={"Claim Day": "Claim Created Date"})
+            )
 
-        # Create the bar chart
-        fig_discrepancy = go.Figure()
-
-        fig_discrepancy.add_trace(
-            go.Bar(
-                x=provider_discrepancy["Provider Name"],
-                y=provider_discrepancy["Amount Discrepancy"],
-                text=[f"{value / 1e3:.0f}K" for value in provider_discrepancy["Amount Discrepancy"]],
-                textposition="inside",
-                textfont=dict(color="white"),
-                hoverinfo="x+y",
-                marker_color="#009DAE",
+            # Pivot the data for plotting (Outlier Level as columns)
+            pivot_outlier = outlier_count.pivot(
+                index="Claim Created Date", columns="Outlier Level", values="Count"
+            ).fillna(0)
+
+            # Sort the data by date
+            pivot_outlier = pivot_outlier.sort_index()
+
+            # Create the stacked area chart, one area per Outlier Level
+            return category_chart(
+                pivot_outlier, "Claim Created Date", list(pivot_outlier.columns), kind="stacked area", colors=custom_colors,
+                trace=dict(line=dict(width=0.5), hoverinfo="x+y+name"),
+                xaxis_title="Claim Created Date",
+                yaxis_title="Number of Claims",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                legend=dict(x=0, y=1.1, orientation="h"),  # Place legend above the chart
+                height=450,
             )
-        )
 
-        # Update layout
-        fig_discrepancy.update_layout(
-            xaxis_title="Provider Name",
-            yaxis_title="Total Discrepancy ()",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500,
-        )
+        with col1:
+            fig_outlier_time = cached_chart(selection, 'outliers over time', outliers_over_time_chart)
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Discrepancy Between Requested and Approved Amounts</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_discrepancy, use_container_width=True)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Outlier Distribution Over Time</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_outlier_time, use_container_width=True)
 
-    # Group by Outlier Level and sum the Claim Amount
-    outlier_claim_amount = (
-        df.groupby("Outlier Level")["Claim Amount"]
-        .sum()
-        .reset_index(name="Total Claim Amount")
-    )
+        # Filter claims with high discrepancies
+        high_discrepancy_data = df[df["Amount Discrepancy"] > avg_discrepancy * 2]
 
-    # Sort by Total Claim Amount in descending order
-    outlier_claim_amount = outlier_claim_amount.sort_values(by="Total Claim Amount", ascending=False)
+        # Group data by Provider Name to calculate total discrepancy
+        provider_discrepancy = (
+            high_discrepancy_data.groupby("Provider Name")["Amount Discrepancy"]
+            .sum()
+            .reset_index()
+        )
+
+        # Sort providers by total discrepancy
+        provider_discrepancy = provider_discrepancy.sort_values(by="Amount Discrepancy", ascending=False).head(10)
 
-    cols1, cols2 = st.columns(2)
+        with col2:
 
-    with cols1:
-        # Create the bar chart for outliers by claim amount
-        fig_outlier_claim_amount = go.Figure()
+            # Create the bar chart
+            fig_discrepancy = go.Figure()
 
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(outlier_claim_amount["Outlier Level"]):
-            fig_outlier_claim_amount.add_trace(
+            fig_discrepancy.add_trace(
                 go.Bar(
-                    x=[outlier_level],  # Outlier Level as x-axis
-                    y=outlier_claim_amount.loc[outlier_claim_amount["Outlier Level"] == outlier_level, "Total Claim Amount"],
-                    name=outlier_level,
-                    text=[
-                        f"{value / 1e6:.1f}M"
-                        for value in outlier_claim_amount.loc[
-                            outlier_claim_amount["Outlier Level"] == outlier_level, "Total Claim Amount"
-                        ]
-                    ],  # Format text as X.M
+                    x=provider_discrepancy["Provider Name"],
+                    y=provider_discrepancy["Amount Discrepancy"],
+                    text=[f"{value / 1e3:.0f}K" for value in provider_discrepancy["Amount Discrepancy"]],
                     textposition="inside",
                     textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],  # Assign color based on index
+                    hoverinfo="x+y",
+                    marker_color="#009DAE",
                 )
             )
 
-        # Set layout for the Outliers by Claim Amount chart
-        fig_outlier_claim_amount.update_layout(
-            barmode="stack",  # Stacked bar chart
-            xaxis_title="Outlier Level",
-            yaxis_title="Total Claim Amount ()",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=500,
-            legend=dict(x=0, y=1.1, orientation="h"),  # Place legend above the chart
-        )
-
-        # Display the Outliers by Claim Amount chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Outliers by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_outlier_claim_amount, use_container_width=True)
-
-    # Group data by "Product" and "Outlier Level" and count the number of claims
-    product_outliers = df.groupby(['Product', 'Outlier Level'])['Claim ID'].count().unstack().fillna(0)
-    # Ensure all outlier levels are present in the columns (even if some products don't have certain levels)
-    product_outliers = product_outliers.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
-
-    with cols2:
-        fig_product_outliers = go.Figure()
-
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(product_outliers.columns):
-            fig_product_outliers.add_trace(go.Bar(
-                x=product_outliers.index,
-                y=product_outliers[outlier_level],
-                name=outlier_level,
-                text=product_outliers[outlier_level].apply(lambda x: f"{x}" if x > 0 else ""),  # Show raw count
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[i % len(custom_colors)],
-            ))
-
-        # Set layout for the Number of Claims by Product and Outlier Level chart
-        fig_product_outliers.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Product",
-            yaxis_title="Number of Claims",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
-        )
+            # Update layout
+            fig_discrepancy.update_layout(
+                xaxis_title="Provider Name",
+                yaxis_title="Total Discrepancy ()",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500,
+            )
 
-        # Display the Number of Claims by Product and Outlier Level chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Outliers by Number of Claims and Product</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_product_outliers, use_container_width=True)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Discrepancy Between Requested and Approved Amounts</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_discrepancy, use_container_width=True)
+
+        # Function to chart the claim amount of each outlier level
+        def outlier_amount_chart():
+            # Group by Outlier Level and sum the Claim Amount
+            outlier_claim_amount = (
+                df.groupby("Outlier Level")["Claim Amount"]
+                .sum()
+                .reset_index(name="Total Claim Amount")
+            )
 
+            # Sort by Total Claim Amount in descending order
+            outlier_claim_amount = outlier_claim_amount.sort_values(by="Total Claim Amount", ascending=False)
+
+            # Create the bar chart for outliers by claim amount, one bar per Outlier Level (text as X.M)
+            return category_chart(
+                outlier_claim_amount, "Outlier Level", "Total Claim Amount", color="Outlier Level", colors=custom_colors,
+                text="%.1fM", text_scale=1e6,
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode="stack",  # Stacked bar chart
+                xaxis_title="Outlier Level",
+                yaxis_title="Total Claim Amount ()",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=500,
+                legend=dict(x=0, y=1.1, orientation="h"),  # Place legend above the chart
+            )
 
-    # Group data by Month and Outlier Level to count occurrences
-    monthly_outliers = (
-        df.groupby(["Month", "Outlier Level"])["Claim ID"]
-        .count()
-        .reset_index(name="Count")
-    )
+        cols1, cols2 = st.columns(2)
+
+        with cols1:
+            fig_outlier_claim_amount = cached_chart(selection, 'claim amount by outlier level', outlier_amount_chart)
+
+            # Display the Outliers by Claim Amount chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Outliers by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_outlier_claim_amount, use_container_width=True)
+
+        # Function to chart the claims of each product per outlier level
+        def product_outliers_chart():
+            # Group data by "Product" and "Outlier Level" and count the number of claims
+            product_outliers = df.groupby(['Product', 'Outlier Level'])['Claim ID'].count().unstack().fillna(0)
+            # Ensure all outlier levels are present in the columns (even if some products don't have certain levels)
+            product_outliers = product_outliers.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
+
+            # One bar per Outlier Level, showing the raw counts
+            return category_chart(
+                product_outliers, "Product", list(product_outliers.columns), colors=custom_colors, text="%{y}",
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Product",
+                yaxis_title="Number of Claims",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
+            )
 
-    # Define the correct order of months
-    sorted_months = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
+        with cols2:
+            fig_product_outliers = cached_chart(selection, 'outliers by product', product_outliers_chart)
 
-    # Convert the 'Month' column to a categorical type with the specified order
-    monthly_outliers['Month'] = pd.Categorical(
-        monthly_outliers['Month'], categories=sorted_months, ordered=True
-    )
+            # Display the Number of Claims by Product and Outlier Level chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Outliers by Number of Claims and Product</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_product_outliers, use_container_width=True)
 
-    # Sort by the 'Month' column
-    monthly_outliers = monthly_outliers.sort_values(by="Month")
 
-    cols1, cols2 = st.columns(2)
+        # Function to chart the claims of each month per outlier level
+        def monthly_outliers_chart():
+            # Group data by Month and Outlier Level to count occurrences
+            monthly_outliers = (
+                df.groupby(["Month", "Outlier Level"])["Claim ID"]
+                .count()
+                .reset_index(name="Count")
+            )
 
-    # Create the grouped bar chart for monthly outliers
-    with cols2:
-        fig_monthly_outliers = go.Figure()
+            # Define the correct order of months
+            sorted_months = [
+                "January", "February", "March", "April", "May", "June",
+                "July", "August", "September", "October", "November", "December"
+            ]
 
-        # Add trace for each Outlier Level
-        for i, outlier_level in enumerate(monthly_outliers["Outlier Level"].unique()):
-            filtered_data = monthly_outliers[monthly_outliers["Outlier Level"] == outlier_level]
-            fig_monthly_outliers.add_trace(
-                go.Bar(
-                    x=filtered_data["Month"],
-                    y=filtered_data["Count"],
-                    name=outlier_level,
-                    text=[f"{value}" for value in filtered_data["Count"]],
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],  # Assign color based on index
-                )
+            # Convert the 'Month' column to a categorical type with the specified order
+            monthly_outliers['Month'] = pd.Categorical(
+                monthly_outliers['Month'], categories=sorted_months, ordered=True
             )
 
-        # Set layout for the chart
-        fig_monthly_outliers.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Month",
-            yaxis_title="Number of Outliers",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500,
-            legend=dict(title="Outlier Level"),
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Number of Monthly Outliers</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_monthly_outliers, use_container_width=True)
+            # Sort by the 'Month' column
+            monthly_outliers = monthly_outliers.sort_values(by="Month")
+
+            # One bar per Outlier Level
+            return category_chart(
+                monthly_outliers, "Month", "Count", color="Outlier Level", colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis_title="Number of Outliers",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500,
+                legend=dict(title="Outlier Level"),
+            )
 
-    # Group data by Year and Outlier Level to count occurrences
-    yearly_outliers = (
-        df.groupby(["Year", "Outlier Level"])["Claim ID"]
-        .count()
-        .reset_index(name="Count")
-    )
+        cols1, cols2 = st.columns(2)
 
-    # Sort by Year
-    yearly_outliers = yearly_outliers.sort_values(by="Year")
+        # Create the grouped bar chart for monthly outliers
+        with cols2:
+            fig_monthly_outliers = cached_chart(selection, 'monthly outliers', monthly_outliers_chart)
 
-    # Create the grouped bar chart for yearly outliers
-    with cols1:
-        fig_yearly_outliers = go.Figure()
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Number of Monthly Outliers</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_monthly_outliers, use_container_width=True)
 
-        # Add trace for each Outlier Level
-        for i, outlier_level in enumerate(yearly_outliers["Outlier Level"].unique()):
-            filtered_data = yearly_outliers[yearly_outliers["Outlier Level"] == outlier_level]
-            fig_yearly_outliers.add_trace(
-                go.Bar(
-                    x=filtered_data["Year"],
-                    y=filtered_data["Count"],
-                    name=outlier_level,
-                    text=[f"{value}" for value in filtered_data["Count"]],
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],  # Assign color based on index
-                )
+        # Function to chart the claims of each year per outlier level
+        def yearly_outliers_chart():
+            # Group data by Year and Outlier Level to count occurrences
+            yearly_outliers = (
+                df.groupby(["Year", "Outlier Level"])["Claim ID"]
+                .count()
+                .reset_index(name="Count")
             )
 
-        # Set layout for the chart
-        fig_yearly_outliers.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Number of Outliers",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500,
-            legend=dict(title="Outlier Level"),
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Number of Yearly Outliers</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_outliers, use_container_width=True)
-
-    col1, col2 = st.columns(2)
+            # Sort by Year
+            yearly_outliers = yearly_outliers.sort_values(by="Year")
+
+            # One bar per Outlier Level
+            return category_chart(
+                yearly_outliers, "Year", "Count", color="Outlier Level", colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Number of Outliers",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500,
+                legend=dict(title="Outlier Level"),
+            )
 
-    # Group by Claim Type and Outlier Level, then count the number of claims
-    claim_type_count = (
-        df.groupby(['Claim Type', 'Outlier Level'])['Claim ID']
-        .count()
-        .reset_index(name="Count")
-    )
+        # Create the grouped bar chart for yearly outliers
+        with cols1:
+            fig_yearly_outliers = cached_chart(selection, 'yearly outliers', yearly_outliers_chart)
 
-    # Pivot the data for plotting (Outlier Level as columns)
-    pivot_claim_type = claim_type_count.pivot(
-        index="Claim Type", columns="Outlier Level", values="Count"
-    ).fillna(0)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Number of Yearly Outliers</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_outliers, use_container_width=True)
 
-    # Ensure all outlier levels are present in the columns
-    pivot_claim_type = pivot_claim_type.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        fig_claim_type = go.Figure()
-
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(pivot_claim_type.columns):
-            fig_claim_type.add_trace(
-                go.Bar(
-                    x=pivot_claim_type.index,
-                    y=pivot_claim_type[outlier_level],
-                    name=outlier_level,
-                    text=[f"{value}" for value in pivot_claim_type[outlier_level]],  # Show raw count
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],  # Assign color based on index
-                )
+        # Function to chart the claims of each claim type per outlier level
+        def claim_type_outliers_chart():
+            # Group by Claim Type and Outlier Level, then count the number of claims
+            claim_type_count = (
+                df.groupby(['Claim Type', 'Outlier Level'])['Claim ID']
+                .count()
+                .reset_index(name="Count")
             )
 
-        # Set layout for the Claim Type chart
-        fig_claim_type.update_layout(
-            barmode='group',
-            yaxis_title="Number of Claims",
-            xaxis_title="Claim Type",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Number of Outliers by Claim Type </h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_claim_type, use_container_width=True)
- 
-
-    # Group by Source and Outlier Level, then count the number of claims
-    source_count = (
-        df.groupby(['Source', 'Outlier Level'])['Claim ID']
-        .count()
-        .reset_index(name="Count")
-    )
+            # Pivot the data for plotting (Outlier Level as columns)
+            pivot_claim_type = claim_type_count.pivot(
+                index="Claim Type", columns="Outlier Level", values="Count"
+            ).fillna(0)
+
+            # Ensure all outlier levels are present in the columns
+            pivot_claim_type = pivot_claim_type.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
+
+            # One bar per Outlier Level, showing the raw counts
+            return category_chart(
+                pivot_claim_type, "Claim Type", list(pivot_claim_type.columns), colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode='group',
+                yaxis_title="Number of Claims",
+                xaxis_title="Claim Type",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
+            )
 
-    # Pivot the data for plotting (Outlier Level as columns)
-    pivot_source = source_count.pivot(
-        index="Source", columns="Outlier Level", values="Count"
-    ).fillna(0)
+        with col1:
+            fig_claim_type = cached_chart(selection, 'outliers by claim type', claim_type_outliers_chart)
 
-    # Ensure all outlier levels are present in the columns
-    pivot_source = pivot_source.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Number of Outliers by Claim Type </h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_claim_type, use_container_width=True)
 
-    with col2:
-        fig_source = go.Figure()
 
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(pivot_source.columns):
-            fig_source.add_trace(
-                go.Bar(
-                    x=pivot_source.index,
-                    y=pivot_source[outlier_level],
-                    name=outlier_level,
-                    text=[f"{value}" for value in pivot_source[outlier_level]],  # Show raw count
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],  # Assign color based on index
-                )
+        # Function to chart the claims of each source per outlier level
+        def source_outliers_chart():
+            # Group by Source and Outlier Level, then count the number of claims
+            source_count = (
+                df.groupby(['Source', 'Outlier Level'])['Claim ID']
+                .count()
+                .reset_index(name="Count")
             )
 
-        # Set layout for the Source chart
-        fig_source.update_layout(
-            barmode='group',
-            yaxis_title="Number of Claims",
-            xaxis_title="Source",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Number of Outliers by Provider Type</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_source, use_container_width=True)
+            # Pivot the data for plotting (Outlier Level as columns)
+            pivot_source = source_count.pivot(
+                index="Source", columns="Outlier Level", values="Count"
+            ).fillna(0)
+
+            # Ensure all outlier levels are present in the columns
+            pivot_source = pivot_source.reindex(columns=["Normal", "Mild Outlier", "Extreme Outlier"], fill_value=0)
+
+            # One bar per Outlier Level, showing the raw counts
+            return category_chart(
+                pivot_source, "Source", list(pivot_source.columns), colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode='group',
+                yaxis_title="Number of Claims",
+                xaxis_title="Source",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                legend=dict(x=0, y=1.1, orientation='h')  # Place legend above the chart
+            )
 
+        with col2:
+            fig_source = cached_chart(selection, 'outliers by source', source_outliers_chart)
 
-    cols1, cols2 = st.columns(2)
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Number of Outliers by Provider Type</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_source, use_container_width=True)
 
 
-    # Group data by Provider Name and Outlier Level to count the number of claims
-    provider_outlier_count = (
-        df.groupby(["Employer Name", "Outlier Level"])["Claim ID"]
-        .count()
-        .reset_index(name="Count")
-    )
+        cols1, cols2 = st.columns(2)
 
-    # Pivot the data for plotting (Outlier Level as columns)
-    pivot_provider_outlier = provider_outlier_count.pivot(
-        index="Employer Name", columns="Outlier Level", values="Count"
-    ).fillna(0)
 
-    # Sort providers by total number of claims
-    pivot_provider_outlier["Total"] = pivot_provider_outlier.sum(axis=1)
-    pivot_provider_outlier = (
-        pivot_provider_outlier.sort_values(by="Total", ascending=False).head(10).drop(columns=["Total"])
-    )
+        # Function to chart the outlier levels of the top 10 employer groups by claim count
+        def top_employer_outliers_chart():
+            # Group data by Provider Name and Outlier Level to count the number of claims
+            provider_outlier_count = (
+                df.groupby(["Employer Name", "Outlier Level"])["Claim ID"]
+                .count()
+                .reset_index(name="Count")
+            )
 
-    with cols1:
-        fig_provider_outliers = go.Figure()
+            # Pivot the data for plotting (Outlier Level as columns)
+            pivot_provider_outlier = provider_outlier_count.pivot(
+                index="Employer Name", columns="Outlier Level", values="Count"
+            ).fillna(0)
 
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(pivot_provider_outlier.columns):
-            fig_provider_outliers.add_trace(
-                go.Bar(
-                    x=pivot_provider_outlier.index,
-                    y=pivot_provider_outlier[outlier_level],
-                    name=outlier_level,
-                    text=[f"{value}" for value in pivot_provider_outlier[outlier_level]],  # Show raw count
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],
-                )
+            # Sort providers by total number of claims
+            pivot_provider_outlier["Total"] = pivot_provider_outlier.sum(axis=1)
+            pivot_provider_outlier = (
+                pivot_provider_outlier.sort_values(by="Total", ascending=False).head(10).drop(columns=["Total"])
             )
 
-        # Set layout for the Number of Claims by Provider (Outlier Highlighted) chart
-        fig_provider_outliers.update_layout(
-            barmode="stack",  # Stacked bar chart
-            xaxis_title="Employer Name",
-            yaxis_title="Number of Claims",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=500,
-            legend=dict(x=0, y=1.1, orientation="h"),
-        )
-
-        # Display the Number of Claims by Provider (Outlier Highlighted) chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Outlier and Claim Count </h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_provider_outliers, use_container_width=True)
+            # One bar per Outlier Level, showing the raw counts
+            return category_chart(
+                pivot_provider_outlier, "Employer Name", list(pivot_provider_outlier.columns), colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode="stack",  # Stacked bar chart
+                xaxis_title="Employer Name",
+                yaxis_title="Number of Claims",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=500,
+                legend=dict(x=0, y=1.1, orientation="h"),
+            )
 
+        with cols1:
+            fig_provider_outliers = cached_chart(selection, 'top employer groups by outlier level', top_employer_outliers_chart)
 
-    # Group data by Provider Name and Outlier Level to count the number of claims
-    provider_outlier_count = (
-        df.groupby(["Provider Name", "Outlier Level"])["Claim ID"]
-        .count()
-        .reset_index(name="Count")
-    )
+            # Display the Number of Claims by Provider (Outlier Highlighted) chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Employer Groups by Outlier and Claim Count </h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_provider_outliers, use_container_width=True)
 
-    # Pivot the data for plotting (Outlier Level as columns)
-    pivot_provider_outlier = provider_outlier_count.pivot(
-        index="Provider Name", columns="Outlier Level", values="Count"
-    ).fillna(0)
 
-    # Sort providers by total number of claims
-    pivot_provider_outlier["Total"] = pivot_provider_outlier.sum(axis=1)
-    pivot_provider_outlier = (
-        pivot_provider_outlier.sort_values(by="Total", ascending=False).head(10).drop(columns=["Total"])
-    )
+        # Function to chart the outlier levels of the top 10 providers by claim count
+        def top_provider_outliers_chart():
+            # Group data by Provider Name and Outlier Level to count the number of claims
+            provider_outlier_count = (
+                df.groupby(["Provider Name", "Outlier Level"])["Claim ID"]
+                .count()
+                .reset_index(name="Count")
+            )
 
-    with cols2:
-        fig_provider_outliers = go.Figure()
+            # Pivot the data for plotting (Outlier Level as columns)
+            pivot_provider_outlier = provider_outlier_count.pivot(
+                index="Provider Name", columns="Outlier Level", values="Count"
+            ).fillna(0)
 
-        # Add traces for each Outlier Level
-        for i, outlier_level in enumerate(pivot_provider_outlier.columns):
-            fig_provider_outliers.add_trace(
-                go.Bar(
-                    x=pivot_provider_outlier.index,
-                    y=pivot_provider_outlier[outlier_level],
-                    name=outlier_level,
-                    text=[f"{value}" for value in pivot_provider_outlier[outlier_level]],  # Show raw count
-                    textposition="inside",
-                    textfont=dict(color="white"),
-                    hoverinfo="x+y+name",
-                    marker_color=custom_colors[i % len(custom_colors)],
-                )
+            # Sort providers by total number of claims
+            pivot_provider_outlier["Total"] = pivot_provider_outlier.sum(axis=1)
+            pivot_provider_outlier = (
+                pivot_provider_outlier.sort_values(by="Total", ascending=False).head(10).drop(columns=["Total"])
             )
 
-        # Set layout for the Number of Claims by Provider (Outlier Highlighted) chart
-        fig_provider_outliers.update_layout(
-            barmode="stack",  # Stacked bar chart
-            xaxis_title="Provider Name",
-            yaxis_title="Number of Claims",
-            font=dict(color="Black"),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=500,
-            legend=dict(x=0, y=1.1, orientation="h"),
-        )
+            # One bar per Outlier Level, showing the raw counts
+            return category_chart(
+                pivot_provider_outlier, "Provider Name", list(pivot_provider_outlier.columns), colors=custom_colors, text="%{y}",
+                trace=dict(textposition="inside", textfont=dict(color="white"), hoverinfo="x+y+name"),
+                barmode="stack",  # Stacked bar chart
+                xaxis_title="Provider Name",
+                yaxis_title="Number of Claims",
+                font=dict(color="Black"),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=500,
+                legend=dict(x=0, y=1.1, orientation="h"),
+            )
 
-        # Display the Number of Claims by Provider (Outlier Highlighted) chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Providers by Outlier and Claim Count </h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_provider_outliers, use_container_width=True)
+        with cols2:
+            fig_provider_outliers = cached_chart(selection, 'top providers by outlier level', top_provider_outliers_chart)
 
+            # Display the Number of Claims by Provider (Outlier Highlighted) chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Providers by Outlier and Claim Count </h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_provider_outliers, use_container_width=True)
@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+import pandas as pd
+from anomaly import anomaly_scores
+from claims_data import CLAIMS_FILE, load_claims
+from outliers import OUTLIER_METHODS, OUTLIER_SEGMENTS, classify_outliers, iqr_bounds, mad_bounds, segment_bounds
+from duplicates import duplicate_groups
+from fraud_rules import FRAUD_RULES_FILE, load_rules, score_claims
+from frequency import VELOCITY_DAYS, rolling_claim_counts
+from snapshots import SNAPSHOT_DIR, workbook_hash
+
+
+# Per-claim fraud signals added to the claims data by the fraud feature build
+FRAUD_FEATURE_COLUMNS = [
+    'Outlier Level', 'Z-Score', 'Amount Discrepancy',
+    'Provider Claim Count', 'Provider Rank', 'Member Claim Count', 'Member Rank', 'Member Velocity',
+    'Duplicate Group', 'Fraud Score', 'Fraud Rules', 'Anomaly Score',
+]
+
+# Scopes the outlier levels are measured over: the whole claims history, or each segment
+OUTLIER_SCOPES = ['All Claims'] + OUTLIER_SEGMENTS
+
+# Bump when the features' columns or logic change, so older artifacts are not reused
+FEATURES_VERSION = 10
+
+# Features loaded in this process: artifact key -> DataFrame (shared, must not be modified in place)
+_features = {}
+_lock = threading.Lock()
+
+# Claims joined with their features, for the current artifact key only: (artifact key, outlier
+# column) -> DataFrame (shared, must not be modified in place)
+_fraud_claims = {}
+
+
+# Function to name the feature column holding the outlier levels of a scope and method
+# ('Outlier Level' itself is the IQR level over all claims)
+def outlier_column(scope, method):
+    if scope == 'All Claims' and method == 'IQR':
+        return 'Outlier Level'
+    return f"Outlier Level ({scope}, {method})"
+
+
+# Function to count the claims of each value of a column and rank the values by that count
+# (1 = most claims, ties share a rank). Returns the count and rank of every claim's value.
+def frequency_ranks(values):
+    counts = values.map(values.value_counts())
+    ranks = counts.rank(method='dense', ascending=False)
+    return counts.fillna(0).astype(int), ranks.fillna(0).astype(int)
+
+
+# Function to compute the fraud signals of every claim, measured over the whole claims history.
+# Returns one row per claim, in the order of the claims.
+def build_fraud_features(claims, rules, claims_path=CLAIMS_FILE, retrain_anomalies=False):
+    amounts = claims['Claim Amount']
+    features = pd.DataFrame(index=range(len(claims)))
+
+    # IQR-based outlier level and z-score of the claim amount
+    features['Outlier Level'] = classify_outliers(amounts, iqr_bounds(amounts))
+    features['Z-Score'] = ((amounts - amounts.mean()) / amounts.std()).to_numpy()
+
+    # Discrepancy between the requested and approved amounts
+    features['Amount Discrepancy'] = (amounts - claims['Approved Claim Amount']).abs().to_numpy()
+
+    # Outlier levels measured by MAD over all claims, and by IQR and MAD within each segment
+    features[outlier_column('All Claims', 'MAD')] = classify_outliers(amounts, mad_bounds(amounts))
+    for segment in OUTLIER_SEGMENTS:
+        for method in OUTLIER_METHODS:
+            features[outlier_column(segment, method)] = classify_outliers(amounts, segment_bounds(amounts, claims[segment], method))
+
+    # How often each claim's provider and member claim
+    for name, column in [('Provider', 'Provider Name'), ('Member', 'Member Name')]:
+        counts, ranks = frequency_ranks(claims[column])
+        features[f'{name} Claim Count'] = counts.to_numpy()
+        features[f'{name} Rank'] = ranks.to_numpy()
+
+    # Claims of the same member in the VELOCITY_DAYS up to each claim
+    features['Member Velocity'] = rolling_claim_counts(claims, 'Member Name', VELOCITY_DAYS)
+
+    # Group of likely duplicate claims each claim belongs to (-1 for none)
+    features['Duplicate Group'] = duplicate_groups(claims)
+
+    # Score of each claim against the declarative fraud rules, with the rules it hits
+    frame = pd.concat([claims.reset_index(drop=True), features], axis=1)
+    scores = score_claims(frame, rules)
+    features['Fraud Score'] = scores['Fraud Score']
+    features['Fraud Rules'] = scores['Fraud Rules']
+
+    # Isolation forest anomaly score (stored by Claim ID, so only new claims are scored)
+    features['Anomaly Score'] = anomaly_scores(frame, claims_path, retrain=retrain_anomalies)
+
+    return features
+
+
+# Function to identify a features artifact by its claims workbook and fraud rules
+def features_key(claims_path=CLAIMS_FILE, rules_path=FRAUD_RULES_FILE):
+    parts = [str(FEATURES_VERSION), workbook_hash(claims_path), workbook_hash(rules_path)]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+# Function to locate the artifact file of a features key, next to the claims workbook's snapshots
+def features_path(key, claims_path=CLAIMS_FILE):
+    folder = os.path.join(os.path.dirname(os.path.abspath(claims_path)), SNAPSHOT_DIR)
+    return os.path.join(folder, f"fraud_features.{key}.parquet")
+
+
+# Function to load the fraud features of the claims. They are built and persisted once per
+# version of the claims workbook and fraud rules; later calls read the artifact (or reuse it from
+# memory, for the current versions only). Retraining the anomaly model rebuilds them.
+def load_fraud_features(claims_path=CLAIMS_FILE, rules_path=FRAUD_RULES_FILE, retrain_anomalies=False):
+    key = features_key(claims_path, rules_path)
+    with _lock:
+        if key in _features and not retrain_anomalies:
+            return _features[key]
+
+        path = features_path(key, claims_path)
+        if os.path.exists(path) and not retrain_anomalies:
+            features = pd.read_parquet(path)
+        else:
+            features = build_fraud_features(load_claims(claims_path), load_rules(rules_path), claims_path, retrain_anomalies)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            features.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+        # Features of older workbook or rules versions are dropped
+        for stale in [stale for stale in _features if stale != key]:
+            del _features[stale]
+        _features[key] = features
+        return features
+
+
+# Function to load the claims data joined with its fraud features, with 'Outlier Level' holding the
+# levels of the given outlier column. The frame shares the columns of the claims and features
+# instead of copying them, and is built once per version of the claims workbook and fraud rules
+# and per outlier column, so the caches kept per frame (filter codes, cube, sketches) serve it on
+# every rerun.
+def load_fraud_claims(claims_path=CLAIMS_FILE, rules_path=FRAUD_RULES_FILE, outlier='Outlier Level'):
+    key = (features_key(claims_path, rules_path), outlier)
+    with _lock:
+        if key in _fraud_claims:
+            return _fraud_claims[key]
+
+    claims = load_claims(claims_path)
+    features = load_fraud_features(claims_path, rules_path)
+
+    # The features are stored one row per claim, in the order of the claims data
+    columns = {column: claims[column] for column in claims.columns}
+    for column in FRAUD_FEATURE_COLUMNS:
+        columns[column] = pd.Series(features[column].to_numpy(), index=claims.index, name=column)
+    columns['Outlier Level'] = pd.Series(features[outlier].to_numpy(), index=claims.index, name='Outlier Level')
+    frame = pd.DataFrame(columns, copy=False)
+
+    with _lock:
+        # Frames of older workbook or rules versions are dropped
+        for stale in [stale for stale in _fraud_claims if stale[0] != key[0]]:
+            del _fraud_claims[stale]
+        return _fraud_claims.setdefault(key, frame)
+
+
+# Command line entry point for building the fraud features during the data refresh
+def main():
+    parser = argparse.ArgumentParser(description="Build the per-claim fraud features from the claims workbook.")
+    parser.add_argument('--retrain-anomaly-model', action='store_true',
+                        help="Retrain the anomaly model on the current claims (it is otherwise kept, and only new claims are scored)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    features = load_fraud_features(retrain_anomalies=args.retrain_anomaly_model)
+    print(f"Fraud features ({features_key()}): {len(features)} claims in {time.perf_counter() - start:.1f} s")
+    print(features['Outlier Level'].value_counts().to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import json
+import numpy as np
+import pandas as pd
+from frequency import rolling_claim_counts
+
+
+# Declarative fraud rules scored on every claim
+FRAUD_RULES_FILE = "fraud_rules.json"
+
+
+# Function to read the fraud rules (a JSON object with a "rules" list)
+def load_rules(path=FRAUD_RULES_FILE):
+    with open(path, 'r') as file:
+        return json.load(file)['rules']
+
+
+# Function to flag amounts above the threshold of their segment (or the default threshold)
+def amount_threshold_mask(frame, rule):
+    thresholds = frame[rule['by']].map(rule['thresholds']).astype(float).fillna(rule['default'])
+    return (frame[rule['column']] > thresholds).to_numpy()
+
+
+# Function to flag claims whose entity has at least 'min' claims in the rolling window of 'days'
+def window_count_mask(frame, rule):
+    return rolling_claim_counts(frame, rule['by'], rule['days']) >= rule['min']
+
+
+# Function to flag claims of the groups whose summed numerator to summed denominator ratio reaches 'min'
+def group_ratio_mask(frame, rule):
+    grouped = frame.groupby(rule['by'], sort=False)
+    ratio = grouped[rule['numerator']].transform('sum') / grouped[rule['denominator']].transform('sum')
+    return (ratio >= rule['min']).to_numpy()
+
+
+# Function to flag claims created at the weekend (if 'weekend' is set) or outside [start_hour, end_hour).
+# Creation dates without a time of day (exactly midnight) are only checked for the weekend, row by
+# row, as the sheets mix dates with and without times.
+def created_time_mask(frame, rule):
+    created = frame[rule['column']]
+    has_time = created != created.dt.normalize()
+    mask = has_time & ((created.dt.hour < rule['start_hour']) | (created.dt.hour >= rule['end_hour']))
+    if rule.get('weekend'):
+        mask |= created.dt.dayofweek >= 5
+    return mask.to_numpy()
+
+
+# Rule types: name -> function compiling a rule to a boolean mask over all claims at once
+RULE_TYPES = {
+    'amount_threshold': amount_threshold_mask,
+    'window_count': window_count_mask,
+    'group_ratio': group_ratio_mask,
+    'created_time': created_time_mask,
+}
+
+
+# Function to evaluate a rule as a boolean mask, one value per claim
+def rule_mask(frame, rule):
+    if rule['type'] not in RULE_TYPES:
+        raise ValueError(f"Unsupported fraud rule type: {rule['type']}")
+    return RULE_TYPES[rule['type']](frame, rule)
+
+
+# Function to score claims against the rules: the rule masks form a claims x rules matrix, and one
+# product with the rule weights gives every score. Returns the score and the names of the rules
+# hit ('; '-separated) of each claim, in the claims' order.
+def score_claims(frame, rules):
+    hits = np.zeros((len(frame), len(rules)), dtype=bool)
+    for position, rule in enumerate(rules):
+        hits[:, position] = rule_mask(frame, rule)
+    weights = np.array([rule.get('weight', 1) for rule in rules], dtype=float)
+
+    # Name the rules each claim hits, one vectorised append per rule
+    labels = pd.Series("", index=range(len(frame)), dtype=object)
+    for position, rule in enumerate(rules):
+        labels = labels.where(~hits[:, position], labels + rule['name'] + "; ")
+
+    return pd.DataFrame({
+        'Fraud Score': hits @ weights,
+        'Fraud Rules': labels.str[:-2].to_numpy(),
+    })
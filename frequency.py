@@ -0,0 +1,82 @@
+import heapq
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from cube import CUBE_DIMENSIONS
+from filters import apply_filters, filter_month_year_range
+
+
+# Columns whose claim frequency is indexed
+FREQUENCY_ENTITIES = ['Provider Name', 'Member Name']
+
+# Dimensions the counts are broken down by: the cube's, so the same filters are served from the index
+FREQUENCY_DIMENSIONS = CUBE_DIMENSIONS
+
+# Length of the rolling window for claim velocity, in days
+VELOCITY_DAYS = 30
+
+# Frequency indexes of the shared claims data: (id(frame), entity) -> (weak reference, index)
+_indexes = {}
+_lock = threading.Lock()
+
+
+# Function to count the claims of each entity per combination of the dimensions
+def build_frequency_index(df, entity):
+    keys = [df[column].to_numpy() for column in FREQUENCY_DIMENSIONS + [entity]]
+    counts = pd.Series(np.ones(len(df), dtype=np.int64)).groupby(keys, dropna=False).sum()
+    counts.index.names = FREQUENCY_DIMENSIONS + [entity]
+    return counts.rename('Claim Count').reset_index()
+
+
+# Function to build the frequency index of a claims DataFrame once and reuse it while the frame is alive
+def frequency_index(df, entity):
+    key = (id(df), entity)
+    with _lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    index = build_frequency_index(df, entity)
+    with _lock:
+        _indexes[key] = (weakref.ref(df, lambda _, key=key: _indexes.pop(key, None)), index)
+    return index
+
+
+# Function to pick the k entities with the most claims with a heap (ties keep the counts' order,
+# as Series.nlargest does). Returns a DataFrame of the entities and their claim counts, most first.
+def top_k(counts, k):
+    largest = heapq.nlargest(k, counts.items(), key=lambda item: item[1])
+    return pd.DataFrame(largest, columns=[counts.index.name, 'Claim Count'])
+
+
+# Function to find the k entities with the most claims in a page's current selection, from the
+# pre-aggregated counts of the claims data. As with cube.selection_cube, a filter active on a
+# column the index does not have falls back to counting the already filtered rows.
+def selection_top_k(claims, df, filters, month_year_range, entity, k=5):
+    for column, values in filters.items():
+        if values and column in df.columns and column not in FREQUENCY_DIMENSIONS:
+            return top_k(df.groupby(entity).size(), k)
+
+    index, _ = apply_filters(frequency_index(claims, entity), filters)
+    index = filter_month_year_range(index, month_year_range)
+    return top_k(index.groupby(entity)['Claim Count'].sum(), k)
+
+
+# Function to count, for every claim, the claims of the same entity created in the rolling window
+# of days ending on its creation day (the claim itself included). Claims are ordered by entity and
+# day, so each window is found with two binary searches. Returns the counts in the claims' order.
+def rolling_claim_counts(df, entity='Member Name', days=VELOCITY_DAYS):
+    codes, _ = pd.factorize(df[entity])
+    day = df['Claim Created Date'].to_numpy('datetime64[D]')
+    valid = (codes >= 0) & ~np.isnat(day)
+
+    # One sortable key per claim: the entity, then the day
+    day_number = day[valid].astype(np.int64)
+    span = day_number.max() - day_number.min() + days + 1 if valid.any() else 1
+    keys = codes[valid].astype(np.int64) * span + (day_number - (day_number.min() if valid.any() else 0))
+    ordered = np.sort(keys)
+
+    counts = np.zeros(len(df), dtype=np.int64)
+    counts[valid] = np.searchsorted(ordered, keys, side='right') - np.searchsorted(ordered, keys - (days - 1), side='left')
+    return counts
@@ -0,0 +1,548 @@
+import argparse
+import glob
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from claims_data import CLAIMS_FILE, load_claims, normalise_claims, period_key
+from snapshots import SNAPSHOT_DIR, read_sheet, workbook_hash
+
+
+# Premiums workbook and its sheets (new business and endorsements)
+PREMIUMS_FILE = "JAN-NOV 2024 GWP.xlsx"
+PREMIUM_SHEETS = ["2023", "2024"]
+
+# Columns that identify a client's cover for a product in a year
+PREMIUM_KEYS = ['Client Name', 'Product', 'Year']
+
+# Cover types that take priority within a client/product/year, lowest first
+COVER_PRIORITY = ['New', 'Renewal']
+
+# Claim columns kept in the unmatched claims report
+UNMATCHED_CLAIM_COLUMNS = ['Claim ID', 'Client Name', 'Product', 'Year', 'Claim Created Date', 'Claim Amount', 'Approved Claim Amount']
+
+# Endorsement columns kept in the rejected endorsements report
+REJECTED_ENDORSEMENT_COLUMNS = ['Client Name', 'Product', 'Year', 'Start Date', 'End Date', 'Total']
+
+# Frames that make up the loss ratio model
+MODEL_FRAMES = ['final_data', 'unmatched_claims', 'rejected_endorsements', 'claim_rows']
+
+# Claim columns the model reads, hashed per row to tell the claims a model was built from
+MODEL_CLAIM_COLUMNS = ['Claim ID', 'Employer Name', 'Product', 'Claim Created Date', 'Claim Amount', 'Approved Claim Amount']
+
+# Bump when the model's columns or logic change, so older artifacts are not reused
+MODEL_VERSION = 7
+
+# Largest number of models kept in memory, and of as-of dates whose artifacts are kept on disk
+MODEL_CACHE_SIZE = 8
+MODEL_ARTIFACT_LIMIT = 16
+
+# Models loaded in this process: artifact key -> {name: DataFrame}, least recently used first
+# (shared, must not be modified in place)
+_models = OrderedDict()
+_lock = threading.Lock()
+
+# Largest number of dates kept in the development sweep cache
+SWEEP_CACHE_SIZE = 240
+
+# Development sweeps computed in this process: (artifact key of the model, date) -> (earned premium,
+# approved claims) per row of the model's loss ratio data, least recently used first
+_sweeps = OrderedDict()
+
+
+# Function to keep the highest-priority cover rows of each client/product/year and mark them.
+# Groups with a Renewal keep only their Renewal rows, else groups with a New keep only their
+# New rows (both prioritized); groups with neither keep all rows, not prioritized.
+# Rows come back ordered by key, like the groupby-apply this replaces.
+def prioritize_covers(frame, keys=PREMIUM_KEYS):
+    df = frame.dropna(subset=keys)
+
+    # Rank each row by its cover type: -1 for other types, then New, then Renewal
+    rank = pd.Series(pd.Categorical(df['Cover Type'], categories=COVER_PRIORITY).codes, index=df.index)
+    best = rank.groupby([df[key] for key in keys]).transform('max')
+
+    keep = rank == best
+    df = df[keep].assign(Is_Prioritized=best[keep] >= 0)
+    return df.sort_values(keys, kind='stable').reset_index(drop=True)
+
+
+# Function to test, for each item, whether a window of the same client/product/year contains
+# its [start, end] interval. Windows are sorted by start date and carry the running maximum end
+# date of their key, so a single backward merge_asof per item answers the containment test
+# without materialising every item/window pair. Returns two boolean Series indexed like the
+# items: contained in a window, and having any window for its key at all.
+def contained_in_windows(items, start_column, end_column, windows, keys=PREMIUM_KEYS):
+    key_table = windows[keys].drop_duplicates().reset_index(drop=True)
+    key_table['Key ID'] = range(len(key_table))
+
+    spans = pd.merge(windows.dropna(subset=['Start Date']), key_table, on=keys)
+    spans = spans.rename(columns={'Start Date': 'Window Start', 'End Date': 'Window End'})
+    spans = spans.sort_values(['Key ID', 'Window Start'], kind='stable')
+    spans['Window Reach'] = spans.groupby('Key ID')['Window End'].cummax()
+    spans = spans[['Key ID', 'Window Start', 'Window Reach']].sort_values('Window Start', kind='stable')
+
+    # Probe rows are numbered by position, as the items' index may repeat (e.g. concatenated sheets)
+    probe = pd.DataFrame({
+        'Item Start': items[start_column].to_numpy(),
+        'Item End': items[end_column].to_numpy(),
+        'Position': np.arange(len(items)),
+    })
+    probe['Key ID'] = pd.merge(items[keys], key_table, on=keys, how='left')['Key ID'].to_numpy()
+    has_key = probe['Key ID'].notna().to_numpy()
+
+    probe = probe[has_key].dropna(subset=['Item Start', 'Item End'])
+    probe['Key ID'] = probe['Key ID'].astype(key_table['Key ID'].dtype)
+    matched = pd.merge_asof(
+        probe.sort_values('Item Start', kind='stable'), spans,
+        left_on='Item Start', right_on='Window Start', by='Key ID', direction='backward'
+    )
+
+    contained = np.zeros(len(items), dtype=bool)
+    contained[matched.loc[matched['Window Reach'] >= matched['Item End'], 'Position'].to_numpy()] = True
+    return pd.Series(contained, index=items.index), pd.Series(has_key, index=items.index)
+
+
+# Function to compute the time-based premium metrics and loss ratio of each premium row.
+# Only prioritized rows (Renewal or New cover) earn premium and carry claims; the other
+# rows are zeroed, as are covers starting after the as-of date. Divisions by a zero cover
+# length or a zero earned premium give 0.
+def compute_loss_ratios(frame, as_of):
+    df = frame.copy()
+    prioritized = df['Is_Prioritized'].astype(bool)
+
+    df['Days Since Start'] = (as_of - df['Start Date']).dt.days.clip(lower=0).where(prioritized, 0)
+    df['days_on_cover'] = (df['End Date'] - df['Start Date']).dt.days.where(prioritized, 0)
+
+    # Calculate Earned Premium for each row
+    earns = prioritized & (df['days_on_cover'] != 0)
+    df['Earned Premium'] = (df['Total Premium'] * df['Days Since Start'] / df['days_on_cover']).where(earns, 0)
+
+    has_earned = prioritized & (df['Earned Premium'] != 0)
+    df['Loss Ratio Rate'] = (df['Approved Claims'] / df['Earned Premium'] * 100).where(has_earned, 0)
+
+    # Set claims metrics to 0 for non-prioritized rows
+    for column in ['Number of Claims', 'Total Claims', 'Approved Claims']:
+        df[column] = df[column].where(prioritized, 0)
+
+    return df
+
+
+# Function to read the premium sheets into a single DataFrame keyed like the claims
+def read_premiums(path=PREMIUMS_FILE):
+    df_premiums = pd.concat([read_sheet(path, sheet_name) for sheet_name in PREMIUM_SHEETS])
+
+    # Standardize date formats
+    df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
+    df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
+
+    # Upper-case client names to match the normalised claims data
+    df_premiums['Client Name'] = df_premiums['Client Name'].str.upper()
+
+    # Add 'Month' and 'Year' columns
+    df_premiums['Month'] = df_premiums['Start Date'].dt.strftime('%B')
+    df_premiums['Year'] = df_premiums['Start Date'].dt.year
+    return df_premiums
+
+
+# Function to keep the claims created on or before the as-of date (claims without a date are kept,
+# and reported as unmatched)
+def claims_as_of(claims, as_of):
+    return claims[~(claims['Claim Created Date'] >= as_of + pd.Timedelta(days=1))]
+
+
+# Function to key the claims like the premiums: client name, and month and year of creation
+def prepare_claims(claims):
+    # Rename 'Employer Name' for consistency with the premiums
+    df_claims = claims.rename(columns={'Employer Name': 'Client Name'})
+    df_claims['Month'] = df_claims['Claim Created Date'].dt.strftime('%B')
+    df_claims['Year'] = df_claims['Claim Created Date'].dt.year
+    return df_claims
+
+
+# Function to match claims to the cover windows of the prioritized premiums and aggregate them
+# per client/product/year. Returns the aggregates and the claims outside every cover window.
+def aggregate_claims(df_claims, premiums_prioritized):
+    # A claim counts once, even where windows of the same client/product/year overlap
+    covered, has_cover = contained_in_windows(
+        df_claims, 'Claim Created Date', 'Claim Created Date', premiums_prioritized
+    )
+    claims_within_range = df_claims[covered]
+
+    # Keep the claims outside every cover window, with the reason, for review
+    unmatched_claims = df_claims.loc[~covered, UNMATCHED_CLAIM_COLUMNS].assign(
+        Reason=np.where(has_cover[~covered], "Outside cover window", "No prioritized cover")
+    ).reset_index(drop=True)
+
+    # Aggregate claims by client-product-year
+    claims_aggregated = claims_within_range.groupby(PREMIUM_KEYS).agg({
+        'Claim ID': 'count',  # Number of claims
+        'Claim Amount': 'sum',  # Total claim amount
+        'Approved Claim Amount': 'sum'  # Approved claim amount (if available)
+    }).reset_index().rename(columns={
+        'Claim ID': 'Number of Claims',
+        'Claim Amount': 'Total Claims',
+        'Approved Claim Amount': 'Approved Claims'
+    })
+    return claims_aggregated, unmatched_claims
+
+
+# Function to hash each claim row on the columns the model reads, in the claims' order
+def claim_row_hashes(claims):
+    return pd.DataFrame({'Row Hash': pd.util.hash_pandas_object(claims[MODEL_CLAIM_COLUMNS], index=False).to_numpy()})
+
+
+# Function to run the premium/claims join pipeline and compute the loss ratio of every premium row.
+# Returns the model's frames: the loss ratio data, the claims left outside every cover window
+# and the endorsements rejected for falling outside every policy window, and the hashes of the
+# claim rows it was built from.
+def build_loss_ratio_model(df_premiums, claims, as_of):
+    df_claims = prepare_claims(claims_as_of(claims, as_of))
+
+    # Filter endorsements, before prioritization drops them from the client/product/years with a policy
+    premiums = df_premiums.dropna(subset=PREMIUM_KEYS)
+    endorsements = premiums[premiums['Cover Type'] == 'Endorsement']
+
+    # Valid endorsements fall within the period of a policy (Renewal or New);
+    # an endorsement counts once, even where policy windows overlap
+    policies = premiums[premiums['Cover Type'].isin(COVER_PRIORITY)]
+    valid, has_policy = contained_in_windows(endorsements, 'Start Date', 'End Date', policies)
+    valid_endorsements = endorsements[valid]
+
+    # Keep the rejected endorsements, with the reason, for review
+    rejected_endorsements = endorsements.loc[~valid, REJECTED_ENDORSEMENT_COLUMNS].assign(
+        Reason=np.where(has_policy[~valid], "Outside policy window", "No policy for client/product/year")
+    ).reset_index(drop=True)
+
+    # Aggregate endorsement premiums
+    endorsement_grouped = valid_endorsements.groupby(PREMIUM_KEYS).agg({
+        'Total': 'sum'
+    }).reset_index().rename(columns={'Total': 'Endorsement Premium'})
+
+    # Apply prioritization and marking to the covers, then merge endorsement premiums back into them
+    premiums_grouped = prioritize_covers(premiums)
+    final_premiums = pd.merge(premiums_grouped, endorsement_grouped, on=PREMIUM_KEYS, how='left')
+
+    # A client/product/year's endorsements add to its premium once, on its first cover row, even
+    # where it has several (e.g. a duplicated Renewal row)
+    repeated = final_premiums.duplicated(PREMIUM_KEYS)
+    final_premiums['Endorsement Premium'] = final_premiums['Endorsement Premium'].where(~repeated)
+
+    # Calculate total premium (base + endorsements)
+    final_premiums['Total Premium'] = final_premiums['Total'] + final_premiums['Endorsement Premium'].fillna(0)
+
+    # Add 'Month' column
+    final_premiums['Month'] = final_premiums['Start Date'].dt.strftime('%B')
+
+    # Compute time-based metrics
+    client_product_data = final_premiums.groupby(PREMIUM_KEYS).agg({
+        'Start Date': 'min',
+        'End Date': 'max',
+        'Total Premium': 'sum'
+    }).reset_index()
+
+    client_product_data['Days Since Start'] = (as_of - client_product_data['Start Date']).dt.days
+    client_product_data['days_on_cover'] = (client_product_data['End Date'] - client_product_data['Start Date']).dt.days
+    client_product_data['Earned Premium'] = (
+        client_product_data['Total Premium'] *
+        client_product_data['Days Since Start'] /
+        client_product_data['days_on_cover']
+    )
+
+    # Merge earned premium calculations
+    premiums_with_earned = pd.merge(
+        final_premiums,
+        client_product_data[PREMIUM_KEYS + ['Days Since Start', 'days_on_cover', 'Earned Premium']],
+        on=PREMIUM_KEYS,
+        how='left'
+    )
+
+    # Final premium DataFrame
+    premiums_final = premiums_with_earned[
+        ['Client Name', 'Product', 'Year', 'Start Date', 'End Date', 'Month', 'Total Premium',
+         'Endorsement Premium', 'Cover Type', 'Is_Prioritized', 'Days Since Start', 'days_on_cover', 'Earned Premium']
+    ]
+
+    # Filter only prioritized rows for claims matching
+    premiums_prioritized = premiums_final[premiums_final['Is_Prioritized']].reset_index(drop=True)
+
+    # Match each claim to the cover windows of the prioritized premiums and aggregate them
+    claims_aggregated, unmatched_claims = aggregate_claims(df_claims, premiums_prioritized)
+
+    # Merge claims with premiums (outer join to include all premiums, even without claims)
+    final_data = pd.merge(premiums_final, claims_aggregated, on=PREMIUM_KEYS, how='outer')
+
+    # Fill missing values (e.g., no claims for some clients/products)
+    final_data['Number of Claims'] = final_data['Number of Claims'].fillna(0).astype(int)
+    final_data['Total Claims'] = final_data['Total Claims'].fillna(0)
+    final_data['Approved Claims'] = final_data['Approved Claims'].fillna(0)
+
+    return {
+        'final_data': finish_loss_ratio_data(final_data, as_of),
+        'unmatched_claims': unmatched_claims,
+        'rejected_endorsements': rejected_endorsements,
+        'claim_rows': claim_row_hashes(claims),
+    }
+
+
+# Function to add the page's filter columns and the per-row loss ratios to the joined data
+def finish_loss_ratio_data(final_data, as_of):
+    df = final_data.copy()
+    df['Client Name'] = df['Client Name'].astype(str).str.upper()
+    df['Quarter'] = "Q" + df['Start Date'].dt.quarter.astype(str)
+
+    # Handle non-finite values in the 'Year' and 'Month' columns
+    df['Year'] = df['Year'].fillna(0).astype(int)
+    df['Month'] = df['Month'].fillna('Unknown')
+
+    # Create a 'Month-Year' column and its period key
+    df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    df['Period'] = period_key(df['Month'], df['Year'])
+
+    # Re-mark prioritized rows now that claims-only rows have joined, then compute the loss ratios
+    return compute_loss_ratios(prioritize_covers(df), as_of)
+
+
+# Function to fold newly arrived claims (appended sheet rows or a delta file) into a built model.
+# Only the prioritized rows of the client/product/years the new claims fall in are touched: their
+# claim totals grow by the new claims' aggregates and their loss ratio is recomputed. The result
+# matches a full rebuild, at the model's as-of date, over the old claims followed by the new ones.
+def update_loss_ratio_model(model, new_claims, as_of):
+    final_data = model['final_data']
+    prioritized = final_data['Is_Prioritized'].astype(bool).to_numpy()
+    df_claims = prepare_claims(claims_as_of(new_claims, as_of))
+    claims_aggregated, unmatched_claims = aggregate_claims(df_claims, final_data[prioritized])
+
+    # Line the new aggregates up with the model rows (a left merge keeps the rows' order)
+    delta = pd.merge(final_data[PREMIUM_KEYS], claims_aggregated, on=PREMIUM_KEYS, how='left')
+    affected = prioritized & delta['Number of Claims'].notna().to_numpy()
+
+    df = final_data.copy()
+    df.loc[affected, 'Number of Claims'] += delta.loc[affected, 'Number of Claims'].astype(int).to_numpy()
+    for column in ['Total Claims', 'Approved Claims']:
+        df.loc[affected, column] += delta.loc[affected, column].to_numpy()
+
+    # Recompute the loss ratio of the affected rows, as compute_loss_ratios does
+    earned = df.loc[affected, 'Earned Premium']
+    df.loc[affected, 'Loss Ratio Rate'] = (df.loc[affected, 'Approved Claims'] / earned * 100).where(earned != 0, 0)
+
+    return {
+        **model,
+        'final_data': df,
+        'unmatched_claims': pd.concat([model['unmatched_claims'], unmatched_claims], ignore_index=True),
+        'claim_rows': pd.concat([model['claim_rows'], claim_row_hashes(new_claims)], ignore_index=True),
+    }
+
+
+# Function to fold the claims appended since a model was built into it: the model's claim rows
+# must be the first rows of the claims, and the rows after them are folded in. Returns None when
+# they are not (claims were edited or removed), as the model must then be rebuilt.
+def fold_appended_claims(model, claims, as_of):
+    known = model['claim_rows']['Row Hash'].to_numpy()
+    hashes = claim_row_hashes(claims)['Row Hash'].to_numpy()
+    if len(hashes) < len(known) or not np.array_equal(hashes[:len(known)], known):
+        return None
+    return update_loss_ratio_model(model, claims.iloc[len(known):], as_of)
+
+
+# Function to identify the premiums side of a model artifact: the model version, the premiums
+# workbook and the as-of date. Models of one premiums key are updated as claims arrive.
+def premiums_key(as_of, premiums_path=PREMIUMS_FILE):
+    parts = [str(MODEL_VERSION), workbook_hash(premiums_path), as_of.strftime('%Y-%m-%d')]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+# Function to identify a model artifact by its input workbooks and as-of date
+def model_key(as_of, premiums_path=PREMIUMS_FILE, claims_path=CLAIMS_FILE):
+    return f"{premiums_key(as_of, premiums_path)}.{workbook_hash(claims_path)[:16]}"
+
+
+# Function to locate the artifact files of a model key, next to the premiums workbook's snapshots
+def model_paths(key, premiums_path=PREMIUMS_FILE):
+    folder = os.path.join(os.path.dirname(os.path.abspath(premiums_path)), SNAPSHOT_DIR)
+    return {name: os.path.join(folder, f"loss_ratio.{key}.{name}.parquet") for name in MODEL_FRAMES}
+
+
+# Function to read the artifact of a model key, or None if it has not been written. Reading it
+# marks it as recently used, so it outlives older artifacts (see save_loss_ratio_model).
+def read_loss_ratio_model(key, premiums_path=PREMIUMS_FILE):
+    paths = model_paths(key, premiums_path)
+    if not all(os.path.exists(path) for path in paths.values()):
+        return None
+    os.utime(paths['claim_rows'])
+    return {name: pd.read_parquet(path) for name, path in paths.items()}
+
+
+# Function to persist a model as the current artifact of its premiums key. The artifacts of
+# earlier claims versions of the key are removed, as are those of the least recently written
+# premiums keys (older as-of dates or workbook versions) beyond MODEL_ARTIFACT_LIMIT.
+def save_loss_ratio_model(model, key, premiums_path=PREMIUMS_FILE):
+    paths = model_paths(key, premiums_path)
+    for name, path in paths.items():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        model[name].to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    current = set(paths.values())
+    for pattern in model_paths(key.split('.')[0] + '.*', premiums_path).values():
+        for stale in glob.glob(pattern):
+            if stale not in current:
+                os.remove(stale)
+
+    artifacts = sorted(glob.glob(model_paths('*', premiums_path)['claim_rows']), key=os.path.getmtime, reverse=True)
+    for artifact in artifacts[MODEL_ARTIFACT_LIMIT:]:
+        stale_key = ".".join(os.path.basename(artifact).split('.')[1:3])
+        for stale in model_paths(stale_key, premiums_path).values():
+            if os.path.exists(stale):
+                os.remove(stale)
+
+
+# Function to find the artifact of an earlier claims version of a premiums key, if any
+def previous_loss_ratio_model(as_of, premiums_path=PREMIUMS_FILE):
+    pattern = model_paths(premiums_key(as_of, premiums_path) + '.*', premiums_path)['claim_rows']
+    for path in glob.glob(pattern):
+        key = ".".join(os.path.basename(path).split('.')[1:3])
+        model = read_loss_ratio_model(key, premiums_path)
+        if model is not None:
+            return model
+    return None
+
+
+# Function to load the loss ratio model for an as-of date. It is built and persisted once per
+# version of the premiums workbook; when claims are appended to the claims workbook, the new rows
+# are folded into the previous model (see fold_appended_claims) and it is saved as the current
+# artifact. Later calls read the artifact (or reuse it from memory, up to MODEL_CACHE_SIZE models).
+# The model is read or built outside the lock, so other dates are served meanwhile.
+def load_loss_ratio_model(as_of, premiums_path=PREMIUMS_FILE, claims_path=CLAIMS_FILE):
+    as_of = pd.Timestamp(as_of).normalize()
+    key = model_key(as_of, premiums_path, claims_path)
+    with _lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key]
+
+    model = read_loss_ratio_model(key, premiums_path)
+    if model is None:
+        claims = load_claims(claims_path)
+        previous = previous_loss_ratio_model(as_of, premiums_path)
+        if previous is not None:
+            model = fold_appended_claims(previous, claims, as_of)
+        if model is None:
+            model = build_loss_ratio_model(read_premiums(premiums_path), claims, as_of)
+        save_loss_ratio_model(model, key, premiums_path)
+
+    with _lock:
+        return cache_loss_ratio_model(key, model)
+
+
+# Function to keep a model in memory as the most recently used, dropping the least recently used
+# beyond MODEL_CACHE_SIZE. A model another thread cached first is kept. Call with the lock held.
+def cache_loss_ratio_model(key, model):
+    model = _models.setdefault(key, model)
+    _models.move_to_end(key)
+    while len(_models) > MODEL_CACHE_SIZE:
+        _models.popitem(last=False)
+    return model
+
+
+# Function to list the month-end dates from the month of the first date up to the as-of date,
+# ending with the as-of date itself
+def month_ends(first_date, as_of):
+    dates = pd.period_range(first_date, as_of, freq='M').to_timestamp(how='end').normalize()
+    return dates[dates < as_of].append(pd.DatetimeIndex([as_of]))
+
+
+# Function to compute the earned premium and approved claims of every loss ratio row at each of
+# the given dates in one pass: earned premium is a rows x dates matrix of elapsed cover days, and
+# the approved claims are cumulated per client/product/year over the dates the claims fall before.
+# Each column matches the 'Earned Premium' and 'Approved Claims' of the model built at that date.
+def sweep_loss_ratios(final_data, claims, dates):
+    dates = pd.DatetimeIndex(dates)
+    prioritized = final_data['Is_Prioritized'].astype(bool).to_numpy()
+
+    # Earned premium of each row at each date, zero before the cover starts
+    start = final_data['Start Date'].to_numpy('datetime64[D]')
+    days_on_cover = (final_data['End Date'].to_numpy('datetime64[D]') - start).astype(float)
+    elapsed = (dates.to_numpy('datetime64[D]')[None, :] - start[:, None]).astype(float).clip(min=0)
+    earns = prioritized & (days_on_cover != 0)
+    rate = np.divide(final_data['Total Premium'].to_numpy(float), days_on_cover, where=earns, out=np.zeros(len(final_data)))
+    earned = np.nan_to_num(rate[:, None] * elapsed)
+
+    # Approved claims of each client/product/year, cumulated over the dates
+    windows = final_data[prioritized]
+    df_claims = prepare_claims(claims)
+    covered, _ = contained_in_windows(df_claims, 'Claim Created Date', 'Claim Created Date', windows)
+    df_claims = df_claims[covered]
+
+    key_table = windows[PREMIUM_KEYS].drop_duplicates().reset_index(drop=True)
+    key_table['Key ID'] = range(len(key_table))
+    claim_keys = pd.merge(df_claims[PREMIUM_KEYS], key_table, on=PREMIUM_KEYS, how='left')['Key ID'].to_numpy()
+    claim_dates = np.searchsorted(dates.to_numpy('datetime64[D]'), df_claims['Claim Created Date'].to_numpy('datetime64[D]'))
+    in_sweep = claim_dates < len(dates)
+
+    approved_by_key = np.zeros((len(key_table), len(dates)))
+    np.add.at(approved_by_key, (claim_keys[in_sweep], claim_dates[in_sweep]),
+              df_claims['Approved Claim Amount'].fillna(0).to_numpy(float)[in_sweep])
+    approved_by_key = approved_by_key.cumsum(axis=1)
+
+    row_keys = pd.merge(final_data[PREMIUM_KEYS], key_table, on=PREMIUM_KEYS, how='left')['Key ID'].to_numpy()
+    approved = np.zeros((len(final_data), len(dates)))
+    approved[prioritized] = approved_by_key[row_keys[prioritized].astype(int)]
+    return earned, approved
+
+
+# Function to load the loss ratio development of the loss ratio data of the model as of a date
+# over a series of dates: per-row earned premium and approved claims, one column per date,
+# computed in one sweep for the dates not seen before. The columns are cached per model (its
+# artifact key covers the workbook versions, MODEL_VERSION and its as-of date) and date.
+def load_loss_ratio_development(final_data, as_of, dates, premiums_path=PREMIUMS_FILE, claims_path=CLAIMS_FILE):
+    dates = pd.DatetimeIndex(dates).normalize()
+    model = model_key(pd.Timestamp(as_of).normalize(), premiums_path, claims_path)
+    keys = [(model, date) for date in dates]
+    with _lock:
+        cached = {key: _sweeps[key] for key in keys if key in _sweeps}
+        for key in cached:
+            _sweeps.move_to_end(key)
+
+        missing = [key for key in keys if key not in cached]
+        if missing:
+            earned, approved = sweep_loss_ratios(final_data, load_claims(claims_path), [date for _, date in missing])
+            for i, key in enumerate(missing):
+                cached[key] = _sweeps[key] = (earned[:, i], approved[:, i])
+            while len(_sweeps) > SWEEP_CACHE_SIZE:
+                _sweeps.popitem(last=False)
+        columns = [cached[key] for key in keys]
+
+    earned = pd.DataFrame({date: column[0] for date, column in zip(dates, columns)}, index=final_data.index)
+    approved = pd.DataFrame({date: column[1] for date, column in zip(dates, columns)}, index=final_data.index)
+    return earned, approved
+
+
+# Command line entry point for building the loss ratio model during the data refresh
+def main():
+    parser = argparse.ArgumentParser(description="Build the loss ratio model from the premiums and claims workbooks.")
+    parser.add_argument('--as-of', default=None, help="As-of date for earned premium (default: today)")
+    parser.add_argument('--delta', default=None, help="Workbook of new claims to fold into the model and save")
+    args = parser.parse_args()
+
+    as_of = pd.Timestamp(args.as_of or pd.Timestamp.now()).normalize()
+    key = model_key(as_of)
+    model = load_loss_ratio_model(as_of)
+    if args.delta:
+        # Fold the delta's claims the model has not seen, and save it as the current artifact
+        delta = normalise_claims(read_sheet(args.delta))
+        delta = delta[~claim_row_hashes(delta)['Row Hash'].isin(model['claim_rows']['Row Hash']).to_numpy()]
+        model = update_loss_ratio_model(model, delta, as_of)
+        save_loss_ratio_model(model, key)
+        with _lock:
+            _models.pop(key, None)
+            cache_loss_ratio_model(key, model)
+    print(f"Loss ratio model as of {as_of:%Y-%m-%d} ({key}):")
+    for name, frame in model.items():
+        print(f"  {name}: {len(frame)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import numpy as np
+
+
+# Outlier levels, from least to most unusual
+OUTLIER_LEVELS = ["Normal", "Mild Outlier", "Extreme Outlier"]
+
+# Columns outliers can be measured within, besides the whole claims history
+OUTLIER_SEGMENTS = ['Claim Type', 'Product', 'ICD-10 Code', 'Provider Name']
+
+# Robust spread measures the bounds can be based on
+OUTLIER_METHODS = ['IQR', 'MAD']
+
+# Scaled-MAD multiples (robust z-scores) beyond which a value is a mild or extreme outlier
+MAD_MILD, MAD_EXTREME = 3, 5
+
+# Segments with fewer claims than this are measured against the bounds of all claims
+MIN_SEGMENT_SIZE = 20
+
+
+# Function to compute the IQR-based mild and extreme outlier bounds of a column
+def iqr_bounds(values):
+    Q1, Q3 = values.quantile([0.25, 0.75])
+    IQR = Q3 - Q1
+    return {
+        'mild_lower': Q1 - 1.5 * IQR,
+        'mild_upper': Q3 + 1.5 * IQR,
+        'extreme_lower': Q1 - 3 * IQR,
+        'extreme_upper': Q3 + 3 * IQR,
+    }
+
+
+# Function to compute the MAD-based mild and extreme outlier bounds of a column: the median
+# plus or minus a multiple of the median absolute deviation, scaled to match a normal spread
+def mad_bounds(values):
+    median = values.median()
+    spread = 1.4826 * (values - median).abs().median()
+    return {
+        'mild_lower': median - MAD_MILD * spread,
+        'mild_upper': median + MAD_MILD * spread,
+        'extreme_lower': median - MAD_EXTREME * spread,
+        'extreme_upper': median + MAD_EXTREME * spread,
+    }
+
+
+# Function to compute the IQR or MAD outlier bounds of each value within its segment, with
+# groupby-transform passes over all segments at once. Returns the bounds as Series aligned with
+# the values; segments smaller than MIN_SEGMENT_SIZE, or without spread (where every value above
+# the middle would be an outlier), get the bounds of all values.
+def segment_bounds(values, segments, method='IQR'):
+    grouped = values.groupby(segments, dropna=False, sort=False)
+    if method == 'IQR':
+        Q1 = grouped.transform('quantile', 0.25)
+        Q3 = grouped.transform('quantile', 0.75)
+        spread = Q3 - Q1
+        low, high, mild, extreme = Q1, Q3, 1.5 * spread, 3 * spread
+        overall = iqr_bounds(values)
+    else:
+        median = grouped.transform('median')
+        spread = 1.4826 * (values - median).abs().groupby(segments, dropna=False, sort=False).transform('median')
+        low, high, mild, extreme = median, median, MAD_MILD * spread, MAD_EXTREME * spread
+        overall = mad_bounds(values)
+
+    bounds = {
+        'mild_lower': low - mild,
+        'mild_upper': high + mild,
+        'extreme_lower': low - extreme,
+        'extreme_upper': high + extreme,
+    }
+    measured = (grouped.transform('size') >= MIN_SEGMENT_SIZE) & (spread > 0)
+    return {name: bound.where(measured, overall[name]) for name, bound in bounds.items()}
+
+
+# Function to label each value with its outlier level against the upper bounds.
+# Missing values count as normal.
+def classify_outliers(values, bounds):
+    return np.select(
+        [values > bounds['extreme_upper'], values > bounds['mild_upper']],
+        [OUTLIER_LEVELS[2], OUTLIER_LEVELS[1]],
+        default=OUTLIER_LEVELS[0],
+    ).astype(object)
+
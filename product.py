@@ -9,10 +9,23 @@ from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
 from datetime import datetime
+from aggregations import count_and_sum
+from charts import cached_chart, category_chart, data_version, dual_axis_chart
+from claims_data import INTERNAL_COLUMNS
+from cube import rollup, selection_cube
+from filters import CLAIM_FILTERS, apply_filters, filter_month_year_range, month_year_options
 
 
-# Centered and styled main title using inline styles
-st.markdown('''
+# Sidebar filters rendered by the dashboard for this page
+FILTERS = CLAIM_FILTERS
+
+# Filters shown in the section headers, in order
+DESCRIPTION_COLUMNS = ['Year', 'Claim Type', 'Product', 'Month', 'Quarter']
+
+# Function to render the page from the shared data and the sidebar selections
+def render(data, filters):
+    # Centered and styled main title using inline styles
+    st.markdown('''
     <style>
         .main-title {
             color: #e66c37; /* Title color */
@@ -28,31 +41,17 @@ st.markdown('''
     </style>
 ''', unsafe_allow_html=True)
 
-st.markdown('<h1 class="main-title">ClAIMS ANALYSIS - PRODUCT VIEW</h1>', unsafe_allow_html=True)
-
-
-
-filepath_visits = "Claims.xlsx"
-sheet_name1 = "2023 claims"
-sheet_name2 = "2024 claims"
-
-# Read the Claims data
-dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
+    st.markdown('<h1 class="main-title">ClAIMS ANALYSIS - PRODUCT VIEW</h1>', unsafe_allow_html=True)
 
-# Read the visit logs
-df = pd.concat([dfc_2023, dfc_2024])
 
 
-df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'], errors='coerce')
+    # Work on the shared claims data passed in by the dashboard
+    df = data
 
-df["Employer Name"] = df["Employer Name"].str.upper()
-df["Provider Name"] = df["Provider Name"].str.upper()
+    # Inspect the merged DataFrame
 
-# Inspect the merged DataFrame
-
-# Sidebar styling and logo
-st.markdown("""
+    # Sidebar styling and logo
+    st.markdown("""
     <style>
     .sidebar .sidebar-content {
         background-color: #f0f2f6;
@@ -101,80 +100,19 @@ st.markdown("""
 
 
 
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
-df = df[df['Month'].isin(month_order)]
-
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: pd.to_datetime(x, format='%B').month)
-df['Source'] =df['Source'].astype(str)
-
-df['Quarter'] = "Q" + df['Claim Created Date'].dt.quarter.astype(str)
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-quarter = st.sidebar.multiselect("Select Quarter", options=sorted(df['Quarter'].dropna().unique()))
-product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
-type = st.sidebar.multiselect("Select Claim Type", options=sorted(df['Claim Type'].unique()))
-status = st.sidebar.multiselect("Select Claim Status", options=df['Claim Status'].unique())
-source = st.sidebar.multiselect("Select Claim Provider Type", options=sorted(df['Source'].unique()))
-code = st.sidebar.multiselect("Select Diagnosis Code", options=df['ICD-10 Code'].unique())
-client_name = st.sidebar.multiselect("Select Employer Name", options=sorted(df['Employer Name'].dropna().unique()))
-prov_name = st.sidebar.multiselect("Select Provider Name", options=sorted(df['Provider Name'].dropna().unique()))
-
-# Apply filters to the DataFrame
-if 'Year' in df.columns and year:
-    df = df[df['Year'].isin(year)]
-if 'Month' in df.columns and month:
-    df = df[df['Month'].isin(month)]
-if 'Quarter' in df.columns and quarter:
-    df = df[df['Quarter'].isin(quarter)]
-if 'Product' in df.columns and product:
-    df = df[df['Product'].isin(product)]
-if 'Claim Type' in df.columns and type:
-    df = df[df['Claim Type'].isin(type)]
-if 'Claim Status' in df.columns and status:
-    df = df[df['Claim Status'].isin(status)]
-if 'Source' in df.columns and source:
-    df = df[df['Source'].isin(source)]
-if 'ICD-10 Code' in df.columns and code:
-    df = df[df['ICD-10 Code'].isin(code)]
-if 'Employer Name' in df.columns and client_name:
-    df = df[df['Employer Name'].isin(client_name)]
-if 'Provider Name' in df.columns and prov_name:
-    df = df[df['Provider Name'].isin(prov_name)]
-
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if type:
-     filter_description += f"{', '.join(map(str, type))} "
-if product:
-     filter_description += f"{', '.join(map(str, product))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if quarter:
-    filter_description += f"{', '.join(quarter)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Claim Created Date"].min()
-endDate = df["Claim Created Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
+
+    # Apply the sidebar filters and describe them for the section headers
+    df, filter_description = apply_filters(df, filters, DESCRIPTION_COLUMNS)
+
+
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Claim Created Date"].min()
+    endDate = df["Claim Created Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
     <style>
     .date-input-box {
         border-radius: 10px;
@@ -191,120 +129,102 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
+    # Function to display date input in styled boxes
+    def display_date_input(col, title, default_date, min_date, max_date):
+        col.markdown(f"""
         <div class="date-input-box">
             <div class="date-input-title">{title}</div>
         </div>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
+        return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
-
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
-
-
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
-
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "First Claim Created Date", startDate, startDate, endDate))
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "Last Claim Created Date", endDate, startDate, endDate))
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
+    # Extract unique month-year combinations in period order
+    month_years = month_year_options(df)
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Select slider for month-year range
+    selected_month_year_range = st.select_slider(
+        "Select Month-Year Range",
+        options=month_years,
+        value=(month_years[0], month_years[-1])
+    )
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    # Filter DataFrame on the precomputed period key
+    df = filter_month_year_range(df, selected_month_year_range)
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # Cube of the current selection, which the charts roll up instead of re-scanning the claims
+    cube = selection_cube(data, df, filters, selected_month_year_range)
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
+    # The selection the charts are drawn from, which keys them in the figure cache
+    selection = {'page': __name__, 'data': data_version(data), 'filters': filters, 'range': selected_month_year_range}
 
-df.rename(columns={'Employer Name': 'Client Name'}, inplace=True)
+    df.rename(columns={'Employer Name': 'Client Name'}, inplace=True)
 
-# Filter data by product
-df_health = df[df['Product'] == 'Health Insurance']
-df_proactiv = df[df['Product'] == 'ProActiv']
+    # Filter data by product
+    df_health = df[df['Product'] == 'Health Insurance']
+    df_proactiv = df[df['Product'] == 'ProActiv']
 
-# Filter data by claim status
-df_app = df[df['Claim Status'] == 'Approved']
-df_dec = df[df['Claim Status'] == 'Declined']
+    # Filter data by claim status
+    df_app = df[df['Claim Status'] == 'Approved']
+    df_dec = df[df['Claim Status'] == 'Declined']
 
-# Scale factor for millions
-scale = 1_000_000
+    # Scale factor for millions
+    scale = 1_000_000
 
-# Calculate overall metrics
-if not df.empty:
-    total_claim_amount = (df["Claim Amount"].sum()) / scale
-    average_claim_amount = (df["Claim Amount"].mean()) / scale
-    average_approved_claim_amount = (df["Approved Claim Amount"].mean()) / scale
+    # Calculate overall metrics
+    if not df.empty:
+        total_claim_amount = (df["Claim Amount"].sum()) / scale
+        average_claim_amount = (df["Claim Amount"].mean()) / scale
+        average_approved_claim_amount = (df["Approved Claim Amount"].mean()) / scale
 
-    total_clients = df["Client Name"].nunique()
-    total_claims = df["Claim ID"].nunique()
-    total_approved_claims = df_app["Claim ID"].nunique()
-    total_declined_claims = df_dec["Claim ID"].nunique()
+        total_clients = df["Client Name"].nunique()
+        total_claims = df["Claim ID"].nunique()
+        total_approved_claims = df_app["Claim ID"].nunique()
+        total_declined_claims = df_dec["Claim ID"].nunique()
 
-    total_approved_claim_amount = (df_app["Claim Amount"].sum()) / scale
-    total_declined_claim_amount = (df_dec["Claim Amount"].sum()) / scale
+        total_approved_claim_amount = (df_app["Claim Amount"].sum()) / scale
+        total_declined_claim_amount = (df_dec["Claim Amount"].sum()) / scale
 
-    percent_approved = (total_approved_claims / total_claims) * 100 if total_claims != 0 else 0
-    percent_declined = (total_declined_claims / total_claims) * 100 if total_claims != 0 else 0
+        percent_approved = (total_approved_claims / total_claims) * 100 if total_claims != 0 else 0
+        percent_declined = (total_declined_claims / total_claims) * 100 if total_claims != 0 else 0
 
-# Calculate Health Insurance metrics
-    total_health_claims = df_health["Claim ID"].nunique()
-    total_health_approved_claims = df_health[df_health['Claim Status'] == 'Approved']["Claim ID"].nunique()
-    total_health_declined_claims = df_health[df_health['Claim Status'] == 'Declined']["Claim ID"].nunique()
+    # Calculate Health Insurance metrics
+        total_health_claims = df_health["Claim ID"].nunique()
+        total_health_approved_claims = df_health[df_health['Claim Status'] == 'Approved']["Claim ID"].nunique()
+        total_health_declined_claims = df_health[df_health['Claim Status'] == 'Declined']["Claim ID"].nunique()
 
-    total_health_claim_amount = (df_health["Claim Amount"].sum()) / scale
-    total_health_approved_amount = (df_health[df_health['Claim Status'] == 'Approved']["Claim Amount"].sum()) / scale
-    total_health_declined_amount = (df_health[df_health['Claim Status'] == 'Declined']["Claim Amount"].sum()) / scale
+        total_health_claim_amount = (df_health["Claim Amount"].sum()) / scale
+        total_health_approved_amount = (df_health[df_health['Claim Status'] == 'Approved']["Claim Amount"].sum()) / scale
+        total_health_declined_amount = (df_health[df_health['Claim Status'] == 'Declined']["Claim Amount"].sum()) / scale
 
-    health_approval_rate = (total_health_approved_claims / total_health_claims) * 100 if total_health_claims != 0 else 0
-    health_decline_rate = (total_health_declined_claims / total_health_claims) * 100 if total_health_claims != 0 else 0
+        health_approval_rate = (total_health_approved_claims / total_health_claims) * 100 if total_health_claims != 0 else 0
+        health_decline_rate = (total_health_declined_claims / total_health_claims) * 100 if total_health_claims != 0 else 0
 
-# Calculate ProActiv metrics
-    total_proactiv_claims = df_proactiv["Claim ID"].nunique()
-    total_proactiv_approved_claims = df_proactiv[df_proactiv['Claim Status'] == 'Approved']["Claim ID"].nunique()
-    total_proactiv_declined_claims = df_proactiv[df_proactiv['Claim Status'] == 'Declined']["Claim ID"].nunique()
+    # Calculate ProActiv metrics
+        total_proactiv_claims = df_proactiv["Claim ID"].nunique()
+        total_proactiv_approved_claims = df_proactiv[df_proactiv['Claim Status'] == 'Approved']["Claim ID"].nunique()
+        total_proactiv_declined_claims = df_proactiv[df_proactiv['Claim Status'] == 'Declined']["Claim ID"].nunique()
 
-    total_proactiv_claim_amount = (df_proactiv["Claim Amount"].sum()) / scale
-    total_proactiv_approved_amount = (df_proactiv[df_proactiv['Claim Status'] == 'Approved']["Claim Amount"].sum()) / scale
-    total_proactiv_declined_amount = (df_proactiv[df_proactiv['Claim Status'] == 'Declined']["Claim Amount"].sum()) / scale
+        total_proactiv_claim_amount = (df_proactiv["Claim Amount"].sum()) / scale
+        total_proactiv_approved_amount = (df_proactiv[df_proactiv['Claim Status'] == 'Approved']["Claim Amount"].sum()) / scale
+        total_proactiv_declined_amount = (df_proactiv[df_proactiv['Claim Status'] == 'Declined']["Claim Amount"].sum()) / scale
 
-    proactiv_approval_rate = (total_proactiv_approved_claims / total_proactiv_claims) * 100 if total_proactiv_claims != 0 else 0
-    proactiv_decline_rate = (total_proactiv_declined_claims / total_proactiv_claims) * 100 if total_proactiv_claims != 0 else 0
+        proactiv_approval_rate = (total_proactiv_approved_claims / total_proactiv_claims) * 100 if total_proactiv_claims != 0 else 0
+        proactiv_decline_rate = (total_proactiv_declined_claims / total_proactiv_claims) * 100 if total_proactiv_claims != 0 else 0
 
-    # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
-    st.markdown("""
+        # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
+        st.markdown("""
         <style>
         .custom-subheader {
             color: #e66c37;
@@ -339,9 +259,9 @@ if not df.empty:
 
 
 
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
+        # Function to display metrics in styled boxes with tooltips
+        def display_metric(col, title, value):
+            col.markdown(f"""
             <div class="metric-box">
                 <div class="metric-title">{title}</div>
                 <div class="metric-value">{value}</div>
@@ -349,439 +269,357 @@ if not df.empty:
             """, unsafe_allow_html=True)
 
 
-  
-    # Display overall metrics
-    st.markdown(f'<h2 class="custom-subheader">For all Claims in Numbers</h2>', unsafe_allow_html=True)
-    cols1, cols2, cols3 = st.columns(3)
-    display_metric(cols1, "Number of Clients", f"{total_clients:,.0f}")
-    display_metric(cols2, "Number of Claims", f"{total_claims:,.0f}")
-    display_metric(cols3, "Number of Approved Claims", f"{total_approved_claims:,.0f}")
-    display_metric(cols1, "Number of Declined Claims", f"{total_declined_claims:,.0f}")
-    display_metric(cols2, "Percentage Approved", f"{percent_approved:.0f} %")
-    display_metric(cols3, "Percentage Declined", f"{percent_declined:.0f} %")
-
-    # Display overall claim amounts
-    st.markdown(f'<h2 class="custom-subheader">For all Claim Amounts</h2>', unsafe_allow_html=True)
-    cols1, cols2, cols3 = st.columns(3)
-    display_metric(cols1, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
-    display_metric(cols2, "Total Approved Claim Amount", f"{total_approved_claim_amount:,.0f} M")
-    display_metric(cols3, "Total Declined Claim Amount", f"{total_declined_claim_amount:,.0f} M")
-    display_metric(cols1, "Average Claim Amount Per Client", f"{average_claim_amount:,.0f} M")
-    display_metric(cols2, "Average Approved Claim Amount Per Client", f"{average_approved_claim_amount:,.0f} M")
-
-    # Display Health Insurance metrics
-    st.markdown('<h3 class="custom-subheader">For Health Insurance</h3>', unsafe_allow_html=True)
-    col1, col2, col3 = st.columns(3)
-    display_metric(col1, "Number of Claims", f"{total_health_claims:,.0f}")
-    display_metric(col2, "Number of Approved Claims", f"{total_health_approved_claims:,.0f}")
-    display_metric(col3, "Number of Declined Claims", f"{total_health_declined_claims:,.0f}")
-    display_metric(col1, "Total Claim Amount", f"RWF {total_health_claim_amount:,.0f} M")
-    display_metric(col2, "Approved Claim Amount", f"RWF {total_health_approved_amount:,.0f} M")
-    display_metric(col3, "Declined Claim Amount", f"RWF {total_health_declined_amount:,.0f} M")
-    display_metric(col1, "Percentage Approved", f"{health_approval_rate:.0f} %")
-    display_metric(col2, "Percentage Declined", f"{health_decline_rate:.0f} %")
-
-    # Display ProActiv metrics
-    st.markdown('<h3 class="custom-subheader">For ProActiv</h3>', unsafe_allow_html=True)
-    col1, col2, col3 = st.columns(3)
-    display_metric(col1, "Number of Claims", f"{total_proactiv_claims:,.0f}")
-    display_metric(col2, "Number of Approved Claims", f"{total_proactiv_approved_claims:,.0f}")
-    display_metric(col3, "Number of Declined Claims", f"{total_proactiv_declined_claims:,.0f}")
-    display_metric(col1, "Total Claim Amount", f"RWF {total_proactiv_claim_amount:,.0f} M")
-    display_metric(col2, "Approved Claim Amount", f"RWF {total_proactiv_approved_amount:,.0f} M")
-    display_metric(col3, "Declined Claim Amount", f"RWF {total_proactiv_declined_amount:,.0f} M")
-    display_metric(col1, "Percentage Approved", f"{proactiv_approval_rate:.0f} %")
-    display_metric(col2, "Percentage Declined", f"{proactiv_decline_rate:.0f} %")
-
-    st.dataframe(df)
-
-
-
-    # Define custom colors
-    custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
 
-    col1, col2 = st.columns(2)
-
-    with col1:
-        # Total Claims and Approved Claim Amount Over Time
-        area_chart_count = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d")).size().reset_index(name='Count')
-
-        area_chart_amount = df.groupby(df["Claim Created Date"].dt.strftime("%Y-%m-%d"))['Claim Amount'].sum().reset_index(name='Claim Amount')
-
-        area_chart = pd.merge(area_chart_count, area_chart_amount, on='Claim Created Date').sort_values("Claim Created Date")
-
-        fig1 = make_subplots(specs=[[{"secondary_y": True}]])
-        
-        fig1.add_trace(
-            go.Scatter(
-                x=area_chart['Claim Created Date'], 
-                y=area_chart['Count'], 
+        # Display overall metrics
+        st.markdown('<h2 class="custom-subheader">For all Claims in Numbers</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Number of Clients", f"{total_clients:,.0f}")
+        display_metric(cols2, "Number of Claims", f"{total_claims:,.0f}")
+        display_metric(cols3, "Number of Approved Claims", f"{total_approved_claims:,.0f}")
+        display_metric(cols1, "Number of Declined Claims", f"{total_declined_claims:,.0f}")
+        display_metric(cols2, "Percentage Approved", f"{percent_approved:.0f} %")
+        display_metric(cols3, "Percentage Declined", f"{percent_declined:.0f} %")
+
+        # Display overall claim amounts
+        st.markdown('<h2 class="custom-subheader">For all Claim Amounts</h2>', unsafe_allow_html=True)
+        cols1, cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
+        display_metric(cols2, "Total Approved Claim Amount", f"{total_approved_claim_amount:,.0f} M")
+        display_metric(cols3, "Total Declined Claim Amount", f"{total_declined_claim_amount:,.0f} M")
+        display_metric(cols1, "Average Claim Amount Per Client", f"{average_claim_amount:,.0f} M")
+        display_metric(cols2, "Average Approved Claim Amount Per Client", f"{average_approved_claim_amount:,.0f} M")
+
+        # Display Health Insurance metrics
+        st.markdown('<h3 class="custom-subheader">For Health Insurance</h3>', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        display_metric(col1, "Number of Claims", f"{total_health_claims:,.0f}")
+        display_metric(col2, "Number of Approved Claims", f"{total_health_approved_claims:,.0f}")
+        display_metric(col3, "Number of Declined Claims", f"{total_health_declined_claims:,.0f}")
+        display_metric(col1, "Total Claim Amount", f"RWF {total_health_claim_amount:,.0f} M")
+        display_metric(col2, "Approved Claim Amount", f"RWF {total_health_approved_amount:,.0f} M")
+        display_metric(col3, "Declined Claim Amount", f"RWF {total_health_declined_amount:,.0f} M")
+        display_metric(col1, "Percentage Approved", f"{health_approval_rate:.0f} %")
+        display_metric(col2, "Percentage Declined", f"{health_decline_rate:.0f} %")
+
+        # Display ProActiv metrics
+        st.markdown('<h3 class="custom-subheader">For ProActiv</h3>', unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        display_metric(col1, "Number of Claims", f"{total_proactiv_claims:,.0f}")
+        display_metric(col2, "Number of Approved Claims", f"{total_proactiv_approved_claims:,.0f}")
+        display_metric(col3, "Number of Declined Claims", f"{total_proactiv_declined_claims:,.0f}")
+        display_metric(col1, "Total Claim Amount", f"RWF {total_proactiv_claim_amount:,.0f} M")
+        display_metric(col2, "Approved Claim Amount", f"RWF {total_proactiv_approved_amount:,.0f} M")
+        display_metric(col3, "Declined Claim Amount", f"RWF {total_proactiv_declined_amount:,.0f} M")
+        display_metric(col1, "Percentage Approved", f"{proactiv_approval_rate:.0f} %")
+        display_metric(col2, "Percentage Declined", f"{proactiv_decline_rate:.0f} %")
+
+        st.dataframe(df.drop(columns=INTERNAL_COLUMNS))
+
+
+
+        # Define custom colors
+        custom_colors = ["#006E7F", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
+
+        col1, col2 = st.columns(2)
+
+        # Function to chart the claims over time
+        def claims_over_time_chart():
+            # Total Claims and Approved Claim Amount Over Time
+            area_chart = count_and_sum(df, 'Claim Day', 'Claim Amount').rename(columns={'Claim Day': 'Claim Created Date'})
+
+            # Create the dual-axis area chart
+            return dual_axis_chart(
+                area_chart, 'Claim Created Date',
+                left=dict(y='Count', kind='area', name="Number of Claims", color=custom_colors[1]),
+                right=dict(y='Claim Amount', kind='area', name="Claim Amount", color=custom_colors[0]),
+                xaxis_title="Claim Created Date",
+                xaxis_tickangle=45,
+                yaxis_title="<b>Number of Claims</b>",
+                yaxis2_title="<b>Approved Claim Amount</b>",
+            )
+
+        with col1:
+            fig1 = cached_chart(selection, 'claims over time', claims_over_time_chart)
+
+            st.markdown('<h3 class="custom-subheader">Total Claims and Approved Claim Amount Over Time</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig1, use_container_width=True)
+
+        # Function to chart the total claim amount per year and product
+        def yearly_total_chart():
+            # Group data by "Year" and "Product" and calculate the average Claim Amount
+            yearly_avg_claim = rollup(cube, ['Year', 'Product'], {'sum': ('Claim Amount', 'sum')})['sum'].unstack().fillna(0)
+
+            # Create the grouped bar chart, one bar per Product
+            return category_chart(
+                yearly_avg_claim, 'Year', list(yearly_avg_claim.columns), colors=custom_colors, text='%.1fM', text_scale=1e6,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Total Claim Amount (M)",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+        # Define custom colors
+        with col2:
+            fig_yearly_avg_claim = cached_chart(selection, 'yearly total by product', yearly_total_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Total Yearly Claims by Product</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_claim, use_container_width=True)
+
+        col1, col2 = st.columns(2)
+
+        # Function to chart the average claim amount per month and product
+        def monthly_average_chart():
+            # Group data by "Month" and "Product" and calculate the average Claim Amount
+            monthly_avg_claim = rollup(cube, ['Month', 'Product'], {'mean': ('Claim Amount', 'mean')})['mean'].unstack().fillna(0)
+
+            # Create the grouped bar chart, one bar per Product
+            return category_chart(
+                monthly_avg_claim, 'Month', list(monthly_avg_claim.columns), colors=custom_colors, text='$%.1fM', text_scale=1e6,
+                trace=dict(textposition='inside', textfont=dict(color='white'), hoverinfo='x+y+name'),
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis_title="Average Claim Amount (M)",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),  # Rotate month labels for readability
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+        # Define custom colors
+        with col1:
+            fig_monthly_avg_claim = cached_chart(selection, 'monthly average by product', monthly_average_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Average Monthly Claims by Product</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_monthly_avg_claim, use_container_width=True)
+
+        # Group data by Product to calculate the number of claims and total claim amount
+        claims_by_product = df.groupby("Product").agg(
+            Number_of_Claims=("Claim ID", "nunique"),
+            Total_Claim_Amount=("Claim Amount", "sum")
+        ).reset_index()
+
+        # Scale Total Claim Amount to millions for better readability
+        claims_by_product["Total_Claim_Amount"] = claims_by_product["Total_Claim_Amount"] / 1_000_000
+
+        with col2:
+
+            # Create a grouped bar chart
+            fig_grouped_bar = go.Figure()
+
+            # Add trace for Number of Claims
+            fig_grouped_bar.add_trace(go.Bar(
+                x=claims_by_product['Product'], 
+                y=claims_by_product['Number_of_Claims'], 
                 name="Number of Claims", 
-                fill='tozeroy', 
-                line=dict(color=custom_colors[1])), 
-                secondary_y=False)
-        
-        fig1.add_trace(
-            go.Scatter(
-                x=area_chart['Claim Created Date'], 
-                y=area_chart['Claim Amount'], 
-                name="Claim Amount", fill='tozeroy', 
-                line=dict(color=custom_colors[0])), 
-                secondary_y=True)
-        
-        fig1.update_xaxes(
-            title_text="Claim Created Date", 
-            tickangle=45)
-        
-        fig1.update_yaxes(
-            title_text="<b>Number of Claims</b>", 
-            secondary_y=False)
-        
-        fig1.update_yaxes(
-            title_text="<b>Approved Claim Amount</b>", 
-            secondary_y=True)
-        
-        st.markdown('<h3 class="custom-subheader">Total Claims and Approved Claim Amount Over Time</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig1, use_container_width=True)
-
-    # Group data by "Year" and "Product" and calculate the average Claim Amount
-    yearly_avg_claim = df.groupby(['Year', 'Product'])['Claim Amount'].sum().unstack().fillna(0)
-
-    # Define custom colors
-    with col2:
-        # Create the grouped bar chart
-        fig_yearly_avg_claim = go.Figure()
-
-        # Add traces for each product
-        for idx, product in enumerate(yearly_avg_claim.columns):
-            fig_yearly_avg_claim.add_trace(go.Bar(
-                x=yearly_avg_claim.index,  # Years on the x-axis
-                y=yearly_avg_claim[product],  # Average claim amount for each product
-                name=product,  # Product name as legend
-                text=yearly_avg_claim[product].apply(lambda x: f"{x / 1_000_000:.1f}M"),  # Format values in millions
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
+                text=claims_by_product['Number_of_Claims'], 
+                textposition='outside', 
+                marker_color=custom_colors[1]  # Use second color for number of claims
             ))
 
-        # Update layout
-        fig_yearly_avg_claim.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Total Claim Amount (M)",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Total Yearly Claims by Product</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_claim, use_container_width=True)
-
-    col1, col2 = st.columns(2)
-
-    # Group data by "Month" and "Product" and calculate the average Claim Amount
-    monthly_avg_claim = df.groupby(['Month', 'Product'])['Claim Amount'].mean().unstack().fillna(0)
-
-    # Define custom colors
-    with col1:
-        # Create the grouped bar chart
-        fig_monthly_avg_claim = go.Figure()
-
-        # Add traces for each product
-        for idx, product in enumerate(monthly_avg_claim.columns):
-            fig_monthly_avg_claim.add_trace(go.Bar(
-                x=monthly_avg_claim.index,  # Months on the x-axis
-                y=monthly_avg_claim[product],  # Average claim amount for each product
-                name=product,  # Product name as legend
-                text=monthly_avg_claim[product].apply(lambda x: f"${x / 1_000_000:.1f}M"),  # Format values in millions
-                textposition='inside',
-                textfont=dict(color='white'),
-                hoverinfo='x+y+name',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Cycle through custom colors
+            # Add trace for Total Claim Amount
+            fig_grouped_bar.add_trace(go.Bar(
+                x=claims_by_product['Product'], 
+                y=claims_by_product['Total_Claim_Amount'], 
+                name="Total Claim Amount (M)", 
+                text=claims_by_product['Total_Claim_Amount'].apply(lambda x: f"{x:.1f}M"), 
+                textposition='outside', 
+                marker_color=custom_colors[0]  # Use first color for total claim amount
             ))
 
-        # Update layout
-        fig_monthly_avg_claim.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Month",
-            yaxis_title="Average Claim Amount (M)",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),  # Rotate month labels for readability
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Average Monthly Claims by Product</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_monthly_avg_claim, use_container_width=True)
-
-    # Group data by Product to calculate the number of claims and total claim amount
-    claims_by_product = df.groupby("Product").agg(
-        Number_of_Claims=("Claim ID", "nunique"),
-        Total_Claim_Amount=("Claim Amount", "sum")
-    ).reset_index()
-
-    # Scale Total Claim Amount to millions for better readability
-    claims_by_product["Total_Claim_Amount"] = claims_by_product["Total_Claim_Amount"] / 1_000_000
-
-    with col2:
-
-        # Create a grouped bar chart
-        fig_grouped_bar = go.Figure()
-
-        # Add trace for Number of Claims
-        fig_grouped_bar.add_trace(go.Bar(
-            x=claims_by_product['Product'], 
-            y=claims_by_product['Number_of_Claims'], 
-            name="Number of Claims", 
-            text=claims_by_product['Number_of_Claims'], 
-            textposition='outside', 
-            marker_color=custom_colors[1]  # Use second color for number of claims
-        ))
-
-        # Add trace for Total Claim Amount
-        fig_grouped_bar.add_trace(go.Bar(
-            x=claims_by_product['Product'], 
-            y=claims_by_product['Total_Claim_Amount'], 
-            name="Total Claim Amount (M)", 
-            text=claims_by_product['Total_Claim_Amount'].apply(lambda x: f"{x:.1f}M"), 
-            textposition='outside', 
-            marker_color=custom_colors[0]  # Use first color for total claim amount
-        ))
-
-        # Update layout for grouped bars
-        fig_grouped_bar.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Product",
-            yaxis_title="Count / Amount (M)",
-            font=dict(color='Black', size=12),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),  # Rotate product names for readability
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450,
-            legend=dict(x=0.01, y=1.1, orientation="h")  # Place legend above the chart
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Number of Claims and Total Claim Amount by Product</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_grouped_bar, use_container_width=True)
-        
-    col1, col2 = st.columns(2)
+            # Update layout for grouped bars
+            fig_grouped_bar.update_layout(
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Product",
+                yaxis_title="Count / Amount (M)",
+                font=dict(color='Black', size=12),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), tickangle=45),  # Rotate product names for readability
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450,
+                legend=dict(x=0.01, y=1.1, orientation="h")  # Place legend above the chart
+            )
 
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Number of Claims and Total Claim Amount by Product</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_grouped_bar, use_container_width=True)
 
+        col1, col2 = st.columns(2)
 
-    # Group by product and claim status
-    product_claim_status = df.groupby(['Product', 'Claim Status'])['Claim ID'].nunique().unstack(fill_value=0).reset_index()
-
-    with col1:
 
-        # Create a stacked bar chart
-        fig_claim_status_by_product = go.Figure()
 
-        fig_claim_status_by_product.add_trace(go.Bar(
-            x=product_claim_status['Product'],
-            y=product_claim_status['Approved'],
-            name='Approved Claims',
-            marker_color=custom_colors[0]  # Use second color for approved claims
-        ))
+        # Group by product and claim status
+        product_claim_status = df.groupby(['Product', 'Claim Status'])['Claim ID'].nunique().unstack(fill_value=0).reset_index()
 
-        fig_claim_status_by_product.add_trace(go.Bar(
-            x=product_claim_status['Product'],
-            y=product_claim_status['Declined'],
-            name='Declined Claims',
-            marker_color=custom_colors[1]  # Use fifth color for declined claims
-        ))
+        with col1:
 
-        # Update layout
-        fig_claim_status_by_product.update_layout(
-            barmode='group',
-            xaxis_title="Product",
-            yaxis_title="Number of Claims",
-            font=dict(color='Black'),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500
-        )
-        st.markdown('<h3 class="custom-subheader">Approved vs Declined Claims by Product</h3>', unsafe_allow_html=True)
+            # Create a stacked bar chart
+            fig_claim_status_by_product = go.Figure()
 
-        st.plotly_chart(fig_claim_status_by_product, use_container_width=True)
-
-
-
-    with col2:
-
-        # Filter top providers by claim volume
-        top_providers = df.groupby(['Product', 'Source'])['Claim Amount'].sum().reset_index(name='Claim Amount')
-
-
-        # Create a grouped bar chart
-        fig_top_providers = go.Figure()
-
-        for product in top_providers['Product'].unique():
-            product_data = top_providers[top_providers['Product'] == product]
-            fig_top_providers.add_trace(go.Bar(
-                x=product_data['Source'],
-                y=product_data['Claim Amount'],
-                name=product,
-                marker_color=custom_colors[list(top_providers['Product'].unique()).index(product) % len(custom_colors)]  # Assign unique color per product
-            ))
-
-        # Update layout
-        fig_top_providers.update_layout(
-            barmode='group',
-            xaxis_title="Provider Type",
-            yaxis_title="Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(tickangle=45),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500
-        )
-        st.markdown('<h3 class="custom-subheader">Provider Type Trend by Product</h3>', unsafe_allow_html=True)
-
-        st.plotly_chart(fig_top_providers, use_container_width=True)
-
-
-    with col1:
-
-        # Filter top providers by claim volume
-        top_providers = df.groupby(['Product', 'Claim Type'])['Claim Amount'].sum().reset_index(name='Claim Amount')
-
-
-        # Create a grouped bar chart
-        fig_top_providers = go.Figure()
-
-        for product in top_providers['Product'].unique():
-            product_data = top_providers[top_providers['Product'] == product]
-            fig_top_providers.add_trace(go.Bar(
-                x=product_data['Claim Type'],
-                y=product_data['Claim Amount'],
-                name=product,
-                marker_color=custom_colors[list(top_providers['Product'].unique()).index(product) % len(custom_colors)]  # Assign unique color per product
-            ))
-
-        # Update layout
-        fig_top_providers.update_layout(
-            barmode='group',
-            xaxis_title="Claim Type",
-            yaxis_title="Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(tickangle=45),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500
-        )
-        st.markdown('<h3 class="custom-subheader">Total Claim Amount and Claim Type Trend by Product</h3>', unsafe_allow_html=True)
-
-        st.plotly_chart(fig_top_providers, use_container_width=True)
-
-    with col2:
-
-        # Filter top providers by claim volume
-        top_providers = df.groupby(['Product', 'Diagnosis'])['Claim Amount'].sum().reset_index(name='Claim Amount')
-
-        top_providers = top_providers.sort_values(by=['Product', 'Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
-
-        # Create a grouped bar chart
-        fig_top_providers = go.Figure()
-
-        for product in top_providers['Product'].unique():
-            product_data = top_providers[top_providers['Product'] == product]
-            fig_top_providers.add_trace(go.Bar(
-                x=product_data['Diagnosis'],
-                y=product_data['Claim Amount'],
-                name=product,
-                marker_color=custom_colors[list(top_providers['Product'].unique()).index(product) % len(custom_colors)]  # Assign unique color per product
+            fig_claim_status_by_product.add_trace(go.Bar(
+                x=product_claim_status['Product'],
+                y=product_claim_status['Approved'],
+                name='Approved Claims',
+                marker_color=custom_colors[0]  # Use second color for approved claims
             ))
 
-        # Update layout
-        fig_top_providers.update_layout(
-            barmode='group',
-            xaxis_title="Diagnosis",
-            yaxis_title="Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(tickangle=45),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500,
-        )
-        st.markdown('<h3 class="custom-subheader">Top 10 Diagnosis by Product</h3>', unsafe_allow_html=True)
-
-        st.plotly_chart(fig_top_providers, use_container_width=True)
-
-    with col1:
-
-        # Filter top providers by claim volume
-        top_providers = df.groupby(['Product', 'Provider Name'])['Claim Amount'].sum().reset_index(name='Total Claim Amount')
-
-        # Sort by claim amount and limit to top 5 providers per product
-        top_providers = top_providers.sort_values(by=['Product', 'Total Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
-
-        # Create a grouped bar chart for top providers
-        fig_top_providers = go.Figure()
-
-        for idx, product in enumerate(top_providers['Product'].unique()):
-            product_data = top_providers[top_providers['Product'] == product]
-            fig_top_providers.add_trace(go.Bar(
-                x=product_data['Provider Name'],
-                y=product_data['Total Claim Amount'],
-                name=product,
-                text=product_data['Total Claim Amount'].apply(lambda x: f"${x / 1_000_000:.1f}M"),  # Format as millions
-                textposition='outside',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Assign unique color per product
-            ))
-
-        # Update layout
-        fig_top_providers.update_layout(
-            barmode='group',
-            xaxis_title="Provider Name",
-            yaxis_title="Total Claim Amount (M)",
-            font=dict(color='Black', size=12),
-            xaxis=dict(tickangle=45, title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), ticksuffix="M"),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_top_providers, use_container_width=True)
-
-    with col2:
-
-        # Filter top clients by claim volume
-        top_clients = df.groupby(['Product', 'Client Name'])['Claim Amount'].sum().reset_index(name='Total Claim Amount')
-
-        # Sort by claim amount and limit to top 5 clients per product
-        top_clients = top_clients.sort_values(by=['Product', 'Total Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
-
-        # Create a grouped bar chart for top clients
-        fig_top_clients = go.Figure()
-
-        for idx, product in enumerate(top_clients['Product'].unique()):
-            product_data = top_clients[top_clients['Product'] == product]
-            fig_top_clients.add_trace(go.Bar(
-                x=product_data['Client Name'],
-                y=product_data['Total Claim Amount'],
-                name=product,
-                text=product_data['Total Claim Amount'].apply(lambda x: f"${x / 1_000_000:.1f}M"),  # Format as millions
-                textposition='outside',
-                marker_color=custom_colors[idx % len(custom_colors)]  # Assign unique color per product
+            fig_claim_status_by_product.add_trace(go.Bar(
+                x=product_claim_status['Product'],
+                y=product_claim_status['Declined'],
+                name='Declined Claims',
+                marker_color=custom_colors[1]  # Use fifth color for declined claims
             ))
 
-        # Update layout
-        fig_top_clients.update_layout(
-            barmode='group',
-            xaxis_title="Client Name",
-            yaxis_title="Total Claim Amount (M)",
-            font=dict(color='Black', size=12),
-            xaxis=dict(tickangle=45, title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), ticksuffix="M"),
-            margin=dict(l=0, r=0, t=50, b=50),
-            height=500
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Employer Group by Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_top_clients, use_container_width=True)
\ No newline at end of file
+            # Update layout
+            fig_claim_status_by_product.update_layout(
+                barmode='group',
+                xaxis_title="Product",
+                yaxis_title="Number of Claims",
+                font=dict(color='Black'),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500
+            )
+            st.markdown('<h3 class="custom-subheader">Approved vs Declined Claims by Product</h3>', unsafe_allow_html=True)
+
+            st.plotly_chart(fig_claim_status_by_product, use_container_width=True)
+
+
+
+        # Function to chart the claim amount per provider type and product
+        def provider_type_trend_chart():
+            # Filter top providers by claim volume
+            top_providers = rollup(cube, ['Product', 'Source'], {'Claim Amount': ('Claim Amount', 'sum')}).reset_index()
+
+
+            # Create a grouped bar chart, one bar per Product
+            return category_chart(
+                top_providers, 'Source', 'Claim Amount', color='Product', colors=custom_colors,
+                barmode='group',
+                xaxis_title="Provider Type",
+                yaxis_title="Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(tickangle=45),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500
+            )
+
+        with col2:
+            fig_top_providers = cached_chart(selection, 'claim amount by provider type and product', provider_type_trend_chart)
+            st.markdown('<h3 class="custom-subheader">Provider Type Trend by Product</h3>', unsafe_allow_html=True)
+
+            st.plotly_chart(fig_top_providers, use_container_width=True)
+
+
+        # Function to chart the claim amount per claim type and product
+        def claim_type_trend_chart():
+            # Filter top providers by claim volume
+            top_providers = rollup(cube, ['Product', 'Claim Type'], {'Claim Amount': ('Claim Amount', 'sum')}).reset_index()
+
+
+            # Create a grouped bar chart, one bar per Product
+            return category_chart(
+                top_providers, 'Claim Type', 'Claim Amount', color='Product', colors=custom_colors,
+                barmode='group',
+                xaxis_title="Claim Type",
+                yaxis_title="Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(tickangle=45),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500
+            )
+
+        with col1:
+            fig_top_providers = cached_chart(selection, 'claim amount by claim type and product', claim_type_trend_chart)
+            st.markdown('<h3 class="custom-subheader">Total Claim Amount and Claim Type Trend by Product</h3>', unsafe_allow_html=True)
+
+            st.plotly_chart(fig_top_providers, use_container_width=True)
+
+        # Function to chart the top 10 diagnoses of each product by claim amount
+        def top_diagnoses_chart():
+            # Filter top providers by claim volume
+            top_providers = df.groupby(['Product', 'Diagnosis'])['Claim Amount'].sum().reset_index(name='Claim Amount')
+
+            top_providers = top_providers.sort_values(by=['Product', 'Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
+
+            # Create a grouped bar chart, one bar per Product
+            return category_chart(
+                top_providers, 'Diagnosis', 'Claim Amount', color='Product', colors=custom_colors,
+                barmode='group',
+                xaxis_title="Diagnosis",
+                yaxis_title="Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(tickangle=45),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500,
+            )
+
+        with col2:
+            fig_top_providers = cached_chart(selection, 'top diagnoses by product', top_diagnoses_chart)
+            st.markdown('<h3 class="custom-subheader">Top 10 Diagnosis by Product</h3>', unsafe_allow_html=True)
+
+            st.plotly_chart(fig_top_providers, use_container_width=True)
+
+        # Function to chart the top 10 providers of each product by claim amount
+        def top_providers_chart():
+            # Filter top providers by claim volume
+            top_providers = df.groupby(['Product', 'Provider Name'])['Claim Amount'].sum().reset_index(name='Total Claim Amount')
+
+            # Sort by claim amount and limit to top 5 providers per product
+            top_providers = top_providers.sort_values(by=['Product', 'Total Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
+
+            # Create a grouped bar chart for top providers, one bar per Product
+            return category_chart(
+                top_providers, 'Provider Name', 'Total Claim Amount', color='Product', colors=custom_colors, text='$%.1fM', text_scale=1e6,
+                trace=dict(textposition='outside'),
+                barmode='group',
+                xaxis_title="Provider Name",
+                yaxis_title="Total Claim Amount (M)",
+                font=dict(color='Black', size=12),
+                xaxis=dict(tickangle=45, title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), ticksuffix="M"),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500
+            )
+
+        with col1:
+            fig_top_providers = cached_chart(selection, 'top providers by product', top_providers_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Service Providers by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_top_providers, use_container_width=True)
+
+        # Function to chart the top 10 clients of each product by claim amount
+        def top_clients_chart():
+            # Filter top clients by claim volume
+            top_clients = df.groupby(['Product', 'Client Name'])['Claim Amount'].sum().reset_index(name='Total Claim Amount')
+
+            # Sort by claim amount and limit to top 5 clients per product
+            top_clients = top_clients.sort_values(by=['Product', 'Total Claim Amount'], ascending=[True, False]).groupby('Product').head(10)
+
+            # Create a grouped bar chart for top clients, one bar per Product
+            return category_chart(
+                top_clients, 'Client Name', 'Total Claim Amount', color='Product', colors=custom_colors, text='$%.1fM', text_scale=1e6,
+                trace=dict(textposition='outside'),
+                barmode='group',
+                xaxis_title="Client Name",
+                yaxis_title="Total Claim Amount (M)",
+                font=dict(color='Black', size=12),
+                xaxis=dict(tickangle=45, title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), ticksuffix="M"),
+                margin=dict(l=0, r=0, t=50, b=50),
+                height=500
+            )
+
+        with col2:
+            fig_top_clients = cached_chart(selection, 'top clients by product', top_clients_chart)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Employer Group by Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_top_clients, use_container_width=True)
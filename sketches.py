@@ -0,0 +1,133 @@
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+from cube import CUBE_DIMENSIONS
+from filters import apply_filters, filter_month_year_range
+
+
+# Relative accuracy of the quantile sketches: each estimate is within this fraction of the exact quantile
+SKETCH_ALPHA = 0.01
+
+# Ratio between the bounds of consecutive sketch buckets
+SKETCH_GAMMA = (1 + SKETCH_ALPHA) / (1 - SKETCH_ALPHA)
+
+# Amounts closer to 0 than this share bucket 0, which estimates 0 (the error there is absolute,
+# below this value)
+SKETCH_MIN_VALUE = 1.0
+
+# Column the claims sketches summarise
+SKETCH_COLUMN = 'Claim Amount'
+
+# Sketch cubes of the shared claims data: id(frame) -> (weak reference, sketch cube)
+_sketches = {}
+_lock = threading.Lock()
+
+
+# Function to map values to their log-spaced sketch bucket: bucket k >= 1 holds (gamma^(k-1), gamma^k],
+# bucket -k the same negative values (e.g. reversals), and bucket 0 the values closer to 0 than
+# SKETCH_MIN_VALUE. Buckets are ordered like the values they hold.
+def bucket_keys(values):
+    values = np.asarray(values, dtype=float)
+    magnitudes = np.abs(values)
+    keys = np.maximum(np.ceil(np.log(np.maximum(magnitudes, SKETCH_MIN_VALUE)) / np.log(SKETCH_GAMMA)), 1)
+    return np.where(magnitudes < SKETCH_MIN_VALUE, 0, np.sign(values) * keys).astype(np.int64)
+
+
+# Function to give the value a bucket stands for, within SKETCH_ALPHA of every value it holds
+def bucket_values(keys):
+    keys = np.asarray(keys)
+    return np.sign(keys) * 2 * SKETCH_GAMMA ** np.abs(keys).astype(float) / (SKETCH_GAMMA + 1)
+
+
+# Function to give the range of values each bucket holds, as lower and upper bounds
+def bucket_bounds(keys):
+    keys = np.asarray(keys)
+    inner = np.where(keys == 0, 0.0, SKETCH_GAMMA ** (np.abs(keys).astype(float) - 1))
+    outer = np.where(keys == 0, SKETCH_MIN_VALUE, SKETCH_GAMMA ** np.abs(keys).astype(float))
+    return np.where(keys <= 0, -outer, inner), np.where(keys < 0, -inner, outer)
+
+
+# Function to summarise values in a sketch: the count of values per bucket (missing values are skipped)
+def build_sketch(values):
+    return pd.Series(bucket_keys(values.dropna())).value_counts().sort_index()
+
+
+# Function to merge sketches into the sketch of all their values, by adding their bucket counts
+def merge_sketches(sketches):
+    return pd.concat(sketches).groupby(level=0).sum()
+
+
+# Function to estimate quantiles from a sketch, interpolating between order statistics like
+# pandas' quantile(). Returns the estimates with the interval the exact quantiles lie in.
+def sketch_quantiles(sketch, quantiles):
+    counts = sketch.sort_index()
+    cumulative = counts.cumsum().to_numpy()
+    result = pd.DataFrame(index=pd.Index(quantiles, name='Quantile'), columns=['Estimate', 'Lower', 'Upper'], dtype=float)
+    if not len(cumulative) or cumulative[-1] == 0:
+        return result
+
+    # Bucket of the order statistics on either side of each quantile's rank
+    ranks = np.asarray(quantiles, dtype=float) * (cumulative[-1] - 1)
+    below = np.searchsorted(cumulative, np.floor(ranks), side='right')
+    above = np.searchsorted(cumulative, np.ceil(ranks), side='right')
+    weight = ranks - np.floor(ranks)
+
+    # The exact quantile interpolates between values those buckets hold, so it lies between the
+    # same interpolation of their lower bounds and of their upper bounds
+    keys = counts.index.to_numpy()
+    lower, upper = bucket_bounds(keys)
+    for column, per_bucket in [('Estimate', bucket_values(keys)), ('Lower', lower), ('Upper', upper)]:
+        result[column] = per_bucket[below] + weight * (per_bucket[above] - per_bucket[below])
+    return result
+
+
+# Function to compute the IQR-based outlier bounds (as outliers.iqr_bounds) from a sketch
+def sketch_iqr_bounds(sketch):
+    Q1, Q3 = sketch_quantiles(sketch, [0.25, 0.75])['Estimate']
+    IQR = Q3 - Q1
+    return {
+        'mild_lower': Q1 - 1.5 * IQR,
+        'mild_upper': Q3 + 1.5 * IQR,
+        'extreme_lower': Q1 - 3 * IQR,
+        'extreme_upper': Q3 + 3 * IQR,
+    }
+
+
+# Function to sketch the claim amounts of each cube dimension tuple: one row per
+# dimension tuple and bucket, with the count of claims in it
+def build_sketch_cube(df):
+    rows = df[df[SKETCH_COLUMN].notna()]
+    keys = [rows[dimension].to_numpy() for dimension in CUBE_DIMENSIONS] + [bucket_keys(rows[SKETCH_COLUMN])]
+    cube = pd.Series(np.ones(len(rows), dtype=np.int64)).groupby(keys, dropna=False).sum()
+    cube.index.names = CUBE_DIMENSIONS + ['Bucket']
+    return cube.rename('Count').reset_index()
+
+
+# Function to build the sketch cube of a claims DataFrame once and reuse it while the frame is alive
+def claims_sketch_cube(df):
+    with _lock:
+        entry = _sketches.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    cube = build_sketch_cube(df)
+    with _lock:
+        key = id(df)
+        _sketches[key] = (weakref.ref(df, lambda _, key=key: _sketches.pop(key, None)), cube)
+    return cube
+
+
+# Function to get the claim amount sketch of a page's current selection, by merging the sketches
+# of the selected dimension tuples of the claims data. As with cube.selection_cube, a filter active
+# on a column the cube does not have (such as a page's own column) falls back to sketching the
+# already filtered rows.
+def selection_sketch(claims, df, filters, month_year_range):
+    for column, values in filters.items():
+        if values and column in df.columns and column not in CUBE_DIMENSIONS:
+            return build_sketch(df[SKETCH_COLUMN])
+
+    cube, _ = apply_filters(claims_sketch_cube(claims), filters)
+    cube = filter_month_year_range(cube, month_year_range)
+    return cube.groupby('Bucket')['Count'].sum()
+
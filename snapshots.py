@@ -0,0 +1,142 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+
+# Workbooks the dashboard reads
+WORKBOOKS = ["Claims.xlsx", "JAN-NOV 2024 GWP.xlsx", "ALL 2024 CLAIMS.xlsx"]
+
+# Low-cardinality columns stored dictionary-encoded in the snapshots
+CATEGORICAL_COLUMNS = ['Product', 'Claim Type', 'Claim Status', 'Source', 'ICD-10 Code']
+
+# Snapshots are written to this folder next to each workbook
+SNAPSHOT_DIR = ".snapshots"
+
+# Memo of workbook hashes: path -> (file signature, sha256), so an unchanged file is hashed once
+_hashes = {}
+_lock = threading.Lock()
+
+
+# Function to identify a version of a file without reading its contents
+def file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Function to hash a workbook's contents
+def workbook_hash(path):
+    signature = file_signature(path)
+    cached = _hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    _hashes[path] = (signature, digest.hexdigest())
+    return digest.hexdigest()
+
+
+# Function to locate the snapshot folder and manifest of a workbook
+def snapshot_paths(path):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), SNAPSHOT_DIR)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return folder, os.path.join(folder, f"{stem}.manifest.json")
+
+
+# Function to read the manifest written by the last snapshot build
+def read_manifest(path):
+    _, manifest_path = snapshot_paths(path)
+    try:
+        with open(manifest_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+# Function to give each column a type Arrow can store
+def prepare_for_arrow(frame):
+    frame = frame.copy()
+    for column in frame.columns:
+        series = frame[column]
+        if series.dtype == object:
+            kind = pd.api.types.infer_dtype(series, skipna=True)
+            if kind not in ("string", "empty"):
+                # Mixed cells (e.g. numbers typed into a text column) are stored as text
+                series = series.where(series.isna(), series.astype(str))
+        if column in CATEGORICAL_COLUMNS:
+            series = series.astype('category')
+        frame[column] = series
+    return frame
+
+
+# Function to convert every sheet of a workbook into Parquet snapshots.
+# Nothing is rebuilt while the stored hash matches the workbook, unless force is set.
+def build_snapshot(path, force=False):
+    with _lock:
+        digest = workbook_hash(path)
+        manifest = read_manifest(path)
+        if not force and manifest is not None and manifest.get('source_hash') == digest:
+            return manifest
+
+        folder, manifest_path = snapshot_paths(path)
+        os.makedirs(folder, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(path))[0]
+
+        sheets = pd.read_excel(path, sheet_name=None)
+        files = {}
+        for index, (sheet_name, frame) in enumerate(sheets.items()):
+            filename = f"{stem}.sheet{index}.parquet"
+            tmp_path = os.path.join(folder, filename + ".tmp")
+            prepare_for_arrow(frame).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, os.path.join(folder, filename))
+            files[sheet_name] = filename
+
+        manifest = {
+            'source': os.path.basename(path),
+            'source_hash': digest,
+            'sheets': list(sheets),
+            'files': files,
+        }
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(manifest, file, indent=4)
+        os.replace(tmp_path, manifest_path)
+        return manifest
+
+
+# Function to read one sheet (by name or position) from the workbook's snapshot.
+# Categorical columns come back as plain labels, as the page groupbys expect.
+def read_sheet(path, sheet_name=0):
+    manifest = build_snapshot(path)
+    if isinstance(sheet_name, int):
+        sheet_name = manifest['sheets'][sheet_name]
+
+    folder, _ = snapshot_paths(path)
+    frame = pd.read_parquet(os.path.join(folder, manifest['files'][sheet_name]))
+    for column in frame.select_dtypes('category').columns:
+        frame[column] = frame[column].astype(object)
+    return frame
+
+
+# Command line entry point for pre-building snapshots during the quarterly data refresh
+def main():
+    parser = argparse.ArgumentParser(description="Build Parquet snapshots of the dashboard workbooks.")
+    parser.add_argument('workbooks', nargs='*', default=WORKBOOKS, help="Workbooks to convert (default: all known workbooks)")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the workbook is unchanged")
+    args = parser.parse_args()
+
+    for path in args.workbooks:
+        if not os.path.exists(path):
+            print(f"Skipping {path}: file not found")
+            continue
+        manifest = build_snapshot(path, force=args.force)
+        print(f"{path}: {len(manifest['sheets'])} sheet(s) -> {SNAPSHOT_DIR}/ ({manifest['source_hash'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
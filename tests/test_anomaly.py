@@ -0,0 +1,97 @@
+import glob
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from anomaly import anomaly_paths, anomaly_scores, load_anomaly_model, score_anomalies
+
+
+# Function to generate claims with the anomaly model's features
+def synthetic_claims(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    amounts = rng.lognormal(9, 1, n).round()
+    return pd.DataFrame({
+        'Claim ID': [f"C{i}" for i in range(n)],
+        'Claim Amount': amounts,
+        'Approved Claim Amount': amounts * rng.choice([0, 1], n),
+        'Amount Discrepancy': amounts * rng.random(n),
+        'Provider Claim Count': rng.integers(1, 50, n),
+        'Member Claim Count': rng.integers(1, 10, n),
+        'Claim Type': rng.choice(['Outpatient', 'Dental', 'Inpatient'], n),
+        'Source': rng.choice(['Hospital', 'Pharmacy'], n),
+    })
+
+
+@pytest.fixture
+def claims_path(tmp_path, monkeypatch):
+    # A workbook of its own, so the model and scores are stored under the test's folder
+    path = tmp_path / "Claims.xlsx"
+    path.write_bytes(b"claims")
+    monkeypatch.setattr('anomaly._models', {})
+    return str(path)
+
+
+# Function to list the stored score files of a claims workbook
+def stored_scores(claims_path):
+    return glob.glob(anomaly_paths(claims_path, '*')['scores'])
+
+
+def test_scores_are_reused_while_the_features_are_unchanged(claims_path):
+    claims = synthetic_claims()
+    first = anomaly_scores(claims, claims_path)
+    os.utime(stored_scores(claims_path)[0], ns=(0, 0))
+
+    assert np.array_equal(anomaly_scores(claims, claims_path), first)
+    assert os.stat(stored_scores(claims_path)[0]).st_mtime_ns == 0
+
+
+def test_appended_claims_are_scored_and_earlier_scores_are_kept(claims_path, monkeypatch):
+    claims = synthetic_claims()
+    first = anomaly_scores(claims, claims_path)
+    model = load_anomaly_model(claims, claims_path)
+
+    # New claims of a provider raise the provider claim count of its earlier claims
+    added = synthetic_claims(10, seed=1).assign(**{'Claim ID': lambda df: "N" + df['Claim ID']})
+    changed = claims.assign(**{'Provider Claim Count': claims['Provider Claim Count'] * 10})
+    appended = pd.concat([added, changed], ignore_index=True)
+
+    scored = []
+
+    def counted_scores(model, frame):
+        scored.append(list(frame['Claim ID']))
+        return score_anomalies(model, frame)
+    monkeypatch.setattr('anomaly.score_anomalies', counted_scores)
+    scores = anomaly_scores(appended, claims_path)
+
+    assert load_anomaly_model(appended, claims_path) is model
+    assert scored == [list(added['Claim ID'])]
+    assert np.array_equal(scores[len(added):], first)
+    assert np.array_equal(scores[:len(added)], score_anomalies(model, added))
+    assert len(stored_scores(claims_path)) == 1
+
+
+def test_every_claim_is_rescored_when_the_model_is_retrained(claims_path):
+    claims = synthetic_claims()
+    anomaly_scores(claims, claims_path)
+    first_key = load_anomaly_model(claims, claims_path)['key']
+
+    # The workbook was replaced before the model was retrained offline
+    with open(claims_path, 'wb') as file:
+        file.write(b"other claims")
+    scores = anomaly_scores(claims, claims_path, retrain=True)
+    model = load_anomaly_model(claims, claims_path)
+
+    assert model['key'] != first_key
+    assert np.array_equal(scores, score_anomalies(model, claims))
+    assert stored_scores(claims_path) == [anomaly_paths(claims_path, model['key'])['scores']]
+
+
+def test_models_of_other_features_are_retrained(claims_path, monkeypatch):
+    claims = synthetic_claims()
+    anomaly_scores(claims, claims_path)
+
+    monkeypatch.setattr('anomaly._models', {})
+    monkeypatch.setattr('anomaly.ANOMALY_NUMERIC', ['Claim Amount', 'Approved Claim Amount'])
+    model = load_anomaly_model(claims, claims_path)
+
+    assert model['features'] == ['Claim Amount', 'Approved Claim Amount', 'Claim Type', 'Source']
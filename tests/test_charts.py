@@ -0,0 +1,91 @@
+import json
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import pytest
+import charts
+from charts import cached_chart, category_chart, chart_key, data_version
+
+
+@pytest.fixture(autouse=True)
+def figures(monkeypatch):
+    # An empty figure cache of its own for each test
+    monkeypatch.setattr('charts._figures', OrderedDict())
+    monkeypatch.setattr('charts._figure_bytes', 0)
+    return charts._figures
+
+
+# Function to build a chart of the claim amount per month, counting the builds
+def monthly_chart(builds, seed=0):
+    def build():
+        builds.append(seed)
+        frame = pd.DataFrame({'Month': np.arange(1, 13), 'Claim Amount': np.random.default_rng(seed).uniform(0, 1e6, 12)})
+        return category_chart(frame, 'Month', 'Claim Amount', text='%.1fM', text_scale=1e6, height=450)
+    return build
+
+
+def test_cached_figures_are_the_figures_built():
+    builds = []
+    selection = {'data': 0, 'filters': {'Product': []}, 'range': ("January 2024", "December 2024")}
+    built = cached_chart(selection, 'monthly claims', monthly_chart(builds))
+    cached = cached_chart(selection, 'monthly claims', monthly_chart(builds))
+
+    assert builds == [0]
+    assert json.loads(cached.to_json()) == json.loads(built.to_json())
+
+
+def test_other_selections_and_charts_are_built_again():
+    builds = []
+    selection = {'data': 0, 'filters': {'Product': []}}
+    cached_chart(selection, 'monthly claims', monthly_chart(builds, 0))
+    cached_chart({**selection, 'filters': {'Product': ['ProActiv']}}, 'monthly claims', monthly_chart(builds, 1))
+    cached_chart(selection, 'monthly average', monthly_chart(builds, 2))
+
+    assert builds == [0, 1, 2]
+
+
+def test_the_cache_is_bounded_by_the_size_of_the_figures(figures, monkeypatch):
+    builds = []
+    size = len(monthly_chart(builds)().to_json().encode())
+    monkeypatch.setattr('charts.FIGURE_CACHE_BYTES', 2 * size + size // 2)
+
+    for month in ["January", "February", "March"]:
+        cached_chart({'range': month}, 'monthly claims', monthly_chart(builds))
+
+    assert list(figures) == [chart_key({'range': month}, 'monthly claims') for month in ["February", "March"]]
+    assert charts._figure_bytes == 2 * size
+
+
+def test_frames_in_a_key_are_hashed_by_their_values():
+    frame = pd.DataFrame({'Claim Amount': [1.0, 2.0]})
+
+    assert chart_key({'data': frame}, 'chart') == chart_key({'data': frame.copy()}, 'chart')
+    assert chart_key({'data': frame}, 'chart') != chart_key({'data': frame.assign(**{'Claim Amount': [1.0, 3.0]})}, 'chart')
+    assert chart_key({'as_of': pd.Timestamp('2024-06-30')}, 'chart') != chart_key({'as_of': pd.Timestamp('2024-07-31')}, 'chart')
+
+
+def test_values_without_a_stable_hash_cannot_key_a_chart():
+    with pytest.raises(TypeError):
+        chart_key({'data': object()}, 'chart')
+
+
+def test_frames_keep_their_version_while_they_are_alive():
+    frame = pd.DataFrame({'Claim Amount': [1.0]})
+
+    assert data_version(frame) == data_version(frame)
+    assert data_version(frame) != data_version(frame.copy())
+
+
+def test_a_new_data_version_or_filter_selection_misses_the_cache():
+    builds = []
+    claims = pd.DataFrame({'Claim Amount': [1.0, 2.0]})
+    selection = {'page': 'overview', 'data': data_version(claims), 'filters': {'Year': [2024], 'Product': []}}
+    cached_chart(selection, 'monthly claims', monthly_chart(builds, 0))
+    cached_chart(dict(selection), 'monthly claims', monthly_chart(builds, 0))
+
+    # Reloaded claims get a new version, even with the same values
+    cached_chart({**selection, 'data': data_version(claims.copy())}, 'monthly claims', monthly_chart(builds, 1))
+    cached_chart({**selection, 'filters': {'Year': [2023], 'Product': []}}, 'monthly claims', monthly_chart(builds, 2))
+    cached_chart({**selection, 'filters': {'Year': [2024], 'Product': ['ProActiv']}}, 'monthly claims', monthly_chart(builds, 3))
+
+    assert builds == [0, 1, 2, 3]
@@ -0,0 +1,92 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from collusion import MIN_EDGE_CLAIMS, provider_member_graph, provider_overlap, suspicious_clusters
+
+
+# Function to generate claims between random providers and members, some names missing
+def random_claims(rng, n=2_000):
+    return pd.DataFrame({
+        'Provider Name': rng.choice([f"PROVIDER {i}" for i in range(30)] + [None], n),
+        'Member Name': rng.choice([f"MEMBER {i}" for i in range(300)] + [None], n),
+    })
+
+
+# Function to plant a ring: every provider of the ring claims repeatedly for every member of it
+def ring_claims(providers, members, claims=MIN_EDGE_CLAIMS):
+    rows = [(provider, member) for provider in providers for member in members for _ in range(claims)]
+    return pd.DataFrame(rows, columns=['Provider Name', 'Member Name'])
+
+
+# Function to key the measured overlap by unordered provider pair: (shared members, overlap)
+def overlap_by_pair(overlap):
+    return {
+        frozenset((row['Provider'], row['Other Provider'])): (row['Shared Members'], row['Overlap'])
+        for _, row in overlap.iterrows()
+    }
+
+
+def test_the_graph_counts_the_claims_of_each_provider_and_member():
+    claims = random_claims(np.random.default_rng(0))
+    graph, providers, members = provider_member_graph(claims)
+
+    expected = claims.dropna().groupby(['Provider Name', 'Member Name']).size()
+    edges = graph.tocoo()
+    counted = pd.Series(edges.data, index=pd.MultiIndex.from_arrays([providers[edges.row], members[edges.col]]))
+    pd.testing.assert_series_equal(counted.sort_index(), expected.sort_index().astype(float), check_names=False)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_overlap_matches_the_shared_members_of_each_pair(seed):
+    claims = random_claims(np.random.default_rng(seed), n=500)
+    graph, providers, members = provider_member_graph(claims)
+    overlap = provider_overlap(graph, providers)
+
+    served = claims.dropna().groupby('Provider Name')['Member Name'].agg(set)
+    expected = {}
+    for provider, other in itertools.combinations(served.index, 2):
+        shared = served[provider] & served[other]
+        if shared:
+            expected[frozenset((provider, other))] = (len(shared), len(shared) / len(served[provider] | served[other]))
+
+    measured = overlap_by_pair(overlap)
+    assert measured.keys() == expected.keys()
+    for pair, (shared, jaccard) in expected.items():
+        assert measured[pair][0] == shared
+        assert measured[pair][1] == pytest.approx(jaccard)
+    assert overlap['Overlap'].is_monotonic_decreasing
+
+
+def test_overlap_is_symmetric():
+    claims = random_claims(np.random.default_rng(1), n=500)
+    forward = provider_overlap(*provider_member_graph(claims)[:2])
+    # Reversed claims number the providers the other way round, so each pair comes in the other order
+    backward = provider_overlap(*provider_member_graph(claims.iloc[::-1])[:2])
+
+    forward, backward = overlap_by_pair(forward), overlap_by_pair(backward)
+    assert forward.keys() == backward.keys()
+    for pair, (shared, jaccard) in forward.items():
+        assert backward[pair][0] == shared
+        assert backward[pair][1] == pytest.approx(jaccard)
+
+
+def test_a_planted_ring_is_the_most_suspicious_cluster():
+    rng = np.random.default_rng(2)
+    ring_providers = ["RING CLINIC", "RING PHARMACY", "RING LAB"]
+    ring_members = [f"RING MEMBER {i}" for i in range(5)]
+    # Random claims are spread too thin to tie anyone: one claim per provider/member pair at most
+    claims = random_claims(rng).dropna().drop_duplicates()
+    claims = pd.concat([claims, ring_claims(ring_providers, ring_members, MIN_EDGE_CLAIMS + 1)], ignore_index=True)
+    clusters = suspicious_clusters(*provider_member_graph(claims))
+
+    assert len(clusters) == 1
+    ring = clusters.iloc[0]
+    assert set(ring['Provider Names'].split(', ')) == set(ring_providers)
+    assert (ring['Providers'], ring['Members'], ring['Claims']) == (3, 5, 3 * 5 * (MIN_EDGE_CLAIMS + 1))
+    assert ring['Density'] == 1
+
+
+def test_ties_below_the_minimum_claims_do_not_form_clusters():
+    claims = ring_claims(["A", "B"], ["X", "Y"], MIN_EDGE_CLAIMS - 1)
+    assert suspicious_clusters(*provider_member_graph(claims)).empty
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from claims_data import period_key
+from cube import rollup, selection_cube
+from filters import apply_filters, filter_month_year_range
+
+
+# Aggregations of the pages, as pandas named aggregations: output column -> (column, statistic)
+AGGREGATIONS = {
+    'Claims': ('Claim ID', 'size'),
+    'Claim IDs': ('Claim ID', 'count'),
+    'Approved Claims': ('Approved Claim Amount', 'count'),
+    'Total Amount': ('Claim Amount', 'sum'),
+    'Approved Amount': ('Approved Claim Amount', 'sum'),
+    'Average Amount': ('Claim Amount', 'mean'),
+    'Average Approved': ('Approved Claim Amount', 'mean'),
+    'Amount Spread': ('Claim Amount', 'std'),
+    'Approved Spread': ('Approved Claim Amount', 'std'),
+}
+
+
+# Function to generate claims with the cube's dimensions and measures, some values missing and
+# an employer column the cube does not have
+def synthetic_claims(rng, n=4_000):
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n), unit='D')
+    amounts = rng.lognormal(9, 1, n).round(2)
+    claims = pd.DataFrame({
+        'Claim ID': [f"C{i}" for i in range(n)],
+        'Year': dates.year,
+        'Month': dates.strftime('%B'),
+        'Quarter': "Q" + pd.Series(dates.quarter).astype(str),
+        'Product': rng.choice(['Health Insurance', 'ProActiv'], n),
+        'Claim Type': rng.choice(['Outpatient', 'Dental', 'Optical', 'Inpatient', None], n),
+        'Claim Status': rng.choice(['Approved', 'Declined'], n),
+        'Source': rng.choice(['Hospital', 'Pharmacy', 'Clinic'], n),
+        'Employer Name': rng.choice(['ACME', 'BETA', 'GAMMA'], n),
+        'Claim Amount': amounts,
+        'Approved Claim Amount': np.where(rng.random(n) < 0.3, np.nan, amounts * rng.random(n)),
+    })
+    claims['Period'] = period_key(claims['Month'], claims['Year'])
+    return claims
+
+
+# Function to roll the selection up from the cube, and aggregate its rows with a groupby
+def cube_and_groupby(claims, filters, month_year_range, by):
+    df, _ = apply_filters(claims, filters)
+    df = filter_month_year_range(df, month_year_range)
+    cube = rollup(selection_cube(claims, df, filters, month_year_range), by, AGGREGATIONS)
+    return cube, df.groupby(by).agg(**AGGREGATIONS)
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'Year': [2024], 'Month': []},
+    {'Product': ['ProActiv'], 'Claim Status': ['Declined']},
+    {'Claim Type': [None, 'Dental'], 'Source': ['Pharmacy', 'Clinic']},
+    # The employer is not a cube dimension: the cube is built from the filtered rows instead
+    {'Employer Name': ['BETA'], 'Quarter': ['Q2', 'Q3']},
+])
+@pytest.mark.parametrize('by', [['Month'], ['Year', 'Quarter'], ['Product', 'Claim Type'], ['Source', 'Claim Status']])
+def test_rollups_match_a_groupby_of_the_filtered_claims(filters, by):
+    cube, expected = cube_and_groupby(synthetic_claims(np.random.default_rng(0)), filters, ("March 2023", "August 2024"), by)
+
+    pd.testing.assert_frame_equal(cube, expected, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+def test_std_matches_the_sample_std_and_is_missing_for_single_claims():
+    claims = synthetic_claims(np.random.default_rng(1), n=300)
+    cube, expected = cube_and_groupby(claims, {}, ("January 2023", "December 2024"), ['Year', 'Month', 'Claim Type'])
+
+    # Small groups, with groups of a single approved amount
+    assert (expected['Approved Claims'] == 1).any()
+    assert cube['Approved Spread'].isna().equals(expected['Approved Spread'].isna())
+    np.testing.assert_allclose(cube['Amount Spread'], expected['Amount Spread'], rtol=1e-6)
+    np.testing.assert_allclose(cube['Approved Spread'], expected['Approved Spread'], rtol=1e-6)
+
+
+def test_the_fallback_cube_keeps_the_selected_rows_only():
+    claims = synthetic_claims(np.random.default_rng(2))
+    filters = {'Employer Name': ['ACME', 'GAMMA'], 'Product': ['Health Insurance']}
+    cube, expected = cube_and_groupby(claims, filters, ("December 2023", "January 2024"), ['Year', 'Month'])
+
+    assert cube.index.tolist() == [(2023, 'December'), (2024, 'January')]
+    pd.testing.assert_frame_equal(cube, expected, check_dtype=False, check_exact=False, rtol=1e-9)
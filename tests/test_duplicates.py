@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from duplicates import DUPLICATE_WINDOW_DAYS, candidate_duplicates, duplicate_groups
+
+
+# Function to build claims from (member, provider, ICD-10 code, created date, amount)
+def claims(rows):
+    df = pd.DataFrame(rows, columns=['Member Name', 'Provider Name', 'ICD-10 Code', 'Claim Created Date', 'Claim Amount'])
+    df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'])
+    df['Claim ID'] = [f"C{i}" for i in range(len(df))]
+    df['Claim Status'] = 'Approved'
+    return df
+
+
+def test_resubmissions_are_grouped():
+    groups = duplicate_groups(claims([
+        ('ANN', 'CLINIC', 'J06', '2024-03-01', 1_000),
+        ('BOB', 'CLINIC', 'J06', '2024-03-01', 1_000),   # another member
+        ('ANN', 'CLINIC', 'J06', '2024-03-02', 1_010),   # resubmitted a day later
+        ('ANN', 'CLINIC', 'J06', '2024-03-20', 1_000),   # outside the window
+        ('ANN', 'CLINIC', 'J06', '2024-03-21', 2_000),   # amount too different
+        ('ANN', 'CLINIC', 'J06', None, 1_000),           # no date
+    ]))
+
+    assert groups.tolist() == [0, -1, 0, -1, -1, -1]
+
+
+def test_long_chains_of_near_identical_claims_form_one_group():
+    n = 10_000
+    days = pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(n) * DUPLICATE_WINDOW_DAYS, unit='D')
+    chain = claims([('ANN', 'CLINIC', 'J06', day, 1_000) for day in days])
+    groups = duplicate_groups(chain.iloc[::-1])
+
+    assert (groups == 0).all()
+
+
+def test_candidates_need_two_claims_of_the_group_in_the_selection():
+    df = claims([
+        ('ANN', 'CLINIC', 'J06', '2024-03-01', 1_000),
+        ('ANN', 'CLINIC', 'J06', '2024-03-02', 1_000),
+        ('BOB', 'CLINIC', 'J06', '2024-05-01', 500),
+        ('BOB', 'CLINIC', 'J06', '2024-05-01', 500),
+    ])
+    df['Duplicate Group'] = duplicate_groups(df)
+
+    assert candidate_duplicates(df)['Claim ID'].tolist() == ['C0', 'C1', 'C2', 'C3']
+    assert candidate_duplicates(df.iloc[1:])['Claim ID'].tolist() == ['C2', 'C3']
+
+
+def test_no_claims():
+    assert len(duplicate_groups(claims([]))) == 0
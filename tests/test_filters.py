@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+from claims_data import period_key
+from filters import apply_filters, filter_month_year_range, month_year_options
+
+
+# Function to generate claims with the sidebar's filter columns, some values missing
+def synthetic_claims(rng, n=2_000):
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n), unit='D')
+    claims = pd.DataFrame({
+        'Year': dates.year,
+        'Month': dates.strftime('%B'),
+        'Quarter': "Q" + pd.Series(dates.quarter).astype(str),
+        'Product': rng.choice(['Health Insurance', 'ProActiv', None], n),
+        'Claim Type': rng.choice(['Outpatient', 'Dental', 'Optical', np.nan], n),
+        'Claim Status': rng.choice(['Approved', 'Declined'], n),
+        'Provider Name': rng.choice([f"PROVIDER {i}" for i in range(20)] + [None], n),
+        'Claim Amount': rng.lognormal(9, 1, n),
+    })
+    claims['Month-Year'] = claims['Month'] + ' ' + claims['Year'].astype(str)
+    claims['Period'] = period_key(claims['Month'], claims['Year'])
+    return claims
+
+
+# Function to filter the claims the way the pages did before apply_filters: one isin per selection
+def chained_filters(df, filters):
+    for column, values in filters.items():
+        if values:
+            df = df[df[column].isin(values)]
+    return df
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'Year': [], 'Product': []},
+    {'Year': [2024]},
+    {'Month': ['January', 'December'], 'Quarter': ['Q1']},
+    {'Product': ['ProActiv'], 'Claim Status': ['Declined'], 'Claim Type': []},
+    {'Claim Type': [np.nan]},
+    {'Claim Type': [np.nan, 'Dental'], 'Product': [None, 'Health Insurance']},
+    {'Provider Name': ['PROVIDER 3', 'PROVIDER 7', 'NOT A PROVIDER']},
+    {'Product': ['Unknown']},
+])
+def test_apply_filters_matches_chained_isin_filters(filters):
+    claims = synthetic_claims(np.random.default_rng(0))
+    filtered, _ = apply_filters(claims, filters)
+    pd.testing.assert_frame_equal(filtered, chained_filters(claims, filters))
+
+
+def test_filters_on_columns_the_frame_does_not_have_are_ignored():
+    claims = synthetic_claims(np.random.default_rng(1))
+    filtered, description = apply_filters(claims, {'Outlier Level': ['High'], 'Year': [2023]}, ['Year', 'Outlier Level'])
+
+    pd.testing.assert_frame_equal(filtered, chained_filters(claims, {'Year': [2023]}))
+    assert description == "2023 High "
+
+
+def test_an_empty_selection_keeps_every_claim():
+    claims = synthetic_claims(np.random.default_rng(2))
+    filtered, description = apply_filters(claims, {'Year': [], 'Month': []}, ['Year', 'Month'])
+
+    assert filtered is claims
+    assert description == "All data"
+
+
+@pytest.mark.parametrize('selected_range', [
+    ("November 2023", "February 2024"),
+    ("December 2023", "January 2024"),
+    ("January 2023", "December 2024"),
+    ("March 2024", "March 2024"),
+])
+def test_a_month_year_range_across_the_year_boundary_keeps_the_months_between(selected_range):
+    claims = synthetic_claims(np.random.default_rng(3))
+    labels = month_year_options(claims)
+    start, end = labels.index(selected_range[0]), labels.index(selected_range[1])
+
+    filtered = filter_month_year_range(claims, selected_range)
+    pd.testing.assert_frame_equal(filtered, claims[claims['Month-Year'].isin(labels[start:end + 1])])
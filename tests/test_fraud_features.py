@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+import fraud_features
+from fraud_features import features_key, load_fraud_features
+
+
+@pytest.fixture
+def workbooks(tmp_path, monkeypatch):
+    # Claims workbook and rules of their own; the features are a frame of the build's count
+    paths = {'claims': str(tmp_path / "Claims.xlsx"), 'rules': str(tmp_path / "fraud_rules.json")}
+    for path in paths.values():
+        with open(path, 'wb') as file:
+            file.write(b"0")
+    builds = []
+    monkeypatch.setattr('fraud_features._features', {})
+    monkeypatch.setattr('fraud_features.load_claims', lambda path: None)
+    monkeypatch.setattr('fraud_features.load_rules', lambda path: None)
+    monkeypatch.setattr('fraud_features.build_fraud_features',
+                        lambda *args: builds.append(args) or pd.DataFrame({'Fraud Score': [len(builds)]}))
+    return {**paths, 'builds': builds}
+
+
+def test_features_of_older_versions_are_dropped_from_memory(workbooks):
+    first = load_fraud_features(workbooks['claims'], workbooks['rules'])
+    assert load_fraud_features(workbooks['claims'], workbooks['rules']) is first
+
+    with open(workbooks['claims'], 'wb') as file:
+        file.write(b"00")
+    load_fraud_features(workbooks['claims'], workbooks['rules'])
+
+    assert len(workbooks['builds']) == 2
+    assert list(fraud_features._features) == [features_key(workbooks['claims'], workbooks['rules'])]
@@ -0,0 +1,48 @@
+import pandas as pd
+from fraud_rules import created_time_mask, score_claims
+
+
+# The after-hours rule of fraud_rules.json
+CREATED_TIME_RULE = {
+    'name': "Weekend or after-hours creation", 'type': 'created_time', 'column': 'Claim Created Date',
+    'weekend': True, 'start_hour': 7, 'end_hour': 19, 'weight': 1,
+}
+
+
+# Function to build claims created at the given times
+def created(times):
+    return pd.DataFrame({'Claim Created Date': pd.to_datetime(times)})
+
+
+def test_claims_created_after_hours_or_at_the_weekend():
+    # Friday 06:59, Friday 07:00, Friday 18:59, Friday 19:00, Saturday noon
+    frame = created(['2024-03-01 06:59', '2024-03-01 07:00', '2024-03-01 18:59', '2024-03-01 19:00', '2024-03-02 12:00'])
+
+    assert created_time_mask(frame, CREATED_TIME_RULE).tolist() == [True, False, False, True, True]
+
+
+def test_dates_without_a_time_of_day_are_only_checked_for_the_weekend():
+    # Thursday, Friday, Saturday, Sunday, and a missing date
+    frame = created(['2024-02-29', '2024-03-01', '2024-03-02', '2024-03-03', None])
+
+    assert created_time_mask(frame, CREATED_TIME_RULE).tolist() == [False, False, True, True, False]
+
+
+def test_dates_with_and_without_a_time_of_day_are_checked_row_by_row():
+    # Friday 03:00, Friday (no time), Friday 12:00, Saturday (no time), Friday 22:30
+    frame = created(['2024-03-01 03:00', '2024-03-01 00:00', '2024-03-01 12:00', '2024-03-02 00:00', '2024-03-01 22:30'])
+
+    assert created_time_mask(frame, CREATED_TIME_RULE).tolist() == [True, False, False, True, True]
+
+
+def test_scores_weigh_the_rules_hit():
+    frame = created(['2024-03-01 12:00', '2024-03-02 12:00']).assign(**{'Claim Type': 'Dental', 'Claim Amount': [100.0, 900.0]})
+    rules = [
+        CREATED_TIME_RULE,
+        {'name': "High amount", 'type': 'amount_threshold', 'column': 'Claim Amount', 'by': 'Claim Type',
+         'thresholds': {'Dental': 500}, 'default': 1_000, 'weight': 3},
+    ]
+    scores = score_claims(frame, rules)
+
+    assert scores['Fraud Score'].tolist() == [0, 4]
+    assert scores['Fraud Rules'].tolist() == ["", "Weekend or after-hours creation; High amount"]
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from claims_data import period_key
+from filters import apply_filters, filter_month_year_range
+from frequency import rolling_claim_counts, selection_top_k
+
+
+# Function to generate claims with the index's dimensions, a few providers and members (some
+# missing) and creation dates over two years (some missing)
+def synthetic_claims(rng, n=3_000):
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n), unit='D')
+    claims = pd.DataFrame({
+        'Claim Created Date': dates,
+        'Product': rng.choice(['Health Insurance', 'ProActiv'], n),
+        'Claim Type': rng.choice(['Outpatient', 'Dental', 'Optical', None], n),
+        'Claim Status': rng.choice(['Approved', 'Declined'], n),
+        'Source': rng.choice(['Hospital', 'Pharmacy'], n),
+        'Employer Name': rng.choice(['ACME', 'BETA', 'GAMMA'], n),
+        'Provider Name': rng.choice([f"PROVIDER {i}" for i in range(40)] + [None], n),
+        'Member Name': rng.choice([f"MEMBER {i}" for i in range(200)] + [None], n),
+    })
+    claims['Year'] = claims['Claim Created Date'].dt.year
+    claims['Month'] = claims['Claim Created Date'].dt.strftime('%B')
+    claims['Quarter'] = "Q" + claims['Claim Created Date'].dt.quarter.astype(str)
+    claims['Period'] = period_key(claims['Month'], claims['Year'])
+    claims['Claim Created Date'] = claims['Claim Created Date'].where(rng.random(n) > 0.02)
+    return claims
+
+
+# Function to find the k entities with the most claims by counting the filtered rows
+def naive_top_k(claims, filters, month_year_range, entity, k=5):
+    df, _ = apply_filters(claims, filters)
+    counts = filter_month_year_range(df, month_year_range).groupby(entity).size().nlargest(k)
+    return pd.DataFrame({entity: counts.index, 'Claim Count': counts.to_numpy()})
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'Year': [2024], 'Month': []},
+    {'Product': ['ProActiv'], 'Claim Status': ['Declined']},
+    {'Claim Type': [None, 'Dental'], 'Source': ['Pharmacy']},
+    {'Quarter': ['Q1', 'Q4'], 'Claim Type': ['Optical']},
+    {'Employer Name': ['BETA']},
+    {'Product': ['Unknown']},
+])
+@pytest.mark.parametrize('entity', ['Provider Name', 'Member Name'])
+def test_selection_top_k_matches_counting_the_filtered_rows(filters, entity):
+    claims = synthetic_claims(np.random.default_rng(0))
+    month_year_range = ("March 2023", "February 2024")
+    df, _ = apply_filters(claims, filters)
+    df = filter_month_year_range(df, month_year_range)
+
+    top = selection_top_k(claims, df, filters, month_year_range, entity)
+    expected = naive_top_k(claims, filters, month_year_range, entity)
+    pd.testing.assert_frame_equal(top, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('days', [1, 7, 30])
+def test_rolling_claim_counts_match_a_naive_window_count(days):
+    claims = synthetic_claims(np.random.default_rng(1), n=800)
+    day = claims['Claim Created Date'].dt.normalize()
+
+    expected = []
+    for member, created in zip(claims['Member Name'], day):
+        if pd.isna(member) or pd.isna(created):
+            expected.append(0)
+            continue
+        same = (claims['Member Name'] == member) & day.between(created - pd.Timedelta(days=days - 1), created)
+        expected.append(int(same.sum()))
+
+    assert rolling_claim_counts(claims, 'Member Name', days).tolist() == expected
@@ -0,0 +1,288 @@
+import numpy as np
+import pandas as pd
+import pytest
+import glob
+import os
+from collections import OrderedDict
+import loss_ratio_model
+from loss_ratio_model import (
+    MODEL_FRAMES, aggregate_claims, build_loss_ratio_model, compute_loss_ratios, contained_in_windows,
+    load_loss_ratio_model, model_paths, update_loss_ratio_model,
+)
+
+
+AS_OF = pd.Timestamp('2024-06-30')
+
+
+# Function to build premium rows for compute_loss_ratios from (prioritized, start, end, premium, approved claims)
+def premium_rows(rows):
+    df = pd.DataFrame(rows, columns=['Is_Prioritized', 'Start Date', 'End Date', 'Total Premium', 'Approved Claims'])
+    df['Start Date'] = pd.to_datetime(df['Start Date'])
+    df['End Date'] = pd.to_datetime(df['End Date'])
+    df['Number of Claims'] = (df['Approved Claims'] > 0).astype(int)
+    df['Total Claims'] = df['Approved Claims'] * 2
+    return df
+
+
+# Function to build cover windows of one client/product/year
+def windows(spans, client='ACME', product='Health Insurance', year=2024):
+    return pd.DataFrame({
+        'Client Name': client, 'Product': product, 'Year': year,
+        'Start Date': pd.to_datetime([start for start, _ in spans]),
+        'End Date': pd.to_datetime([end for _, end in spans]),
+    })
+
+
+# Function to build claims from (client, created date, claim amount)
+def claims(rows):
+    df = pd.DataFrame(rows, columns=['Client Name', 'Claim Created Date', 'Claim Amount'])
+    df['Claim Created Date'] = pd.to_datetime(df['Claim Created Date'])
+    df['Claim ID'] = [f"C{i}" for i in range(len(df))]
+    df['Product'] = 'Health Insurance'
+    df['Year'] = df['Claim Created Date'].dt.year
+    df['Approved Claim Amount'] = df['Claim Amount'] / 2
+    return df
+
+
+# Function to build a premiums sheet from (client, product, cover type, start, end, total)
+def premiums(rows):
+    df = pd.DataFrame(rows, columns=['Client Name', 'Product', 'Cover Type', 'Start Date', 'End Date', 'Total'])
+    df['Start Date'] = pd.to_datetime(df['Start Date'])
+    df['End Date'] = pd.to_datetime(df['End Date'])
+    df['Month'] = df['Start Date'].dt.strftime('%B')
+    df['Year'] = df['Start Date'].dt.year
+    return df
+
+
+# Function to generate a random book: premiums of a few clients and products over two years
+# (policies, some overlapping, and endorsements) and whole-amount claims in and out of cover,
+# some without a date
+def random_book(rng, n_claims=400):
+    rows = []
+    for client in ['ACME', 'BETA', 'GAMMA', 'DELTA']:
+        for product in ['Health Insurance', 'ProActiv']:
+            for year in [2023, 2024]:
+                for _ in range(rng.integers(0, 3)):
+                    start = pd.Timestamp(year, rng.integers(1, 13), rng.integers(1, 29))
+                    end = start + pd.Timedelta(days=int(rng.integers(0, 400)))
+                    cover = rng.choice(['New', 'Renewal', 'Endorsement', 'Endorsement'])
+                    rows.append((client, product, cover, start, end, float(rng.integers(1, 1_000) * 1_000)))
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, n_claims), unit='D')
+    claims = pd.DataFrame({
+        'Claim ID': [f"C{i}" for i in range(n_claims)],
+        'Employer Name': rng.choice(['ACME', 'BETA', 'GAMMA', 'DELTA', 'OMEGA'], n_claims),
+        'Product': rng.choice(['Health Insurance', 'ProActiv'], n_claims),
+        'Claim Created Date': dates.where(rng.random(n_claims) > 0.02),
+        'Claim Amount': rng.integers(1, 100_000, n_claims).astype(float),
+    })
+    claims['Approved Claim Amount'] = (claims['Claim Amount'] * rng.integers(0, 2, n_claims)).where(rng.random(n_claims) > 0.1)
+    return premiums(rows), claims
+
+
+def test_earned_premium_and_loss_ratio_of_prioritized_rows():
+    df = compute_loss_ratios(premium_rows([(True, '2024-01-01', '2024-12-31', 366_000, 50_000)]), AS_OF)
+
+    assert df['Days Since Start'].tolist() == [181]
+    assert df['days_on_cover'].tolist() == [365]
+    assert df['Earned Premium'].iloc[0] == pytest.approx(366_000 * 181 / 365)
+    assert df['Loss Ratio Rate'].iloc[0] == pytest.approx(50_000 / (366_000 * 181 / 365) * 100)
+
+
+def test_claims_count_once_on_prioritized_rows_only():
+    df = compute_loss_ratios(premium_rows([
+        (True, '2024-01-01', '2024-12-31', 100_000, 40_000),
+        (False, '2024-01-01', '2024-12-31', 100_000, 40_000),
+    ]), AS_OF)
+
+    assert df['Number of Claims'].tolist() == [1, 0]
+    assert df['Total Claims'].tolist() == [80_000, 0]
+    assert df['Approved Claims'].tolist() == [40_000, 0]
+    assert df.loc[1, ['Days Since Start', 'days_on_cover', 'Earned Premium', 'Loss Ratio Rate']].tolist() == [0, 0, 0, 0]
+
+
+def test_days_since_start_clips_at_zero_before_the_cover_starts():
+    df = compute_loss_ratios(premium_rows([(True, '2024-09-01', '2025-08-31', 100_000, 10_000)]), AS_OF)
+
+    assert df['Days Since Start'].tolist() == [0]
+    assert df['Earned Premium'].tolist() == [0]
+    assert df['Loss Ratio Rate'].tolist() == [0]
+
+
+def test_zero_cover_length_earns_nothing():
+    df = compute_loss_ratios(premium_rows([(True, '2024-03-01', '2024-03-01', 100_000, 10_000)]), AS_OF)
+
+    assert df['Earned Premium'].tolist() == [0]
+    assert df['Loss Ratio Rate'].tolist() == [0]
+
+
+def test_empty_frame():
+    df = compute_loss_ratios(premium_rows([]), AS_OF)
+
+    assert df.empty
+    assert {'Days Since Start', 'days_on_cover', 'Earned Premium', 'Loss Ratio Rate'} <= set(df.columns)
+
+
+def test_containment_in_cover_windows():
+    items = claims([
+        ('ACME', '2024-02-15', 1),   # inside the first window
+        ('ACME', '2024-03-31', 1),   # on the last day of the first window
+        ('ACME', '2024-04-10', 1),   # between the windows
+        ('ACME', '2024-07-01', 1),   # inside the second window
+        ('OTHER', '2024-02-15', 1),  # no window for its client
+    ])
+    covered, has_cover = contained_in_windows(
+        items, 'Claim Created Date', 'Claim Created Date', windows([('2024-01-01', '2024-03-31'), ('2024-06-01', '2024-08-31')])
+    )
+
+    assert covered.tolist() == [True, True, False, True, False]
+    assert has_cover.tolist() == [True, True, True, True, False]
+
+
+def test_intervals_reaching_past_every_window_are_not_contained():
+    items = windows([('2024-02-01', '2024-05-15'), ('2024-02-01', '2024-09-15')])
+    contained, _ = contained_in_windows(
+        items, 'Start Date', 'End Date', windows([('2024-01-01', '2024-06-30'), ('2024-03-01', '2024-08-31')])
+    )
+
+    assert contained.tolist() == [True, False]
+
+
+def test_claims_count_once_where_cover_windows_overlap():
+    aggregated, unmatched = aggregate_claims(
+        claims([('ACME', '2024-03-15', 1_000), ('ACME', '2024-10-01', 500)]),
+        windows([('2024-01-01', '2024-06-30'), ('2024-03-01', '2024-08-31')]),
+    )
+
+    assert aggregated['Number of Claims'].tolist() == [1]
+    assert aggregated['Total Claims'].tolist() == [1_000]
+    assert aggregated['Approved Claims'].tolist() == [500]
+    assert unmatched['Reason'].tolist() == ["Outside cover window"]
+
+
+def test_endorsements_inside_a_policy_window_add_to_its_premium():
+    model = build_loss_ratio_model(premiums([
+        ('ACME', 'Health Insurance', 'Renewal', '2024-01-01', '2024-12-31', 100_000),
+        ('ACME', 'Health Insurance', 'Endorsement', '2024-03-01', '2024-12-31', 20_000),
+        ('ACME', 'Health Insurance', 'Endorsement', '2024-06-01', '2025-01-31', 5_000),
+        ('OTHER', 'Health Insurance', 'Endorsement', '2024-02-01', '2024-12-31', 7_000),
+    ]), claims([('ACME', '2024-04-01', 1_000)]).rename(columns={'Client Name': 'Employer Name'}), AS_OF)
+
+    acme = model['final_data'][model['final_data']['Client Name'] == 'ACME']
+    assert acme['Cover Type'].tolist() == ['Renewal']
+    assert acme['Endorsement Premium'].tolist() == [20_000]
+    assert acme['Total Premium'].tolist() == [120_000]
+    assert model['rejected_endorsements'][['Client Name', 'Reason']].values.tolist() == [
+        ['ACME', "Outside policy window"],
+        ['OTHER', "No policy for client/product/year"],
+    ]
+
+
+@pytest.mark.parametrize('seed', range(25))
+def test_incremental_update_matches_a_full_rebuild(seed):
+    rng = np.random.default_rng(seed)
+    df_premiums, book_claims = random_book(rng)
+    as_of = pd.Timestamp('2023-01-01') + pd.Timedelta(days=int(rng.integers(0, 730)))
+    split = rng.integers(0, len(book_claims) + 1)
+    prefix, suffix = book_claims.iloc[:split], book_claims.iloc[split:]
+
+    updated = update_loss_ratio_model(build_loss_ratio_model(df_premiums, prefix, as_of), suffix, as_of)
+    rebuilt = build_loss_ratio_model(df_premiums, pd.concat([prefix, suffix]), as_of)
+    for name in MODEL_FRAMES:
+        pd.testing.assert_frame_equal(updated[name], rebuilt[name], check_exact=True)
+
+
+@pytest.fixture
+def workbooks(tmp_path, monkeypatch):
+    # Premiums and claims workbooks of their own, read from the random book instead of Excel
+    df_premiums, book_claims = random_book(np.random.default_rng(0))
+    books = {'premiums': str(tmp_path / "Premiums.xlsx"), 'claims': str(tmp_path / "Claims.xlsx")}
+    for path in books.values():
+        with open(path, 'wb') as file:
+            file.write(b"0")
+    state = {'claims': book_claims.iloc[:300], 'builds': 0}
+
+    def build(*args):
+        state['builds'] += 1
+        return build_loss_ratio_model(*args)
+    monkeypatch.setattr('loss_ratio_model._models', OrderedDict())
+    monkeypatch.setattr('loss_ratio_model.read_premiums', lambda path: df_premiums)
+    monkeypatch.setattr('loss_ratio_model.load_claims', lambda path: state['claims'])
+    monkeypatch.setattr('loss_ratio_model.build_loss_ratio_model', build)
+    return {**books, 'state': state, 'premiums_frame': df_premiums, 'book_claims': book_claims}
+
+
+# Function to replace the claims workbook with a new version of the claims
+def write_claims(workbooks, claims, version):
+    workbooks['state']['claims'] = claims
+    with open(workbooks['claims'], 'wb') as file:
+        file.write(b"0" * (version + 1))
+
+
+# Function to list the stored artifact files of the premiums workbook
+def stored_models(workbooks):
+    return sorted(glob.glob(model_paths('*', workbooks['premiums'])['final_data']))
+
+
+def test_appended_claims_are_folded_into_the_stored_model(workbooks):
+    as_of = pd.Timestamp('2024-06-30')
+    load_loss_ratio_model(as_of, workbooks['premiums'], workbooks['claims'])
+    write_claims(workbooks, workbooks['book_claims'], 1)
+    loss_ratio_model._models.clear()
+    model = load_loss_ratio_model(as_of, workbooks['premiums'], workbooks['claims'])
+
+    rebuilt = build_loss_ratio_model(workbooks['premiums_frame'], workbooks['book_claims'], as_of)
+    assert workbooks['state']['builds'] == 1
+    for name in MODEL_FRAMES:
+        pd.testing.assert_frame_equal(model[name], rebuilt[name], check_exact=True)
+    assert len(stored_models(workbooks)) == 1
+
+    # The folded model is the current artifact
+    loss_ratio_model._models.clear()
+    stored = load_loss_ratio_model(as_of, workbooks['premiums'], workbooks['claims'])
+    pd.testing.assert_frame_equal(stored['final_data'], rebuilt['final_data'], check_exact=True)
+    assert workbooks['state']['builds'] == 1
+
+
+def test_edited_claims_rebuild_the_model(workbooks):
+    as_of = pd.Timestamp('2024-06-30')
+    load_loss_ratio_model(as_of, workbooks['premiums'], workbooks['claims'])
+    edited = workbooks['book_claims'].assign(**{'Claim Amount': workbooks['book_claims']['Claim Amount'] + 1})
+    write_claims(workbooks, edited, 1)
+    model = load_loss_ratio_model(as_of, workbooks['premiums'], workbooks['claims'])
+
+    rebuilt = build_loss_ratio_model(workbooks['premiums_frame'], edited, as_of)
+    assert workbooks['state']['builds'] == 2
+    pd.testing.assert_frame_equal(model['final_data'], rebuilt['final_data'], check_exact=True)
+    assert len(stored_models(workbooks)) == 1
+
+
+def test_models_of_other_dates_are_bounded_in_memory_and_on_disk(workbooks, monkeypatch):
+    monkeypatch.setattr('loss_ratio_model.MODEL_CACHE_SIZE', 2)
+    monkeypatch.setattr('loss_ratio_model.MODEL_ARTIFACT_LIMIT', 3)
+    dates = pd.date_range('2024-01-31', periods=5, freq='ME')
+    for i, date in enumerate(dates):
+        load_loss_ratio_model(date, workbooks['premiums'], workbooks['claims'])
+        # Written in this order, however coarse the file system's clock
+        key = loss_ratio_model.model_key(date, workbooks['premiums'], workbooks['claims'])
+        os.utime(model_paths(key, workbooks['premiums'])['claim_rows'], (i, i))
+
+    assert list(loss_ratio_model._models) == [
+        loss_ratio_model.model_key(date, workbooks['premiums'], workbooks['claims']) for date in dates[-2:]
+    ]
+    assert stored_models(workbooks) == sorted(
+        model_paths(loss_ratio_model.model_key(date, workbooks['premiums'], workbooks['claims']), workbooks['premiums'])['final_data']
+        for date in dates[-3:]
+    )
+
+
+def test_endorsements_count_once_where_a_cover_row_is_duplicated():
+    model = build_loss_ratio_model(premiums([
+        ('ACME', 'Health Insurance', 'Renewal', '2024-01-01', '2024-12-31', 100_000),
+        ('ACME', 'Health Insurance', 'Renewal', '2024-01-01', '2024-12-31', 100_000),
+        ('ACME', 'Health Insurance', 'Endorsement', '2024-03-01', '2024-12-31', 20_000),
+    ]), claims([('ACME', '2024-04-01', 1_000)]).rename(columns={'Client Name': 'Employer Name'}), AS_OF)
+
+    acme = model['final_data'][model['final_data']['Client Name'] == 'ACME']
+    assert acme['Cover Type'].tolist() == ['Renewal', 'Renewal']
+    assert acme['Endorsement Premium'].fillna(0).sum() == 20_000
+    assert acme['Total Premium'].sum() == 220_000
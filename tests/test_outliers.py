@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from outliers import MIN_SEGMENT_SIZE, OUTLIER_METHODS, classify_outliers, iqr_bounds, mad_bounds, segment_bounds
+
+
+# Function to build the amounts and segments of claims from {segment: amounts}
+def segmented(amounts_by_segment):
+    amounts = pd.Series(np.concatenate([np.asarray(amounts, dtype=float) for amounts in amounts_by_segment.values()]))
+    segments = pd.Series(np.repeat(list(amounts_by_segment), [len(amounts) for amounts in amounts_by_segment.values()]))
+    return amounts, segments
+
+
+def test_iqr_bounds():
+    bounds = iqr_bounds(pd.Series([1.0, 2.0, 3.0, 4.0, 5.0]))
+
+    assert bounds == {'mild_lower': -1.0, 'mild_upper': 7.0, 'extreme_lower': -4.0, 'extreme_upper': 10.0}
+
+
+@pytest.mark.parametrize('method', OUTLIER_METHODS)
+def test_large_segments_use_their_own_bounds(method):
+    amounts, segments = segmented({'Dental': np.arange(100, 140), 'Inpatient': np.arange(10_000, 14_000, 100)})
+    bounds = segment_bounds(amounts, segments, method)
+
+    own = (iqr_bounds if method == 'IQR' else mad_bounds)(amounts[segments == 'Dental'])
+    assert bounds['mild_upper'][segments == 'Dental'].eq(own['mild_upper']).all()
+    assert bounds['mild_upper'][segments == 'Inpatient'].gt(own['mild_upper']).all()
+
+
+@pytest.mark.parametrize('method', OUTLIER_METHODS)
+def test_small_segments_fall_back_to_the_bounds_of_all_claims(method):
+    amounts, segments = segmented({'Dental': np.arange(100, 140), 'Optical': np.arange(200, 200 + MIN_SEGMENT_SIZE - 1)})
+    bounds = segment_bounds(amounts, segments, method)
+
+    overall = (iqr_bounds if method == 'IQR' else mad_bounds)(amounts)
+    assert bounds['extreme_upper'][segments == 'Optical'].eq(overall['extreme_upper']).all()
+
+
+@pytest.mark.parametrize('method', OUTLIER_METHODS)
+def test_segments_without_spread_fall_back_to_the_bounds_of_all_claims(method):
+    # A fixed-price segment: most of its claims at the same amount, so its IQR and MAD are both 0
+    amounts, segments = segmented({'Dental': np.arange(100, 140), 'Wellness': [500] * 35 + [510] * 5})
+    bounds = segment_bounds(amounts, segments, method)
+
+    overall = (iqr_bounds if method == 'IQR' else mad_bounds)(amounts)
+    assert bounds['mild_upper'][segments == 'Wellness'].eq(overall['mild_upper']).all()
+    assert (classify_outliers(amounts, bounds)[(segments == 'Wellness').to_numpy()] == 'Normal').all()
@@ -0,0 +1,90 @@
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from claims_data import period_key
+from sketches import SKETCH_ALPHA, SKETCH_COLUMN, build_sketch, merge_sketches, selection_sketch, sketch_quantiles
+
+
+QUANTILES = [0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1]
+
+
+# Function to generate claim amounts: log-normal amounts with zeros, amounts below 1, negative
+# reversals and missing amounts mixed in
+def amounts(rng, n):
+    values = rng.lognormal(8, 2, n)
+    kind = rng.random(n)
+    values[kind < 0.05] = 0
+    values[(kind >= 0.05) & (kind < 0.1)] = rng.random(((kind >= 0.05) & (kind < 0.1)).sum())
+    values[(kind >= 0.1) & (kind < 0.2)] *= -1
+    values[(kind >= 0.2) & (kind < 0.22)] = np.nan
+    return pd.Series(values)
+
+
+# Function to generate claims with the cube's dimensions and amounts as above
+def synthetic_claims(rng, n=5_000):
+    months = rng.integers(1, 13, n)
+    years = rng.choice([2023, 2024], n)
+    claims = pd.DataFrame({
+        'Year': years,
+        'Month': pd.to_datetime({'year': years, 'month': months, 'day': 1}).dt.strftime('%B'),
+        'Quarter': "Q" + pd.Series((months - 1) // 3 + 1).astype(str),
+        'Product': rng.choice(['Health Insurance', 'ProActiv'], n),
+        'Claim Type': rng.choice(['Outpatient', 'Dental', 'Optical', 'Inpatient'], n),
+        'Claim Status': rng.choice(['Approved', 'Declined'], n),
+        'Source': rng.choice(['Hospital', 'Pharmacy'], n),
+        SKETCH_COLUMN: amounts(rng, n),
+    })
+    claims['Period'] = period_key(claims['Month'], claims['Year'])
+    return claims
+
+
+# Function to check that the exact quantiles of values lie in the intervals estimated from their sketch
+def assert_within_bounds(values, sketch):
+    exact = values.quantile(QUANTILES).to_numpy()
+    estimates = sketch_quantiles(sketch, QUANTILES)
+    assert (estimates['Lower'].to_numpy() <= exact).all() and (exact <= estimates['Upper'].to_numpy()).all()
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_exact_quantiles_lie_within_the_estimated_bounds(seed):
+    values = amounts(np.random.default_rng(seed), 2_000)
+    assert_within_bounds(values, build_sketch(values))
+
+
+def test_estimates_are_within_the_relative_accuracy_away_from_zero():
+    values = pd.Series(np.random.default_rng(0).lognormal(8, 2, 10_001))
+    values[::2] *= -1
+    exact = values.quantile([0.05, 0.25, 0.75, 0.95]).to_numpy()
+    estimate = sketch_quantiles(build_sketch(values), [0.05, 0.25, 0.75, 0.95])['Estimate'].to_numpy()
+    assert (np.abs(estimate - exact) <= SKETCH_ALPHA * np.abs(exact)).all()
+
+
+def test_non_positive_values():
+    values = pd.Series([-250.0, -0.5, 0.0, 0.0, 0.25, 90.0])
+    estimates = sketch_quantiles(build_sketch(values), [0, 0.4, 1])
+
+    assert estimates.loc[0, 'Estimate'] == pytest.approx(-250, rel=SKETCH_ALPHA)
+    assert estimates.loc[0.4, 'Estimate'] == 0
+    assert estimates.loc[1, 'Estimate'] == pytest.approx(90, rel=SKETCH_ALPHA)
+    assert_within_bounds(values, build_sketch(values))
+
+
+def test_empty_sketch():
+    assert sketch_quantiles(build_sketch(pd.Series([np.nan])), [0.5])['Estimate'].isna().all()
+
+
+def test_merged_sketches_equal_the_sketch_of_all_values():
+    claims = synthetic_claims(np.random.default_rng(1))
+    merged = merge_sketches([build_sketch(group[SKETCH_COLUMN]) for _, group in claims.groupby('Product')])
+    assert merged.equals(build_sketch(claims[SKETCH_COLUMN]))
+
+
+def test_selection_sketches_of_filtered_claims():
+    claims = synthetic_claims(np.random.default_rng(2))
+    month_year_range = ("January 2023", "December 2024")
+    for column, other in itertools.combinations(['Product', 'Claim Type', 'Year', 'Claim Status'], 2):
+        for first, second in itertools.product(claims[column].unique(), claims[other].unique()):
+            filters = {column: [first], other: [second]}
+            selected = claims[(claims[column] == first) & (claims[other] == second)]
+            assert_within_bounds(selected[SKETCH_COLUMN], selection_sketch(claims, selected, filters, month_year_range))